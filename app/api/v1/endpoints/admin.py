@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from app.core.database import pool_metrics
+from app.core.security import token_cache
+from app.core.cache import response_cache
+from app.core.profiling import profile_store
+
+# Rutas de administración (solo admin, ver app/core/routes_config.py); con FAST_STARTUP se importan en la primera petición
+router = APIRouter(prefix="/admin", tags=["auth"])
+
+
+@router.get("")
+def admin_area():
+    """Simple admin-only endpoint."""
+    return {"message": "Área de administración"}
+
+
+@router.get("/token-cache")
+def token_cache_stats():
+    """Verified-token cache size and hit rate (admin-only)."""
+    return token_cache.stats()
+
+
+@router.get("/response-cache")
+def response_cache_stats():
+    """Response cache size, hit rate and invalidated entries (admin-only)."""
+    return response_cache.stats()
+
+
+@router.delete("/response-cache", status_code=204)
+async def response_cache_clear():
+    """Drop every cached response (admin-only)."""
+    await response_cache.clear()
+    return Response(status_code=204)
+
+
+@router.get("/db-pool")
+def db_pool_stats():
+    """Connection pool occupancy, checkouts, pre-ping failures and wait-time histogram (admin-only)."""
+    return pool_metrics()
+
+
+@router.get("/profiles")
+def profiles_list():
+    """Stored request profiles, newest first (admin-only)."""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}")
+def profile_detail(profile_id: str, format: str = Query("json", pattern="^(json|collapsed|speedscope)$")):
+    """A stored profile: summary and SQL (json), collapsed stacks or speedscope file (admin-only)."""
+    recording = profile_store.get(profile_id)
+    if not recording:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    if format == "collapsed":
+        return Response(recording.collapsed(), media_type="text/plain; charset=utf-8")
+    if format == "speedscope":
+        return JSONResponse(recording.speedscope(), headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'})
+    return recording.detail()
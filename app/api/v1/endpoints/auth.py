@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.user_service import get_user_by_email
-from app.core.security import create_access_token
-import bcrypt
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.services.aio.user_service import get_user_by_email
+from app.core.security import create_access_token, invalidate_token
+from app.core.passwords import password_hasher
 from pydantic import BaseModel, Field
 from pydantic import ConfigDict
 from app.core.config import settings
@@ -19,18 +19,19 @@ class LoginRequest(BaseModel):
 
 
 @router.post("/login")
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)):
+async def login(payload: LoginRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
     """Basic login that returns a JWT if credentials are valid."""
     ident = payload.identifier.strip()
     # Decide lookup strategy: email if contains '@', else by username (name)
     if "@" in ident:
-        user = get_user_by_email(db, ident)
+        user = await get_user_by_email(db, ident)
     else:
-        from app.services.user_service import get_user_by_name
-        user = get_user_by_name(db, ident)
+        from app.services.aio.user_service import get_user_by_name
+        user = await get_user_by_name(db, ident)
     if not user:
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
-    if not bcrypt.checkpw(payload.password.encode("utf-8"), user.hashed_password.encode("utf-8")):
+    # bcrypt se verifica en el pool dedicado (503 + Retry-After si está saturado)
+    if not await password_hasher.verify(payload.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
 
     token = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role})
@@ -52,14 +53,12 @@ def profile(request: Request):
     return {"user_id": request.state.user_id, "email": request.state.email, "role": request.state.role}
 
 
-@router.get("/admin")
-def admin_area():
-    """Simple admin-only endpoint."""
-    return {"message": "Área de administración"}
-
-
 @router.post("/logout")
-def logout(response: Response):
+def logout(request: Request, response: Response):
     """Clear JWT cookie to logout browser-based sessions."""
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header.split(" ", 1)[1] if auth_header.startswith("Bearer ") else request.cookies.get("access_token")
+    if token:
+        invalidate_token(token)
     response.delete_cookie("access_token")
     return {"message": "Logged out"}
\ No newline at end of file
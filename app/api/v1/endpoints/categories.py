@@ -1,49 +1,99 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.category import CategoryRead, CategoryCreate, CategoryUpdate, CategoryReadWithItems
-from app.services import category_service
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import json_response, prebuild_adapters, response_cache
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.etag import conditional_response
+from app.core.export import export_format, export_response
+from app.core.expand import expand_param
+from app.core.pagination import cursor_after_id, set_next_cursor
+from app.schemas.category import CategoryRead, CategoryCreate, CategoryUpdate, CategoryReadWithItems, CategoryListRead
+from app.services import versions
+from app.services.aio import category_service
 
 router = APIRouter(prefix="/categories", tags=["categories"])
+# Serializadores de las respuestas, creados al importar y no en la primera petición
+prebuild_adapters(list[CategoryListRead], CategoryReadWithItems, CategoryRead)
 
 
-@router.get("/", response_model=list[CategoryReadWithItems])
-def list_categories(skip: int = 0, limit: int = 100, q: str | None = None, db: Session = Depends(get_db)):
-    cats = category_service.list_categories(db, skip=skip, limit=limit, q=q)
-    return cats
+@router.get("/", response_model=list[CategoryListRead], response_model_exclude_unset=True)
+async def list_categories(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    q: str | None = None,
+    items_limit: int = Query(5, ge=0, le=100),
+    expand: frozenset[str] = Depends(expand_param({"items"})),
+    after_id: int | None = Depends(cursor_after_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    async def build() -> Response:
+        cats = await category_service.list_categories(db, skip=skip, limit=limit, q=q, after_id=after_id)
+        if "items" in expand:
+            previews = await category_service.get_item_previews(db, [c.id for c in cats], items_limit)
+        rows = []
+        for c in cats:
+            # Dicts con los atributos ORM: json_response los valida y serializa una sola vez.
+            # Solo las claves pedidas quedan "set" y se serializan (exclude_unset)
+            data = {field: getattr(c, field) for field in CategoryRead.model_fields}
+            if "items" in expand:
+                data.update(items=previews[c.id], items_total=c.item_count)
+            rows.append(data)
+        response = json_response(list[CategoryListRead], rows, exclude_unset=True)
+        # Con q y sin cursor la página va ordenada por relevancia: no hay cursor por id que ofrecer
+        if after_id is not None or not q:
+            set_next_cursor(response, cats, limit)
+        return response
+
+    params = {"skip": skip, "limit": limit, "q": q, "after_id": after_id, "expand": expand}
+    if "items" in expand:
+        params["items_limit"] = items_limit
+    etag = await versions.collection_etag(db, category_service.LIST_CACHE_TAGS, "categories:list", params)
+    return await conditional_response(request, etag, lambda: response_cache.fetch("categories:list", params, category_service.LIST_CACHE_TAGS, build, version=etag))
 
 
 @router.post("/", response_model=CategoryRead)
-def create_category(payload: CategoryCreate, db: Session = Depends(get_db)):
+async def create_category(payload: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        cat = category_service.create_category(db, payload)
-        return cat
+        cat = await category_service.create_category(db, payload)
+        return json_response(CategoryRead, cat)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_categories(q: str | None = None, fmt: str = Depends(export_format), db: AsyncSession = Depends(get_async_db)):
+    batches = category_service.export_categories(db, q=q, batch_size=settings.export_batch_size)
+    return export_response(batches, [c.key for c in category_service.EXPORT_COLUMNS], fmt, "categories")
+
+
 @router.get("/{category_id}", response_model=CategoryReadWithItems)
-def get_category(category_id: int, db: Session = Depends(get_db)):
-    cat = category_service.get_category(db, category_id)
-    if not cat:
-        raise HTTPException(status_code=404, detail="Categoría no encontrada")
-    return cat
+async def get_category(category_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build() -> Response:
+        cat = await category_service.get_category(db, category_id)
+        if not cat:
+            raise HTTPException(status_code=404, detail="Categoría no encontrada")
+        return json_response(CategoryReadWithItems, cat)
+
+    etag = await category_service.get_category_etag(db, category_id)
+    return await conditional_response(request, etag, lambda: response_cache.fetch("categories:detail", {"id": category_id}, category_service.detail_cache_tags(category_id), build, version=etag))
 
 
 @router.put("/{category_id}", response_model=CategoryRead)
-def update_category(category_id: int, payload: CategoryUpdate, db: Session = Depends(get_db)):
+async def update_category(category_id: int, payload: CategoryUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        cat = category_service.update_category(db, category_id, payload)
+        cat = await category_service.update_category(db, category_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not cat:
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
-    return cat
+    return json_response(CategoryRead, cat)
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(category_id: int, db: Session = Depends(get_db)):
-    ok = category_service.delete_category(db, category_id)
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await category_service.delete_category(db, category_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,58 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
-from app.schemas.item import ItemRead, ItemCreate, ItemUpdate, ItemReadWithOwner
-from app.core.database import get_db
-from app.services import item_service
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.item import ItemCreate, ItemUpdate, ItemReadWithOwner, ItemBulkCreate, ItemBulkUpdate, ItemBulkDelete, ItemBulkResult
+from app.core.cache import json_response, prebuild_adapters, response_cache
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.etag import conditional_response
+from app.core.export import export_format, export_response
+from app.core.pagination import cursor_after_id, set_next_cursor
+from app.services import versions
+from app.services.aio import item_service
 
 router = APIRouter(prefix="/items", tags=["items"])
+# Serializadores de las respuestas, creados al importar y no en la primera petición
+prebuild_adapters(list[ItemReadWithOwner], ItemReadWithOwner, ItemBulkResult)
 
 
 @router.get("/", response_model=list[ItemReadWithOwner])
-def list_items(skip: int = 0, limit: int = 100, owner_id: int | None = None, q: str | None = None, category_id: int | None = None, db: Session = Depends(get_db)):
-    items = item_service.list_items(db, skip=skip, limit=limit, owner_id=owner_id, q=q, category_id=category_id)
-    return items
+async def list_items(request: Request, skip: int = 0, limit: int = 100, owner_id: int | None = None, q: str | None = None, category_id: int | None = None, after_id: int | None = Depends(cursor_after_id), db: AsyncSession = Depends(get_async_db)):
+    async def build() -> Response:
+        items = await item_service.list_items(db, skip=skip, limit=limit, owner_id=owner_id, q=q, category_id=category_id, after_id=after_id)
+        response = json_response(list[ItemReadWithOwner], items)
+        # Con q y sin cursor la página va ordenada por relevancia: no hay cursor por id que ofrecer
+        if after_id is not None or not q:
+            set_next_cursor(response, items, limit)
+        return response
+
+    params = {"skip": skip, "limit": limit, "owner_id": owner_id, "q": q, "category_id": category_id, "after_id": after_id}
+    etag = await versions.collection_etag(db, item_service.LIST_CACHE_TAGS, "items:list", params)
+    return await conditional_response(request, etag, lambda: response_cache.fetch("items:list", params, item_service.LIST_CACHE_TAGS, build, version=etag))
 
 
 @router.post("/", response_model=ItemReadWithOwner)
-def create_item(item: ItemCreate, db: Session = Depends(get_db)):
-    new_item = item_service.create_item(db, item)
-    return new_item
+async def create_item(item: ItemCreate, db: AsyncSession = Depends(get_async_db)):
+    new_item = await item_service.create_item(db, item)
+    return json_response(ItemReadWithOwner, new_item)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_items(owner_id: int | None = None, q: str | None = None, category_id: int | None = None, fmt: str = Depends(export_format), db: AsyncSession = Depends(get_async_db)):
+    batches = item_service.export_items(db, owner_id=owner_id, q=q, category_id=category_id, batch_size=settings.export_batch_size)
+    return export_response(batches, [c.key for c in item_service.EXPORT_COLUMNS], fmt, "items")
+
+
+# Operaciones masivas: declaradas antes de /{item_id} para que "bulk" no se tome como id
+@router.post("/bulk", response_model=ItemBulkResult)
+async def bulk_create_items(payload: ItemBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    ids, errors = await item_service.bulk_create_items(db, payload.items)
+    return json_response(ItemBulkResult, ItemBulkResult(ids=ids, errors=errors))
+
+
+@router.patch("/bulk", response_model=ItemBulkResult)
+async def bulk_update_items(payload: ItemBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    ids, errors = await item_service.bulk_update_items(db, payload.items)
+    return json_response(ItemBulkResult, ItemBulkResult(ids=ids, errors=errors))
+
+
+@router.delete("/bulk", response_model=ItemBulkResult)
+async def bulk_delete_items(payload: ItemBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    ids, errors = await item_service.bulk_delete_items(db, payload.ids)
+    return json_response(ItemBulkResult, ItemBulkResult(ids=ids, errors=errors))
 
 
 @router.get("/{item_id}", response_model=ItemReadWithOwner)
-def get_item(item_id: int, db: Session = Depends(get_db)):
-    item = item_service.get_item(db, item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Ítem no encontrado")
-    return item
+async def get_item(item_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build() -> Response:
+        item = await item_service.get_item(db, item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail="Ítem no encontrado")
+        return json_response(ItemReadWithOwner, item)
+
+    etag = await item_service.get_item_etag(db, item_id)
+    return await conditional_response(request, etag, lambda: response_cache.fetch("items:detail", {"id": item_id}, item_service.detail_cache_tags(item_id), build, version=etag))
 
 
 @router.put("/{item_id}", response_model=ItemReadWithOwner)
-def update_item(item_id: int, payload: ItemUpdate, db: Session = Depends(get_db)):
+async def update_item(item_id: int, payload: ItemUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        item = item_service.update_item(db, item_id, payload)
+        item = await item_service.update_item(db, item_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not item:
         raise HTTPException(status_code=404, detail="Ítem no encontrado")
-    return item
+    return json_response(ItemReadWithOwner, item)
 
 # Actualización puntual con PATCH (parcial)
 @router.patch("/{item_id}", response_model=ItemReadWithOwner)
-def patch_item(item_id: int, payload: ItemUpdate, db: Session = Depends(get_db)):
+async def patch_item(item_id: int, payload: ItemUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        item = item_service.update_item(db, item_id, payload)
+        item = await item_service.update_item(db, item_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not item:
         raise HTTPException(status_code=404, detail="Ítem no encontrado")
-    return item
+    return json_response(ItemReadWithOwner, item)
 
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(item_id: int, db: Session = Depends(get_db)):
-    ok = item_service.delete_item(db, item_id)
+async def delete_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await item_service.delete_item(db, item_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Ítem no encontrado")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,59 +1,80 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
-from sqlalchemy.orm import Session
-from app.schemas.profile import ProfileRead, ProfileCreate, ProfileUpdate, ProfileReadWithUser
-from app.core.database import get_db
-from app.services import profile_service
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.profile import ProfileCreate, ProfileUpdate, ProfileReadWithUser
+from app.core.cache import json_response, prebuild_adapters
+from app.core.database import get_async_db
+from app.core.etag import conditional_response
+from app.core.pagination import cursor_after_id, set_next_cursor
+from app.services import versions
+from app.services.aio import profile_service
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
+# Serializadores de las respuestas, creados al importar y no en la primera petición
+prebuild_adapters(list[ProfileReadWithUser], ProfileReadWithUser)
 
 
 @router.get("/me", response_model=ProfileReadWithUser)
-def get_my_profile(request: Request, db: Session = Depends(get_db)):
+async def get_my_profile(request: Request, db: AsyncSession = Depends(get_async_db)):
     user_id = request.state.user_id
     if not user_id:
         raise HTTPException(status_code=401, detail="Autorización requerida")
-    prof = profile_service.get_profile_by_user_id(db, int(user_id))
-    if not prof:
-        raise HTTPException(status_code=404, detail="Perfil no encontrado para el usuario")
-    return prof
+    user_id = int(user_id)
+
+    async def build() -> Response:
+        prof = await profile_service.get_profile_by_user_id(db, user_id)
+        if not prof:
+            raise HTTPException(status_code=404, detail="Perfil no encontrado para el usuario")
+        return json_response(ProfileReadWithUser, prof)
+
+    return await conditional_response(request, await profile_service.get_profile_etag(db, user_id=user_id), build)
 
 @router.get("/", response_model=list[ProfileReadWithUser])
-def list_profiles(skip: int = 0, limit: int = 100, user_id: int | None = None, db: Session = Depends(get_db)):
-    profiles = profile_service.list_profiles(db, skip=skip, limit=limit, user_id=user_id)
-    return profiles
+async def list_profiles(request: Request, skip: int = 0, limit: int = 100, user_id: int | None = None, after_id: int | None = Depends(cursor_after_id), db: AsyncSession = Depends(get_async_db)):
+    async def build() -> Response:
+        profiles = await profile_service.list_profiles(db, skip=skip, limit=limit, user_id=user_id, after_id=after_id)
+        response = json_response(list[ProfileReadWithUser], profiles)
+        set_next_cursor(response, profiles, limit)
+        return response
+
+    params = {"skip": skip, "limit": limit, "user_id": user_id, "after_id": after_id}
+    etag = await versions.collection_etag(db, ("profiles", "users"), "profiles:list", params)
+    return await conditional_response(request, etag, build)
 
 
 @router.post("/", response_model=ProfileReadWithUser)
-def create_profile(payload: ProfileCreate, db: Session = Depends(get_db)):
+async def create_profile(payload: ProfileCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        new_profile = profile_service.create_profile(db, payload)
-        return new_profile
+        new_profile = await profile_service.create_profile(db, payload)
+        return json_response(ProfileReadWithUser, new_profile)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{profile_id}", response_model=ProfileReadWithUser)
-def get_profile(profile_id: int, db: Session = Depends(get_db)):
-    prof = profile_service.get_profile(db, profile_id)
-    if not prof:
-        raise HTTPException(status_code=404, detail="Perfil no encontrado")
-    return prof
+async def get_profile(profile_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build() -> Response:
+        prof = await profile_service.get_profile(db, profile_id)
+        if not prof:
+            raise HTTPException(status_code=404, detail="Perfil no encontrado")
+        return json_response(ProfileReadWithUser, prof)
+
+    return await conditional_response(request, await profile_service.get_profile_etag(db, profile_id=profile_id), build)
 
 
 @router.put("/{profile_id}", response_model=ProfileReadWithUser)
-def update_profile(profile_id: int, payload: ProfileUpdate, db: Session = Depends(get_db)):
+async def update_profile(profile_id: int, payload: ProfileUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        prof = profile_service.update_profile(db, profile_id, payload)
+        prof = await profile_service.update_profile(db, profile_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not prof:
         raise HTTPException(status_code=404, detail="Perfil no encontrado")
-    return prof
+    return json_response(ProfileReadWithUser, prof)
 
 
 @router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_profile(profile_id: int, db: Session = Depends(get_db)):
-    ok = profile_service.delete_profile(db, profile_id)
+async def delete_profile(profile_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await profile_service.delete_profile(db, profile_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Perfil no encontrado")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
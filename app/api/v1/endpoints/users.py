@@ -1,60 +1,111 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
-from app.schemas.user import UserReadFull, UserCreate, UserUpdate
-from app.core.database import get_db
-from app.services import user_service
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.user import UserRead, UserReadFull, UserListRead, UserCreate, UserUpdate
+from app.core.cache import json_response, prebuild_adapters
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.etag import conditional_response
+from app.core.export import export_format, export_response
+from app.core.expand import expand_param
+from app.core.pagination import cursor_after_id, set_next_cursor
+from app.services import versions
+from app.services.aio import user_service
 
 router = APIRouter(prefix="/users", tags=["users"])
+# Serializadores de las respuestas, creados al importar y no en la primera petición
+prebuild_adapters(list[UserListRead], UserReadFull)
 
 
-@router.get("/", response_model=list[UserReadFull])
-def list_users(skip: int = 0, limit: int = 100, search: str | None = None, db: Session = Depends(get_db)):
-    users = user_service.list_users(db, skip=skip, limit=limit, search=search)
-    return users
+@router.get("/", response_model=list[UserListRead], response_model_exclude_unset=True)
+async def list_users(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    search: str | None = None,
+    items_limit: int = Query(5, ge=0, le=100),
+    expand: frozenset[str] = Depends(expand_param({"items", "profile"})),
+    after_id: int | None = Depends(cursor_after_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    async def build() -> Response:
+        users = await user_service.list_users(db, skip=skip, limit=limit, search=search, after_id=after_id, with_profile="profile" in expand)
+        if "items" in expand:
+            previews = await user_service.get_item_previews(db, [u.id for u in users], items_limit)
+        rows = []
+        for u in users:
+            # Dicts con los atributos ORM: json_response los valida y serializa una sola vez.
+            # Solo las claves pedidas quedan "set" y se serializan (exclude_unset)
+            data = {field: getattr(u, field) for field in UserRead.model_fields}
+            if "items" in expand:
+                data.update(items=previews[u.id], items_total=u.item_count)
+            if "profile" in expand:
+                data["profile"] = u.profile
+            rows.append(data)
+        response = json_response(list[UserListRead], rows, exclude_unset=True)
+        # Con search y sin cursor la página va ordenada por relevancia: no hay cursor por id que ofrecer
+        if after_id is not None or not search:
+            set_next_cursor(response, users, limit)
+        return response
+
+    params = {"skip": skip, "limit": limit, "search": search, "after_id": after_id, "expand": expand}
+    if "items" in expand:
+        params["items_limit"] = items_limit
+    etag = await versions.collection_etag(db, user_service.list_collections(expand), "users:list", params)
+    return await conditional_response(request, etag, build)
 
 
 @router.post("/", response_model=UserReadFull)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        new_user = user_service.create_user(db, user)
-        return new_user
+        new_user = await user_service.create_user(db, user)
+        return json_response(UserReadFull, new_user)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(search: str | None = None, fmt: str = Depends(export_format), db: AsyncSession = Depends(get_async_db)):
+    batches = user_service.export_users(db, search=search, batch_size=settings.export_batch_size)
+    return export_response(batches, [c.key for c in user_service.EXPORT_COLUMNS], fmt, "users")
+
+
 @router.get("/{user_id}", response_model=UserReadFull)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = user_service.get_user(db, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Usuario no encontrado")
-    return user
+async def get_user(user_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build() -> Response:
+        user = await user_service.get_user(db, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+        return json_response(UserReadFull, user)
+
+    return await conditional_response(request, await user_service.get_user_etag(db, user_id), build)
 
 
 @router.put("/{user_id}", response_model=UserReadFull)
-def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)):
+async def update_user(user_id: int, payload: UserUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        user = user_service.update_user(db, user_id, payload)
+        user = await user_service.update_user(db, user_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
-    return user
+    return json_response(UserReadFull, user)
 
 # Actualización puntual con PATCH (parcial)
 @router.patch("/{user_id}", response_model=UserReadFull)
-def patch_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)):
+async def patch_user(user_id: int, payload: UserUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        user = user_service.update_user(db, user_id, payload)
+        user = await user_service.update_user(db, user_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
-    return user
+    return json_response(UserReadFull, user)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    ok = user_service.delete_user(db, user_id)
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await user_service.delete_user(db, user_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,9 +1,27 @@
+import importlib
 from fastapi import APIRouter
-from .endpoints import users, items, auth, profiles, categories
-
-api_router = APIRouter(prefix="/api/v1")
-api_router.include_router(users.router)
-api_router.include_router(items.router)
-api_router.include_router(auth.router)
-api_router.include_router(profiles.router)
-api_router.include_router(categories.router)
\ No newline at end of file
+from app.core.config import settings
+
+API_PREFIX = "/api/v1"
+# Prefijo propio de cada router -> módulo. Con FAST_STARTUP, los nombrados en LAZY_ROUTERS se importan en su primera petición
+ROUTERS = {
+    "/users": "app.api.v1.endpoints.users",
+    "/items": "app.api.v1.endpoints.items",
+    "": "app.api.v1.endpoints.auth",
+    "/profiles": "app.api.v1.endpoints.profiles",
+    "/categories": "app.api.v1.endpoints.categories",
+    "/admin": "app.api.v1.endpoints.admin",
+}
+
+
+def lazy_routers() -> dict[str, str]:
+    """Routers left out of ``api_router`` (registered by ``app.core.lazy_routes`` instead)."""
+    if not settings.fast_startup:
+        return {}
+    return {path: module for path, module in ROUTERS.items() if path and path.strip("/") in settings.lazy_routers}
+
+
+api_router = APIRouter(prefix=API_PREFIX)
+for path, module in ROUTERS.items():
+    if path not in lazy_routers():
+        api_router.include_router(importlib.import_module(module).router)
@@ -1,66 +1,131 @@
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Any, Dict, Iterable, Mapping, Optional
+from fastapi import HTTPException, Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.routes_config import ROUTES_ACCESS, ROUTES_ACCESS_PREFIXES
 from app.core.security import decode_token
 
+# Clave de método para reglas de prefijo sin restricción de métodos
+ANY_METHOD = "*"
 
-class RoleAuthMiddleware(BaseHTTPMiddleware):
+
+class _RouteNode:
+    __slots__ = ("children", "exact", "prefix_rules")
+
+    def __init__(self):
+        self.children: Dict[str, "_RouteNode"] = {}
+        # Configuración de ROUTES_ACCESS si la ruta termina exactamente en este nodo
+        self.exact: Optional[Dict[str, Any]] = None
+        # Reglas de ROUTES_ACCESS_PREFIXES por método: method -> (orden en la lista, cfg)
+        self.prefix_rules: Dict[str, tuple[int, Dict[str, Any]]] = {}
+
+
+class RouteTable:
+    """Prefix trie of access rules keyed by path segment and HTTP method.
+
+    Compiled once from ``ROUTES_ACCESS`` and ``ROUTES_ACCESS_PREFIXES``; each
+    lookup walks the path segments once. Exact routes win over prefixes and,
+    among prefixes, the first rule in list order wins (same as the linear scan).
+    Prefixes match whole segments: ``/api/v1/items`` covers ``/api/v1/items``,
+    ``/api/v1/items/`` and ``/api/v1/items/5``.
+    """
+
+    def __init__(self):
+        self.root = _RouteNode()
+
+    @staticmethod
+    def _segments(path: str) -> list[str]:
+        return path.split("/")[1:]
+
+    def _node_for(self, path: str) -> _RouteNode:
+        node = self.root
+        for segment in self._segments(path):
+            node = node.children.setdefault(segment, _RouteNode())
+        return node
+
+    @classmethod
+    def compile(cls, exact: Mapping[str, Dict[str, Any]], prefixes: Iterable[Dict[str, Any]]) -> "RouteTable":
+        table = cls()
+        for path, cfg in exact.items():
+            table._node_for(path).exact = cfg
+        for index, cfg in enumerate(prefixes):
+            node = table._node_for(cfg["prefix"].rstrip("/"))
+            for method in cfg.get("methods") or [ANY_METHOD]:
+                node.prefix_rules.setdefault(method.upper(), (index, cfg))
+        return table
+
+    def lookup(self, method: str, path: str) -> Optional[Dict[str, Any]]:
+        """Return the effective access config for ``method path`` or None if not configured."""
+        node = self.root
+        best: Optional[tuple[int, Dict[str, Any]]] = None
+        for segment in self._segments(path):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.prefix_rules:
+                for key in (method, ANY_METHOD):
+                    rule = node.prefix_rules.get(key)
+                    if rule and (best is None or rule[0] < best[0]):
+                        best = rule
+        else:
+            if node.exact:
+                return node.exact
+        return best[1] if best else None
+
+
+class RoleAuthMiddleware:
     """Authorization middleware based on JWT and centralized route config.
     Validates bearer token and roles for protected endpoints.
+
+    Pure ASGI: public or unconfigured routes pass straight through without
+    wrapping the request or the response body stream.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        path = request.url.path
-        method = request.method.upper()
-
-        access_cfg = ROUTES_ACCESS.get(path)
-        prefix_cfg = None
-        if not access_cfg:
-            # Try prefix-based rules with optional method constraints
-            for cfg in ROUTES_ACCESS_PREFIXES:
-                prefix = cfg.get("prefix")
-                methods = cfg.get("methods")
-                if path.startswith(prefix) and (methods is None or method in methods):
-                    prefix_cfg = cfg
-                    break
-
-        effective_cfg = access_cfg or prefix_cfg
-        # If route not configured, let it pass (public by default)
-        if not effective_cfg:
-            return await call_next(request)
-        # If explicitly public, let it pass
-        if effective_cfg.get("public"):
-            return await call_next(request)
+    def __init__(self, app: ASGIApp, routes_access: Mapping[str, Dict[str, Any]] = ROUTES_ACCESS, routes_prefixes: Iterable[Dict[str, Any]] = ROUTES_ACCESS_PREFIXES):
+        self.app = app
+        self.route_table = RouteTable.compile(routes_access, routes_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        effective_cfg = self.route_table.lookup(scope["method"].upper(), scope["path"])
+        # If route not configured or explicitly public, let it pass
+        if not effective_cfg or effective_cfg.get("public"):
+            await self.app(scope, receive, send)
+            return
 
+        request = Request(scope)
         # For protected routes, require JWT via Authorization header or HttpOnly cookie
         auth_header = request.headers.get("Authorization", "")
-        token = None
         if auth_header.startswith("Bearer "):
             token = auth_header.split(" ", 1)[1]
         else:
             # Fallback to cookie set by /login for browser-based clients (Scalar docs, etc.)
             token = request.cookies.get("access_token")
             if not token:
-                return JSONResponse({"detail": "Autorización requerida"}, status_code=401)
+                await JSONResponse({"detail": "Autorización requerida"}, status_code=401)(scope, receive, send)
+                return
         try:
             payload = decode_token(token)
-        except Exception as e:
-            # decode_token already maps specific errors to 401
-            if isinstance(e, JSONResponse):
-                return e
-            return JSONResponse({"detail": "Token inválido"}, status_code=401)
+        except HTTPException as e:
+            # decode_token already maps specific errors (expired/invalid) to 401
+            await JSONResponse({"detail": e.detail}, status_code=e.status_code)(scope, receive, send)
+            return
+        except Exception:
+            await JSONResponse({"detail": "Token inválido"}, status_code=401)(scope, receive, send)
+            return
 
-        # Attach claims to request state for downstream usage
+        # Attach claims to request state (scope["state"]) for downstream usage
         request.state.user_id = payload.get("sub")
         request.state.email = payload.get("email")
         request.state.role = payload.get("role")
 
         # If roles are specified, enforce them
-        if effective_cfg and "roles" in effective_cfg:
-            allowed = effective_cfg["roles"]
-            if request.state.role not in allowed:
-                return JSONResponse({"detail": "Permisos insuficientes"}, status_code=403)
+        if "roles" in effective_cfg:
+            if request.state.role not in effective_cfg["roles"]:
+                await JSONResponse({"detail": "Permisos insuficientes"}, status_code=403)(scope, receive, send)
+                return
 
-        return await call_next(request)
\ No newline at end of file
+        await self.app(scope, receive, send)
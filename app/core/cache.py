@@ -0,0 +1,280 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Protocol
+from fastapi import Response
+from pydantic import TypeAdapter
+from app.core import compression
+from app.core.config import settings
+
+# Header de diagnóstico: HIT si la respuesta sale de la caché
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+class CacheBackend(Protocol):
+    name: str
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: int) -> None: ...
+
+    async def invalidate(self, tags: Iterable[str]) -> int: ...
+
+    async def clear(self) -> None: ...
+
+    def size(self) -> Optional[int]: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU with per-entry TTL and a tag -> keys index for invalidation."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, bytes, tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: int) -> None:
+        if self.max_entries <= 0:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set().union(*(self._tags.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Redis-compatible backend (Redis, Valkey, KeyDB...) shared by every worker.
+    Requires the optional ``redis`` package.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "rc:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requiere el paquete 'redis' (pip install redis)") from e
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: int) -> None:
+        key = self.prefix + key
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl)
+            for tag in tags:
+                # Todas las entradas comparten TTL: renovarlo deja el índice vivo tanto como la última
+                pipe.sadd(self.prefix + "tag:" + tag, key)
+                pipe.expire(self.prefix + "tag:" + tag, ttl)
+            await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [self.prefix + "tag:" + tag for tag in tags]
+        if not tag_keys:
+            return 0
+        async with self._client.pipeline(transaction=True) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+        keys = set().union(*members)
+        await self._client.delete(*keys, *tag_keys)
+        return len(keys)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _adapter(model_type: Any) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def prebuild_adapters(*model_types: Any) -> None:
+    """Build the ``json_response`` adapters at import time instead of on the first request."""
+    for model_type in model_types:
+        _adapter(model_type)
+
+
+def json_response(model_type: Any, data: Any, exclude_unset: bool = False) -> Response:
+    """Validate ``data`` (ORM objects or dicts) against ``model_type`` and render it to JSON once.
+
+    ``TypeAdapter.dump_json`` serializes in pydantic-core straight to bytes: no
+    ``jsonable_encoder`` pass and no stdlib ``json`` (FastAPI's ``response_model`` path).
+    """
+    adapter = _adapter(model_type)
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True), exclude_unset=exclude_unset)
+    return Response(content=body, media_type="application/json")
+
+
+class ResponseCache:
+    """Read-through cache of rendered GET responses (body + headers).
+
+    Entries are keyed by endpoint name, normalized query params and the
+    response version (its ETag), so they are valid across processes and
+    backends: any committed write changes the version. Tags name the
+    entities an entry embeds (``items``, ``item:5``, ``categories``...);
+    ``invalidate`` only frees the entries a write made unreachable.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(name: str, params: Dict[str, Any]) -> str:
+        # Parámetros normalizados: orden estable, sin None y conjuntos ordenados
+        normalized = {k: sorted(v) if isinstance(v, (set, frozenset)) else v for k, v in sorted(params.items()) if v is not None}
+        return f"{name}?{json.dumps(normalized, separators=(',', ':'), ensure_ascii=False)}"
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    async def fetch(self, name: str, params: Dict[str, Any], tags: Iterable[str], build: Callable[[], Awaitable[Response]], version: Optional[str]) -> Response:
+        """Return the cached response for ``name``/``params`` at ``version`` or build, store and return it.
+        ``version`` (the response ETag) is read before ``build``, so the body is never older
+        than it; an entry built for another version is never served, whoever made the write.
+        Without a version (resource not found) and on errors raised by ``build`` nothing is cached.
+        """
+        if self.backend is None or version is None:
+            return await build()
+        key = f"{self.key(name, params)}@{version}"
+        # Codificación negociada por CompressionMiddleware: la variante comprimida se guarda aparte
+        encoding = compression.current_encoding()
+        if encoding is not None:
+            cached = await self.backend.get(f"{key}#{encoding}")
+            if cached is not None:
+                self._count(True)
+                return self._response(cached, "HIT")
+        cached = await self.backend.get(key)
+        self._count(cached is not None)
+        if cached is not None:
+            if encoding is not None:
+                # Primera petición comprimida de esta entrada: se comprime una vez y se guarda
+                cached = await self._store_variant(key, cached, encoding, tags)
+            return self._response(cached, "HIT")
+        response = await build()
+        if response.status_code == 200:
+            headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+            entry = json.dumps(headers).encode() + b"\n" + response.body
+            await self.backend.set(key, entry, tags, self.ttl)
+            if encoding is not None:
+                return self._response(await self._store_variant(key, entry, encoding, tags), "MISS")
+        response.headers[CACHE_STATUS_HEADER] = "MISS"
+        return response
+
+    @staticmethod
+    def _response(entry: bytes, status: str) -> Response:
+        head, _, body = entry.partition(b"\n")
+        headers = json.loads(head)
+        headers[CACHE_STATUS_HEADER] = status
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def _store_variant(self, key: str, entry: bytes, encoding: str, tags: Iterable[str]) -> bytes:
+        """Compressed copy of ``entry`` (stored under ``key#encoding``); ``entry`` itself if too small."""
+        head, _, body = entry.partition(b"\n")
+        if len(body) < settings.compression_minimum_size:
+            return entry
+        headers = json.loads(head)
+        headers.update({"content-encoding": encoding, "vary": "Accept-Encoding"})
+        variant = json.dumps(headers).encode() + b"\n" + compression.compress(body, encoding)
+        await self.backend.set(f"{key}#{encoding}", variant, tags, self.ttl)
+        return variant
+
+    async def invalidate(self, *tags: str) -> None:
+        """Free the entries tagged with ``tags`` (they already miss: their version is stale)."""
+        if self.backend is None or not tags:
+            return
+        removed = await self.backend.invalidate(tags)
+        with self._lock:
+            self.invalidations += removed
+
+    async def clear(self) -> None:
+        if self.backend is not None:
+            await self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name if self.backend is not None else "none",
+                "size": self.backend.size() if self.backend is not None else 0,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidated_entries": self.invalidations,
+            }
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    if settings.response_cache_backend == "redis":
+        return RedisCacheBackend(settings.response_cache_redis_url)
+    if settings.response_cache_backend == "memory" and settings.response_cache_max_entries > 0:
+        return MemoryCacheBackend(settings.response_cache_max_entries)
+    return None
+
+
+response_cache = ResponseCache(_build_backend(), ttl=settings.response_cache_ttl)
@@ -0,0 +1,157 @@
+"""Compresión de respuestas negociada por ``Accept-Encoding``.
+
+``CompressionMiddleware`` comprime con gzip (zlib de la librería estándar) o
+brotli (paquete opcional ``brotli``) las respuestas de tipos de texto que
+superan ``compression_minimum_size``; las ``StreamingResponse`` se comprimen
+trozo a trozo. La codificación negociada queda en una ContextVar para que la
+caché de respuestas guarde y sirva la variante ya comprimida.
+"""
+import zlib
+from contextvars import ContextVar
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # opcional: sin el paquete solo se ofrece gzip
+    brotli = None
+
+# Tipos que merece la pena comprimir (JSON, NDJSON, CSV, HTML...)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "application/xml", "text/")
+
+# Codificación negociada para la petición en curso (None = sin comprimir)
+_accepted: ContextVar[Optional[str]] = ContextVar("accepted_encoding", default=None)
+
+
+def available_encodings() -> list[str]:
+    """``compression_encodings`` in server preference order, without the ones not installed."""
+    return [e for e in settings.compression_encodings if e == "gzip" or (e == "br" and brotli is not None)]
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Preferred available encoding accepted by the client (q > 0), or None."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def current_encoding() -> Optional[str]:
+    return _accepted.get()
+
+
+def compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """Incremental compressor; ``compress`` flushes so every chunk can be sent right away."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self._zlib = None
+        else:
+            # wbits=31: formato gzip (cabecera y CRC) en lugar de zlib
+            self._zlib = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._zlib is not None:
+            return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+        return self._br.process(data) + self._br.flush()
+
+    def finish(self) -> bytes:
+        if self._zlib is not None:
+            return self._zlib.flush(zlib.Z_FINISH)
+        return self._br.finish()
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return zlib.compress(body, settings.compression_gzip_level, wbits=31)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; already-encoded responses (e.g. cached variants) pass through untouched."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+        # Sin codificación aceptada la respuesta no se comprime, pero sigue llevando Vary
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        token = _accepted.set(encoding)
+        try:
+            await self.app(scope, receive, _CompressingSend(send, encoding))
+        finally:
+            _accepted.reset(token)
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: Optional[str]):
+        self.send = send
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        # None hasta ver el primer trozo del cuerpo; luego True (comprimir) o False (pasar tal cual)
+        self.active: Optional[bool] = None
+        self.compressor: Optional[_Compressor] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Se retiene hasta saber si el cuerpo se comprime (cambian las cabeceras)
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.active is False:
+            await self.send(message)
+            return
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.active is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            eligible = "content-encoding" not in headers and compressible(headers.get("content-type", "")) and self.start["status"] not in (204, 304)
+            if eligible:
+                headers.add_vary_header("Accept-Encoding")
+            if not eligible or self.encoding is None or (not more_body and len(body) < settings.compression_minimum_size):
+                self.active = False
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.active = True
+            headers["Content-Encoding"] = self.encoding
+            if not more_body:
+                # Cuerpo completo en un solo mensaje: se comprime de una vez
+                body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            # Streaming: longitud desconocida, cada trozo se comprime y se envía al momento
+            del headers["Content-Length"]
+            self.compressor = _Compressor(self.encoding)
+            await self.send(self.start)
+        if self.compressor is None:
+            await self.send(message)
+            return
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
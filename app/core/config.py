@@ -5,17 +5,126 @@ from typing import List
 class Settings(BaseSettings):
     app_name: str = "Project Name API"
     database_url: str = "sqlite:///./project.db"
+    # URL para el engine asíncrono; si no se define se deriva de database_url (aiosqlite/asyncpg)
+    async_database_url: str | None = None
     auto_create_tables: bool = True
+    # Aplica en startup las migraciones pendientes de app/core/migrations.py
+    auto_migrate: bool = True
+    # Arranque rápido (scale-to-zero): routers de lazy_routers bajo demanda, create_all y migraciones solo
+    # si cambió la huella del esquema y conexiones del pool abiertas en segundo plano
+    fast_startup: bool = False
+    # Routers que se importan en su primera petición con fast_startup: users, items, profiles, categories, admin
+    lazy_routers: List[str] = ["admin"]
+    # Conexiones del pool asíncrono abiertas en segundo plano al arrancar con fast_startup (0 = ninguna)
+    db_prewarm_connections: int = 2
+    # Esquema OpenAPI precalculado por scripts/build_openapi.py ("" = generarlo en la primera petición)
+    openapi_file: str = ""
+    # Pool de conexiones (no aplica a SQLite en memoria, que comparte una sola conexión)
+    db_pool_size: int = 5
+    # Conexiones extra por encima de db_pool_size en picos (-1 = sin límite)
+    db_max_overflow: int = 10
+    # Segundos de espera por una conexión libre antes de fallar
+    db_pool_timeout: float = 30.0
+    # Reciclar conexiones con más de N segundos (-1 = nunca); evita cortes por inactividad del servidor
+    db_pool_recycle: int = 1800
+    # Ping antes de cada checkout; sin definir: activo salvo en SQLite
+    db_pool_pre_ping: bool | None = None
+    # LIFO: reutiliza las conexiones recientes y deja caducar las ociosas
+    db_pool_use_lifo: bool = False
+    # Perfil de rendimiento de SQLite: PRAGMAs aplicados a cada conexión nueva (otros motores lo ignoran)
+    sqlite_pragmas: bool = True
+    # WAL: las lecturas no esperan a las escrituras ni al revés
+    sqlite_journal_mode: str = "wal"
+    # NORMAL con WAL: sin fsync en cada commit; una caída del sistema puede perder los últimos commits, no corromper
+    sqlite_synchronous: str = "normal"
+    # Bytes del fichero leídos por mmap (0 lo desactiva)
+    sqlite_mmap_size: int = 268435456
+    # Caché de páginas por conexión; negativo = KiB (-16384 = 16 MiB)
+    sqlite_cache_size: int = -16384
+    # Milisegundos que una conexión espera un bloqueo antes de fallar con "database is locked"
+    sqlite_busy_timeout: int = 5000
+    # Cola de escritura única en el proceso para los servicios asíncronos (solo con SQLite)
+    sqlite_single_writer: bool = True
+    # /health: tiempo máximo para obtener conexión y ejecutar SELECT 1
+    health_db_timeout: float = 2.0
+    # /health informa "degraded" a partir de esta fracción de conexiones en uso
+    health_pool_saturation_threshold: float = 0.9
+    # Métricas de Prometheus en GET /metrics (latencia por ruta y consultas SQL por petición)
+    metrics_enabled: bool = True
+    # Peticiones con más consultas SQL que este umbral se marcan como posible N+1 (0 lo desactiva)
+    metrics_n_plus_one_threshold: int = 20
+    # Perfilado bajo demanda (X-Profile: 1 o ?_profile=1, solo roles de PROFILING_ACCESS)
+    profiling_enabled: bool = True
+    # Segundos entre muestras de pila (el GIL puede espaciarlas más)
+    profiling_sample_interval: float = 0.001
+    # Perfiles guardados en memoria (GET /api/v1/admin/profiles)
+    profiling_keep: int = 20
+    # Compresión de respuestas según Accept-Encoding
+    compression_enabled: bool = True
+    # Bytes mínimos del cuerpo para comprimir (las respuestas en streaming se comprimen siempre)
+    compression_minimum_size: int = 1024
+    # Codificaciones en orden de preferencia; "br" requiere el paquete opcional brotli
+    compression_encodings: List[str] = ["br", "gzip"]
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
     # CORS configuration
     cors_allow_origins: List[str] = ["*"]
     cors_allow_methods: List[str] = ["*"]
     cors_allow_headers: List[str] = ["*"]
     cors_allow_credentials: bool = True
+    # Encabezados de respuesta legibles desde el navegador (p. ej. cursor de paginación)
+    cors_expose_headers: List[str] = ["X-Next-Cursor"]
 
     # JWT security configuration
     jwt_secret: str = "CHANGE_ME_SUPER_SECRET_KEY"
     jwt_algorithm: str = "HS256"
     jwt_expiration_minutes: int = 60
+    # Máximo de tokens verificados en caché (0 desactiva la caché)
+    jwt_cache_max_size: int = 10000
+
+    # Password hashing (bcrypt)
+    bcrypt_rounds: int = 12
+    # Procesos dedicados a bcrypt (0 = un hilo en lugar de procesos)
+    password_hash_workers: int = 2
+    # Operaciones en espera admitidas además de las que están en curso; el resto recibe 503
+    password_hash_queue_limit: int = 32
+    password_hash_retry_after: int = 1
+
+    # Exportaciones en streaming: filas leídas del cursor de servidor por lote
+    export_batch_size: int = 1000
+
+    # Servidor de producción (python -m app.serve)
+    serve_host: str = "0.0.0.0"
+    serve_port: int = 8000
+    # Procesos worker (0 = uno por CPU disponible, o 1 con SQLite y la cola de escritura activa)
+    serve_workers: int = 0
+    # "auto" (gunicorn si está instalado), "gunicorn" o "uvicorn"
+    serve_server: str = "auto"
+    # Bucle de eventos y parser HTTP; "auto" usa uvloop y httptools si están instalados
+    serve_loop: str = "auto"
+    serve_http: str = "auto"
+    # Importar la app en el proceso maestro antes de crear los workers (memoria compartida por copy-on-write; solo gunicorn)
+    serve_preload: bool = True
+    # Segundos sin señal de vida de un worker antes de reiniciarlo (solo gunicorn)
+    serve_timeout: int = 60
+    # Segundos para terminar las peticiones en curso al parar o reciclar un worker
+    serve_graceful_timeout: int = 30
+    # Segundos que se mantiene abierta una conexión keep-alive ociosa
+    serve_keepalive: int = 5
+    # Reciclar cada worker tras N peticiones (0 = nunca); el jitter evita que se reciclen todos a la vez (solo gunicorn)
+    serve_max_requests: int = 10000
+    serve_max_requests_jitter: int = 1000
+    # Conexiones pendientes de aceptar en el socket
+    serve_backlog: int = 2048
+    serve_access_log: bool = False
+    serve_log_level: str = "info"
+
+    # Caché de respuestas GET de ítems y categorías: "memory" (LRU en proceso), "redis" o "none"
+    response_cache_backend: str = "memory"
+    response_cache_max_entries: int = 10000
+    # Segundos de vida de cada entrada (acota lo desfasado de escrituras hechas fuera de la API)
+    response_cache_ttl: int = 60
+    response_cache_redis_url: str = "redis://localhost:6379/0"
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
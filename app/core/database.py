@@ -1,16 +1,157 @@
-from sqlalchemy import create_engine
+import asyncio
+import contextlib
+import time
+from typing import Any, Dict
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.db_pool import PoolMetrics, pool_options, pool_status
+from app.core.db_writer import SerializedWriter
+from app.core import metrics, profiling
 
 connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, connect_args=connect_args, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(settings.database_url, connect_args=connect_args, **pool_options(settings.database_url))
+# Sin expirar tras commit (como AsyncSessionLocal): los servicios devuelven el objeto sin volver a leerlo
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
+# Drivers asíncronos equivalentes a los drivers síncronos de database_url
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url() -> str:
+    """Return the async URL: explicit setting or database_url with an async driver."""
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No hay driver asíncrono configurado para '{backend}'; define ASYNC_DATABASE_URL")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(get_async_database_url(), **pool_options(get_async_database_url(), is_async=True))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Valores admitidos en los PRAGMA que no son numéricos (se interpolan en la sentencia)
+SQLITE_JOURNAL_MODES = {"delete", "truncate", "persist", "memory", "wal", "off"}
+SQLITE_SYNCHRONOUS = {"off", "normal", "full", "extra"}
+
+
+def sqlite_pragmas() -> list[str]:
+    """PRAGMA statements of the SQLite performance profile (``SQLITE_*`` settings)."""
+    journal_mode = settings.sqlite_journal_mode.lower()
+    synchronous = settings.sqlite_synchronous.lower()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"SQLITE_JOURNAL_MODE no válido: '{settings.sqlite_journal_mode}'")
+    if synchronous not in SQLITE_SYNCHRONOUS:
+        raise ValueError(f"SQLITE_SYNCHRONOUS no válido: '{settings.sqlite_synchronous}'")
+    return [
+        # busy_timeout primero: cambiar a WAL necesita un bloqueo y puede tener que esperar
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout)}",
+        f"PRAGMA journal_mode = {journal_mode}",
+        f"PRAGMA synchronous = {synchronous}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+        f"PRAGMA cache_size = {int(settings.sqlite_cache_size)}",
+    ]
+
+
+def apply_sqlite_profile(target: Engine) -> None:
+    """Run ``sqlite_pragmas()`` on every new DBAPI connection of ``target`` (SQLite only)."""
+    if target.dialect.name != "sqlite" or not settings.sqlite_pragmas:
+        return
+    statements = sqlite_pragmas()
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+apply_sqlite_profile(engine)
+apply_sqlite_profile(async_engine.sync_engine)
+
+# Escrituras de los servicios asíncronos: una transacción a la vez por proceso con SQLite
+db_writer = SerializedWriter(enabled=settings.sqlite_single_writer and async_engine.dialect.name == "sqlite")
+
+# Métricas de los pools (GET /api/v1/admin/db-pool)
+sync_pool_metrics = PoolMetrics()
+sync_pool_metrics.attach(engine)
+async_pool_metrics = PoolMetrics()
+async_pool_metrics.attach(async_engine.sync_engine)
+
+
+# Consultas SQL por petición (GET /metrics)
+metrics.attach(engine)
+metrics.attach(async_engine.sync_engine)
+# Sentencias SQL de las peticiones perfiladas (X-Profile)
+profiling.attach(engine)
+profiling.attach(async_engine.sync_engine)
+
+
+def pool_metrics() -> Dict[str, Any]:
+    return {
+        "sync": sync_pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+        "writer": db_writer.snapshot(),
+    }
+
+
+async def prewarm_pool(connections: int) -> None:
+    """Open ``connections`` async pool connections and return them to the pool (first requests skip the connect)."""
+    try:
+        # Se retienen todas a la vez: si no, el pool reutilizaría la primera
+        async with contextlib.AsyncExitStack() as stack:
+            for _ in range(connections):
+                conn = await stack.enter_async_context(async_engine.connect())
+                await conn.execute(text("SELECT 1"))
+    except Exception:
+        # Sin base de datos todavía: las peticiones conectarán por su cuenta y /health lo informa
+        pass
+
+
+async def database_health() -> Dict[str, Any]:
+    """Reachability (SELECT 1 through the async pool, bounded by ``health_db_timeout``) and pool saturation."""
+    pool = pool_status(async_engine.sync_engine.pool)
+    start = time.perf_counter()
+    try:
+        async def ping() -> None:
+            async with async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        await asyncio.wait_for(ping(), timeout=settings.health_db_timeout)
+    except Exception as e:
+        now = pool_status(async_engine.sync_engine.pool)
+        if isinstance(e, asyncio.TimeoutError) and now["saturation"] is not None and now["saturation"] >= 1:
+            # Todas las conexiones en uso: la instancia está saturada, no la base de datos caída
+            return {"status": "degraded", "database": {"reachable": None, "error": "pool agotado"}, "pool": now}
+        detail = "timeout" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+        return {"status": "unavailable", "database": {"reachable": False, "error": detail[:300]}, "pool": now}
+    saturated = pool["saturation"] is not None and pool["saturation"] >= settings.health_pool_saturation_threshold
+    return {
+        "status": "degraded" if saturated else "ok",
+        "database": {"reachable": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)},
+        "pool": pool,
+    }
+
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,175 @@
+"""Pool de conexiones: opciones desde Settings e instrumentación.
+
+``pool_options`` elige la clase de pool y sus parámetros para cada URL;
+``PoolMetrics`` cuenta checkouts, conexiones nuevas, invalidaciones, fallos
+de pre-ping, timeouts y el histograma del tiempo de espera por una conexión.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+from app.core.config import settings
+
+# Límites superiores (segundos) del histograma de espera; el último cubo es +Inf
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram (Prometheus style)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, n in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            running += n
+            cumulative[bound] = running
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.timeouts = 0
+        self.max_checked_out = 0
+        self.wait = Histogram(WAIT_BUCKETS)
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait.observe(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, engine: Engine) -> None:
+        """Register the pool and engine listeners (survive ``engine.dispose()``)."""
+        engine.pool.metrics = self
+
+        @event.listens_for(engine, "checkout")
+        def _checkout(dbapi_connection, record, proxy):
+            with self._lock:
+                self.checkouts += 1
+                self.max_checked_out = max(self.max_checked_out, engine.pool.checkedout())
+
+        @event.listens_for(engine, "connect")
+        def _connect(dbapi_connection, record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "invalidate")
+        def _invalidate(dbapi_connection, record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+        @event.listens_for(engine, "handle_error")
+        def _handle_error(context):
+            if context.is_pre_ping:
+                with self._lock:
+                    self.pre_ping_failures += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "pool_class": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "timeouts": self.timeouts,
+                "max_checked_out": self.max_checked_out,
+                "wait_seconds": self.wait.snapshot(),
+            }
+        data.update(pool_status(pool))
+        return data
+
+
+class _TimedCheckout:
+    """Mixin timing how long ``_do_get`` blocks waiting for a free connection."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - start, timed_out)
+
+    def recreate(self):
+        # engine.dispose() crea un pool nuevo: conserva las métricas
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_sqlite_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def pool_options(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """``create_engine`` pool arguments for ``database_url`` from the ``DB_POOL_*`` settings."""
+    url = make_url(database_url)
+    if _is_sqlite_memory(url):
+        # Una base en memoria solo existe dentro de su conexión: se comparte una única conexión
+        return {"poolclass": StaticPool}
+    pre_ping = settings.db_pool_pre_ping
+    if pre_ping is None:
+        # Un fichero SQLite no "se cae": el ping solo añade una consulta por checkout
+        pre_ping = url.get_backend_name() != "sqlite"
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": pre_ping,
+        "pool_use_lifo": settings.db_pool_use_lifo,
+    }
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """Current occupancy; ``saturation`` is checked-out connections over the maximum the pool allows."""
+    if not isinstance(pool, QueuePool):
+        return {"size": None, "checked_out": None, "checked_in": None, "overflow": None, "saturation": None}
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "saturation": checked_out / capacity if capacity and pool._max_overflow >= 0 else None,
+    }
@@ -0,0 +1,95 @@
+"""Escritor único: serializa las transacciones de escritura del proceso.
+
+SQLite admite un solo escritor a la vez; con varias escrituras concurrentes
+las demás esperan dentro de SQLite (``busy_timeout``, sondeando con sleeps)
+y, agotado el plazo, fallan con ``database is locked``. ``SerializedWriter``
+las pone en cola en el propio proceso (FIFO) antes de tocar la base de datos,
+mientras las lecturas siguen repartidas entre las conexiones del pool.
+"""
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db_pool import Histogram, WAIT_BUCKETS
+
+T = TypeVar("T")
+
+# Marca la tarea que ya ocupa el turno de escritura (llamadas anidadas no vuelven a esperar)
+_holding: ContextVar[bool] = ContextVar("db_writer_holding", default=False)
+
+
+class SerializedWriter:
+    """FIFO write slot; when disabled (non-SQLite backends) ``slot()`` is a no-op."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        # asyncio.Lock queda ligado a su event loop: uno por loop (TestClient crea loops nuevos)
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self._stats_lock = threading.Lock()
+        self.writes = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.wait = Histogram(WAIT_BUCKETS)
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def slot(self, db: AsyncSession | None = None) -> AsyncIterator[None]:
+        """Hold the write slot; on error ``db`` is rolled back before the slot is released."""
+        if not self.enabled or _holding.get():
+            yield
+            return
+        lock = self._lock()
+        start = time.perf_counter()
+        with self._stats_lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await lock.acquire()
+        finally:
+            with self._stats_lock:
+                self.waiting -= 1
+        with self._stats_lock:
+            self.writes += 1
+            self.wait.observe(time.perf_counter() - start)
+        token = _holding.set(True)
+        try:
+            yield
+        except BaseException:
+            # No liberar el turno con una transacción abierta: retendría el bloqueo de SQLite
+            if db is not None:
+                await db.rollback()
+            raise
+        finally:
+            _holding.reset(token)
+            lock.release()
+
+    def serialized(self, func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        """Decorator for service functions taking the ``AsyncSession`` as first argument."""
+
+        @functools.wraps(func)
+        async def wrapper(db: AsyncSession, *args: Any, **kwargs: Any) -> T:
+            async with self.slot(db):
+                return await func(db, *args, **kwargs)
+
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "enabled": self.enabled,
+                "writes": self.writes,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "wait_seconds": self.wait.snapshot(),
+            }
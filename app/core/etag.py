@@ -0,0 +1,28 @@
+from typing import Awaitable, Callable, Optional
+from fastapi import Request, Response
+
+
+def weak_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110) of ``etag`` against an ``If-None-Match`` header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+async def conditional_response(request: Request, etag: Optional[str], build: Callable[[], Awaitable[Response]]) -> Response:
+    """304 without body when ``If-None-Match`` matches ``etag``; otherwise ``build()`` with the ETag header.
+    ``etag=None`` (resource not found) always builds, so ``build`` can raise the 404.
+    """
+    if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response = await build()
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return response
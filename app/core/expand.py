@@ -0,0 +1,20 @@
+from typing import Callable
+from fastapi import HTTPException, Query
+
+
+def expand_param(allowed: set[str]) -> Callable[..., frozenset[str]]:
+    """Build a dependency that parses ``?expand=a,b`` into the set of relationships to load.
+    Unknown names are rejected with 400 so typos do not silently return summaries.
+    """
+    def dependency(
+        expand: str | None = Query(None, description=f"Relaciones a incluir, separadas por coma: {', '.join(sorted(allowed))}"),
+    ) -> frozenset[str]:
+        if not expand:
+            return frozenset()
+        fields = frozenset(f.strip() for f in expand.split(",") if f.strip())
+        unknown = fields - allowed
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"expand no soportado: {', '.join(sorted(unknown))}")
+        return fields
+
+    return dependency
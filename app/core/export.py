@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal, Sequence
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+
+# Formato -> media type de la respuesta
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_format(format: Literal["ndjson", "csv"] = Query("ndjson", description="Formato de exportación")) -> str:
+    return format
+
+
+async def _ndjson(batches: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    async for rows in batches:
+        # Un chunk por lote: la memoria depende del tamaño de lote, no del total exportado
+        yield "".join(json.dumps(row._asdict(), ensure_ascii=False) + "\n" for row in rows)
+
+
+async def _csv(batches: AsyncIterator[Sequence[Row]], columns: Sequence[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Cabecera de una exportación vacía
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(batches: AsyncIterator[Sequence[Row]], columns: Sequence[str], fmt: str, name: str) -> StreamingResponse:
+    """Stream ``batches`` of rows (as produced by the services' ``export_*``) as NDJSON or CSV."""
+    body = _ndjson(batches) if fmt == "ndjson" else _csv(batches, columns)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
@@ -0,0 +1,61 @@
+"""Routers importados bajo demanda (``FAST_STARTUP``).
+
+``LazyRouter`` ocupa en la app el sitio de un router que todavía no se ha
+importado: atiende cualquier ruta bajo su prefijo y, la primera vez, importa el
+módulo, incluye su ``router`` en la app, se retira y vuelve a despachar la
+petición, que ya encuentra las rutas reales. Si el import falla, la petición
+falla y el marcador se queda para reintentarlo en la siguiente. ``load_all`` los carga todos (lo
+necesita el esquema OpenAPI).
+"""
+import importlib
+from typing import List
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder route for ``module.router`` mounted at ``prefix + path``."""
+
+    def __init__(self, app: FastAPI, prefix: str, path: str, module: str):
+        self.app = app
+        self.prefix = prefix
+        self.path = prefix + path
+        self.module = module
+        self.loaded = False
+
+    def matches(self, scope: Scope):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.path or path.startswith(self.path + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    def load(self) -> None:
+        if self.loaded:
+            return
+        # Sin await entre la comprobación y el cambio de rutas: dos primeras peticiones a la vez no lo duplican.
+        # Si el import falla, la excepción sale y el marcador sigue en su sitio: la siguiente petición lo reintenta
+        router = importlib.import_module(self.module).router
+        self.app.include_router(router, prefix=self.prefix)
+        self.app.router.routes.remove(self)
+        self.loaded = True
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
+
+
+def register(app: FastAPI, prefix: str, routers: dict[str, str]) -> List[LazyRouter]:
+    """Add a placeholder per ``{path: module}``; ``path`` is the router's own prefix under ``prefix``."""
+    placeholders = [LazyRouter(app, prefix, path, module) for path, module in routers.items()]
+    app.router.routes.extend(placeholders)
+    return placeholders
+
+
+def load_all(app: FastAPI) -> None:
+    for route in [r for r in app.router.routes if isinstance(r, LazyRouter)]:
+        route.load()
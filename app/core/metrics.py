@@ -0,0 +1,214 @@
+"""Métricas de la API en formato de texto de Prometheus (``GET /metrics``).
+
+``MetricsMiddleware`` mide cada petición por plantilla de ruta
+(``/api/v1/items/{item_id}``, no la ruta real: cardinalidad acotada) y
+``attach`` cuenta las consultas SQL de un engine y su tiempo, tanto en total
+como por petición. Las peticiones que superan
+``metrics_n_plus_one_threshold`` consultas se marcan como posible N+1.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.db_pool import Histogram
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Peticiones que no encajan con ninguna ruta (404): una sola serie en lugar de una por URL
+UNMATCHED_ROUTE = "unmatched"
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Estadísticas de la petición en curso (los hilos del threadpool y los greenlets de SQLAlchemy heredan el contexto)
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+Labels = Tuple[str, ...]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Labels, int] = {}
+        self.duration: Dict[Labels, Histogram] = {}
+        self.request_queries: Dict[Labels, Histogram] = {}
+        self.request_db_seconds: Dict[Labels, Histogram] = {}
+        self.n_plus_one: Dict[Labels, int] = {}
+        self.queries = 0
+        self.query_seconds = Histogram(QUERY_BUCKETS)
+
+    def observe_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.query_seconds.observe(seconds)
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += seconds
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        threshold = settings.metrics_n_plus_one_threshold
+        flagged = threshold > 0 and stats.queries > threshold
+        with self._lock:
+            self.requests[(method, route, str(status))] = self.requests.get((method, route, str(status)), 0) + 1
+            self.duration.setdefault(key, Histogram(REQUEST_BUCKETS)).observe(seconds)
+            self.request_queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(stats.queries)
+            self.request_db_seconds.setdefault(key, Histogram(REQUEST_BUCKETS)).observe(stats.db_seconds)
+            if flagged:
+                self.n_plus_one[key] = self.n_plus_one.get(key, 0) + 1
+        if flagged:
+            logger.warning("Posible N+1: %s %s ejecutó %d consultas (umbral %d)", method, route, stats.queries, threshold)
+
+    def render(self, pools: Optional[Dict[str, Any]] = None) -> str:
+        """Prometheus text exposition; ``pools`` is ``database.pool_metrics()``."""
+        out = _Exposition()
+        with self._lock:
+            out.family("http_requests_total", "counter", "Peticiones HTTP por ruta, método y estado")
+            for (method, route, status), n in sorted(self.requests.items()):
+                out.sample("http_requests_total", {"method": method, "route": route, "status": status}, n)
+            out.histograms("http_request_duration_seconds", "Duración de las peticiones HTTP", self.duration, ("method", "route"))
+            out.histograms("http_request_db_queries", "Consultas SQL por petición", self.request_queries, ("method", "route"))
+            out.histograms("http_request_db_seconds", "Tiempo en consultas SQL por petición", self.request_db_seconds, ("method", "route"))
+            out.family("http_n_plus_one_requests_total", "counter", f"Peticiones con más de {settings.metrics_n_plus_one_threshold} consultas SQL (posible N+1)")
+            for (method, route), n in sorted(self.n_plus_one.items()):
+                out.sample("http_n_plus_one_requests_total", {"method": method, "route": route}, n)
+            out.family("db_queries_total", "counter", "Consultas SQL ejecutadas")
+            out.sample("db_queries_total", {}, self.queries)
+            out.histograms("db_query_duration_seconds", "Duración de las consultas SQL", {(): self.query_seconds}, ())
+        if pools:
+            out.pools(pools)
+        return out.text()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Exposition:
+    def __init__(self):
+        self.lines: list[str] = []
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> str:
+        if not labels:
+            return ""
+        escaped = (f'{k}="{_escape(v)}"' for k, v in labels.items())
+        return "{" + ",".join(escaped) + "}"
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, labels: Dict[str, Any], value: float) -> None:
+        self.lines.append(f"{name}{self._labels(labels)} {value}")
+
+    def histogram(self, name: str, labels: Dict[str, Any], snapshot: Dict[str, Any]) -> None:
+        for bound, n in snapshot["buckets"].items():
+            self.sample(f"{name}_bucket", {**labels, "le": bound}, n)
+        self.sample(f"{name}_sum", labels, snapshot["sum"])
+        self.sample(f"{name}_count", labels, snapshot["count"])
+
+    def histograms(self, name: str, help_text: str, series: Dict[Labels, Histogram], label_names: Iterable[str]) -> None:
+        self.family(name, "histogram", help_text)
+        for key, hist in sorted(series.items()):
+            self.histogram(name, dict(zip(label_names, key)), hist.snapshot())
+
+    def pools(self, pools: Dict[str, Any]) -> None:
+        engines = {name: data for name, data in pools.items() if name != "writer"}
+        for metric, field, kind, help_text in (
+            ("db_pool_checked_out", "checked_out", "gauge", "Conexiones en uso"),
+            ("db_pool_overflow", "overflow", "gauge", "Conexiones por encima de pool_size"),
+            ("db_pool_checkouts_total", "checkouts", "counter", "Checkouts del pool"),
+            ("db_pool_connects_total", "connects", "counter", "Conexiones nuevas abiertas"),
+            ("db_pool_timeouts_total", "timeouts", "counter", "Esperas por conexión que agotaron pool_timeout"),
+        ):
+            self.family(metric, kind, help_text)
+            for engine, data in engines.items():
+                if data.get(field) is not None:
+                    self.sample(metric, {"engine": engine}, data[field])
+        self.family("db_pool_wait_seconds", "histogram", "Espera por una conexión libre")
+        for engine, data in engines.items():
+            self.histogram("db_pool_wait_seconds", {"engine": engine}, data["wait_seconds"])
+        writer = pools.get("writer")
+        if writer and writer["enabled"]:
+            self.family("db_writer_waiting", "gauge", "Escrituras esperando turno en la cola de escritura")
+            self.sample("db_writer_waiting", {}, writer["waiting"])
+            self.family("db_writer_wait_seconds", "histogram", "Espera por el turno de escritura")
+            self.histogram("db_writer_wait_seconds", {}, writer["wait_seconds"])
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def attach(engine: Engine, registry: MetricsRegistry = metrics) -> None:
+    """Time every cursor execution of ``engine`` (also counted in the current request)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            registry.observe_query(time.perf_counter() - start)
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled (or would handle) the request."""
+    # FastAPI deja la ruta resuelta en el scope: su plantilla agrupa /items/1, /items/2...
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        # Cortada antes del router (401/403 del middleware de roles): se busca la ruta que habría atendido
+        route = next((r for r in scope["app"].router.routes if r.matches(scope)[0] == Match.FULL), None)
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and SQL queries per route template."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            self.registry.observe_request(scope["method"], route_template(scope), status, time.perf_counter() - start, stats)
@@ -0,0 +1,178 @@
+"""Migraciones versionadas del esquema (sin Alembic).
+
+Cada migración es una función ``(conn) -> None`` registrada en ``MIGRATIONS``
+con un número de versión creciente. ``upgrade`` aplica las pendientes en orden,
+cada una en su propia transacción, y las anota en ``schema_migrations``.
+
+En una base nueva ``Base.metadata.create_all`` ya crea el esquema final, así que
+las migraciones deben ser idempotentes (``IF NOT EXISTS`` / ``IF EXISTS``, columnas
+que se añaden solo si faltan): en ese caso solo quedan registradas.
+
+``schema_marker`` guarda la huella (``fingerprint``) del esquema que dejaron
+``create_all`` y las migraciones. Con ``FAST_STARTUP`` el arranque la compara
+con una sola consulta y se salta ambos pasos si coincide, en lugar de
+inspeccionar tabla por tabla. La huella solo se guarda si la base tiene todas
+las columnas de los modelos (``missing_columns``).
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple
+from sqlalchemy import Column, DateTime, Integer, String, Table, delete, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.schema import CreateIndex, CreateTable, DropIndex, Index
+from app.core.database import Base
+from app.models.category import item_category
+from app.models.item import Item
+from app.services import item_counts, search_index, versions
+
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+schema_marker = Table(
+    "schema_marker",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _index(table, name: str) -> Index:
+    return next(index for index in table.indexes if index.name == name)
+
+
+def _create_index(conn: Connection, index: Index) -> None:
+    conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _drop_index(conn: Connection, name: str) -> None:
+    conn.execute(DropIndex(Index(name), if_exists=True))
+
+
+def _composite_list_indexes(conn: Connection) -> None:
+    # (owner_id, id) y (category_id, item_id) sustituyen a los índices de una columna que cubren
+    _create_index(conn, _index(Item.__table__, "ix_items_owner_id_id"))
+    _create_index(conn, _index(item_category, "ix_item_category_category_id_item_id"))
+    _drop_index(conn, "ix_items_owner_id")
+    # item_id ya es el prefijo de la PK (item_id, category_id)
+    _drop_index(conn, "ix_item_category_item_id")
+    _drop_index(conn, "ix_item_category_category_id")
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl: str) -> bool:
+    """``ALTER TABLE ... ADD COLUMN`` unless the column exists; returns whether it was added."""
+    if any(c["name"] == column for c in inspect(conn).get_columns(table)):
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def _row_versions(conn: Connection) -> None:
+    # Bases creadas antes de las versiones de fila
+    for table in versions.COLLECTIONS:
+        _add_column(conn, table, "version", "INTEGER NOT NULL DEFAULT 1")
+    versions.collection_versions.create(bind=conn, checkfirst=True)
+    versions.seed(conn)
+
+
+def _item_counts(conn: Connection) -> None:
+    for table in item_counts.COUNTED:
+        _add_column(conn, table, "item_count", "INTEGER NOT NULL DEFAULT 0")
+    # Recuento real (también corrige contadores desfasados de bases que ya tenían la columna)
+    item_counts.reconcile(conn, fix=True)
+
+
+def _search_index(conn: Connection) -> None:
+    for table in search_index.INDEXED:
+        search_index.rebuild(conn, table)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "composite_list_indexes", _composite_list_indexes),
+    Migration(2, "row_versions", _row_versions),
+    Migration(3, "item_counts", _item_counts),
+    Migration(4, "search_index", _search_index),
+]
+
+
+def applied(conn: Connection) -> dict[int, datetime]:
+    """Applied versions with their timestamp (the table is created if missing)."""
+    schema_migrations.create(bind=conn, checkfirst=True)
+    return dict(conn.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at)).all())
+
+
+def pending(engine: Engine) -> List[Migration]:
+    with engine.begin() as conn:
+        done = applied(conn)
+    return [m for m in MIGRATIONS if m.version not in done]
+
+
+def upgrade(engine: Engine) -> List[Migration]:
+    """Apply the pending migrations in order; returns the ones applied by this call."""
+    done: List[Migration] = []
+    for migration in pending(engine):
+        try:
+            with engine.begin() as conn:
+                migration.apply(conn)
+                conn.execute(schema_migrations.insert().values(version=migration.version, name=migration.name, applied_at=datetime.now(timezone.utc)))
+        except IntegrityError:
+            # Otro proceso (p. ej. otro worker arrancando a la vez) la registró antes
+            continue
+        done.append(migration)
+    return done
+
+
+def fingerprint(engine: Engine) -> str:
+    """SHA-256 of the DDL of every model table and index plus the known migration versions."""
+    parts = [f"migrations {[m.version for m in MIGRATIONS]}"]
+    for table in Base.metadata.sorted_tables:
+        parts.append(str(CreateTable(table).compile(dialect=engine.dialect)))
+        parts.extend(sorted(str(CreateIndex(index).compile(dialect=engine.dialect)) for index in table.indexes))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def schema_current(engine: Engine) -> bool:
+    """True if the stored marker matches the models (one query; False if there is no marker yet)."""
+    try:
+        with engine.connect() as conn:
+            stored = conn.execute(select(schema_marker.c.fingerprint).where(schema_marker.c.id == 1)).scalar()
+    except SQLAlchemyError:
+        # Base nueva o anterior al marcador
+        return False
+    return stored == fingerprint(engine)
+
+
+def missing_columns(engine: Engine) -> List[str]:
+    """``table.column`` of every model column absent from an existing table (the fingerprint only covers the models).
+    Tablas enteras que faltan no cuentan: las crea ``create_all``.
+    """
+    missing = []
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name in tables:
+                existing = {c["name"] for c in inspector.get_columns(table.name)}
+                missing += [f"{table.name}.{column.name}" for column in table.columns if column.name not in existing]
+    return missing
+
+
+def mark_current(engine: Engine) -> bool:
+    """Store the fingerprint after ``create_all`` and ``upgrade``, only if no model column is missing."""
+    if missing_columns(engine):
+        return False
+    with engine.begin() as conn:
+        conn.execute(delete(schema_marker))
+        conn.execute(insert(schema_marker).values(id=1, fingerprint=fingerprint(engine)))
+    return True
@@ -0,0 +1,120 @@
+"""Documento OpenAPI precalculado (``/openapi.json``).
+
+``scripts/build_openapi.py`` genera el esquema una vez y lo guarda en
+``OPENAPI_FILE`` junto a sus variantes comprimidas (``.gz`` y, con el paquete
+brotli, ``.br``). Cada worker lo lee en ``startup`` y lo sirve tal cual, con
+ETag fuerte y la variante que pida ``Accept-Encoding``: FastAPI no recorre las
+rutas ni los modelos de Pydantic en la primera petición.
+
+Sin ``OPENAPI_FILE`` (o si el fichero no existe) el esquema se genera en la
+primera petición, como antes, y a partir de ahí se sirve igual desde memoria.
+"""
+import gzip
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+from fastapi import FastAPI, Request, Response
+from starlette.routing import Route
+from app.core.compression import brotli, compress, current_encoding
+from app.core.config import settings
+from app.core.etag import etag_matches
+
+logger = logging.getLogger(__name__)
+
+# Sufijo de fichero de cada variante comprimida
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def render(schema: Dict[str, Any]) -> bytes:
+    """Same bytes as FastAPI's ``JSONResponse`` for the schema."""
+    return json.dumps(schema, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class OpenAPIDocument:
+    """Serialized schema with its strong ETag and compressed variants (computed on first use if missing)."""
+
+    def __init__(self, body: bytes, variants: Optional[Dict[str, bytes]] = None):
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = dict(variants or {})
+
+    def etag(self, encoding: Optional[str]) -> str:
+        # Fuerte: cada representación (identidad, gzip, br) tiene su propio ETag
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self.variants:
+            self.variants[encoding] = compress(self.body, encoding)
+        return self.variants[encoding]
+
+    def response(self, request: Request) -> Response:
+        encoding = current_encoding() if len(self.body) >= settings.compression_minimum_size else None
+        etag = self.etag(encoding)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={**headers, "Vary": "Accept-Encoding"})
+        if encoding is None:
+            # CompressionMiddleware le añade Vary al no comprimirla
+            return Response(self.body, media_type="application/json", headers=headers)
+        # Con Content-Encoding ya fijado, CompressionMiddleware la deja pasar sin recomprimir
+        headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+        return Response(self.encoded(encoding), media_type="application/json", headers=headers)
+
+
+def build(app: FastAPI) -> OpenAPIDocument:
+    """Generate the schema in-process (every lazy router included) at maximum compression."""
+    body = render(app.openapi())
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return OpenAPIDocument(body, variants)
+
+
+def write(document: OpenAPIDocument, path: Path) -> None:
+    """Write the document and its variants (``path`` + ``.gz`` / ``.br``); stale variants are removed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(document.body)
+    for encoding, suffix in SUFFIXES.items():
+        variant = path.with_name(path.name + suffix)
+        if encoding in document.variants:
+            variant.write_bytes(document.variants[encoding])
+        else:
+            variant.unlink(missing_ok=True)
+
+
+def read(path: Path) -> OpenAPIDocument:
+    variants = {}
+    for encoding, suffix in SUFFIXES.items():
+        variant = path.with_name(path.name + suffix)
+        if variant.is_file():
+            variants[encoding] = variant.read_bytes()
+    return OpenAPIDocument(path.read_bytes(), variants)
+
+
+def load(app: FastAPI) -> None:
+    """Load ``OPENAPI_FILE`` into ``app.state`` (workers call it at startup)."""
+    if not settings.openapi_file:
+        return
+    path = Path(settings.openapi_file)
+    if not path.is_file():
+        logger.warning("OPENAPI_FILE=%s no existe; el esquema se generará en la primera petición (python scripts/build_openapi.py)", path)
+        return
+    app.state.openapi_document = read(path)
+
+
+def install(app: FastAPI) -> None:
+    """Replace FastAPI's ``openapi_url`` route with one that serves the precomputed document."""
+    if not app.openapi_url:
+        return
+    app.router.routes[:] = [r for r in app.router.routes if not (isinstance(r, Route) and r.path == app.openapi_url)]
+
+    async def openapi_json(request: Request) -> Response:
+        document = getattr(app.state, "openapi_document", None)
+        if document is None:
+            # Sin fichero precalculado: se genera una vez por worker y se queda en memoria
+            document = app.state.openapi_document = OpenAPIDocument(render(app.openapi()))
+        return document.response(request)
+
+    app.add_route(app.openapi_url, openapi_json, include_in_schema=False)
@@ -0,0 +1,42 @@
+import base64
+import json
+from typing import Sequence
+from fastapi import HTTPException, Response
+
+# Header con el cursor opaco de la página siguiente (modo keyset)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"after": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the last seen id encoded in ``cursor``; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after = json.loads(raw)["after"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(after, int):
+        raise ValueError("Cursor inválido")
+    return after
+
+
+def cursor_after_id(cursor: str | None = None) -> int | None:
+    """Dependency: opaque ``cursor`` query param -> ``id > after_id`` keyset filter.
+    When present it replaces ``skip`` (OFFSET), which slows down linearly with depth.
+    """
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int) -> None:
+    """Expose the next page cursor when the page is full (ordering is always by id)."""
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
@@ -0,0 +1,104 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    """Hash a password with bcrypt using the configured work factor."""
+    salt = bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded worker pool so it never blocks request handling.
+
+    At most ``workers + queue_limit`` operations are admitted at once; beyond
+    that callers get a 503 with ``Retry-After`` instead of an unbounded queue.
+    With ``workers=0`` a small thread pool is used instead of processes.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, rounds: int, retry_after: int):
+        self.workers = workers
+        self.rounds = rounds
+        self.retry_after = retry_after
+        self.max_in_flight = max(workers, 1) + queue_limit
+        self._in_flight = 0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # spawn: los procesos no heredan conexiones de DB ni el event loop del padre
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bcrypt")
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _discard(self, executor: Executor) -> None:
+        """Shut down a broken ``executor``; the next call creates a new one unless another call already did."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servicio ocupado, reintenta más tarde",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise self._busy()
+            self._in_flight += 1
+        try:
+            # El pool devuelto y no self._executor: un shutdown concurrente lo deja en None y
+            # run_in_executor(None, ...) ejecutaría bcrypt en el pool por defecto del loop
+            executor = self.start()
+            try:
+                future = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            except RuntimeError:
+                # Pool cerrado o roto entre start() y el envío (BrokenProcessPool también es RuntimeError)
+                self._discard(executor)
+                raise self._busy()
+            return await future
+        except BrokenProcessPool:
+            # Un worker murió: se descarta el pool y se recrea en la siguiente llamada
+            self._discard(executor)
+            raise self._busy()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(verify_password, password, hashed)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    queue_limit=settings.password_hash_queue_limit,
+    rounds=settings.bcrypt_rounds,
+    retry_after=settings.password_hash_retry_after,
+)
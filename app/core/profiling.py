@@ -0,0 +1,279 @@
+"""Perfilado bajo demanda de una petición concreta.
+
+Con ``X-Profile: 1`` o ``?_profile=1`` y un token con un rol de
+``PROFILING_ACCESS`` (``app/core/routes_config.py``), ``ProfilingMiddleware``
+ejecuta esa petición con un muestreador de pilas (hilo aparte que lee
+``sys._current_frames()`` y se queda con las pilas de esa petición), anota las sentencias SQL que ejecuta y guarda el
+resultado en memoria. La respuesta lleva ``X-Profile-Id`` para descargarlo
+después (``GET /api/v1/admin/profiles/{id}``) en formato colapsado
+(flamegraph.pl, speedscope) o JSON de speedscope.
+
+Sin la marca, o sin permiso, la petición pasa directa: no hay muestreo y los
+hooks SQL solo consultan una ContextVar.
+"""
+import asyncio
+import linecache
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.routes_config import PROFILING_ACCESS
+from app.core.security import decode_token
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = b"_profile=1"
+# Línea en curso de un hilo ocioso (esperando trabajo o E/S): no aporta al perfil.
+# Por la línea y no por la función: aiosqlite espera y ejecuta SQL dentro del mismo Connection.run
+IDLE_LINE = re.compile(r"\.(get|wait|acquire|poll|select)\(")
+# Longitud máxima guardada de cada sentencia SQL
+MAX_STATEMENT_CHARS = 2000
+
+
+class StackSampler:
+    """Background thread counting the collapsed stacks of one request.
+
+    En el hilo que ejecuta la petición solo cuentan las pilas que pasan por
+    ``root`` (su corrutina): el mismo event loop atiende otras peticiones a la
+    vez y sus pilas no son de este perfil. Los hilos añadidos con ``follow``
+    (p. ej. el de la conexión de aiosqlite que ejecuta su SQL) cuentan enteros.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+        self.root = None
+        self.root_thread: Optional[int] = None
+        self.threads: set[int] = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self, root) -> None:
+        """Sample the current thread under frame ``root`` (the request's coroutine)."""
+        self.root = root
+        self.root_thread = threading.get_ident()
+        self._thread.start()
+
+    def follow(self, ident: Optional[int]) -> None:
+        """Also sample thread ``ident`` while it works for the request."""
+        if ident is not None and ident != self.root_thread:
+            self.threads.add(ident)
+
+    def stop(self) -> None:
+        """Signal the sampler without waiting for it (``join`` waits)."""
+        self._stop.set()
+
+    def join(self) -> None:
+        self._thread.join()
+        # Sin referencias al frame de la petición: retendría sus variables locales
+        self.root = None
+
+    @staticmethod
+    def _label(frame) -> tuple[str, str]:
+        return frame.f_globals.get("__name__", "?"), frame.f_code.co_qualname
+
+    def _stack(self, frame, root) -> Optional[list[str]]:
+        """Innermost-first labels of ``frame``'s stack, cut at ``root``; ``None`` if ``root`` is not in it."""
+        stack = []
+        while frame is not None:
+            module, qualname = self._label(frame)
+            stack.append(f"{module}.{qualname}")
+            if frame is root:
+                return stack
+            frame = frame.f_back
+        return None if root is not None else stack
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident != self.root_thread and ident not in self.threads:
+                    continue
+                # f_lineno es None mientras el frame no ejecuta ninguna línea (p. ej. al arrancar una corrutina)
+                if IDLE_LINE.search(linecache.getline(frame.f_code.co_filename, frame.f_lineno or 0)):
+                    continue
+                stack = self._stack(frame, self.root if ident == self.root_thread else None)
+                if stack is None:
+                    continue
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[tuple(reversed(stack))] += 1
+
+
+class Recording:
+    """One profiled request: sampled stacks plus the SQL it ran."""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.status: Optional[int] = None
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.sampler = StackSampler(settings.profiling_sample_interval)
+        self.sql: list[Dict[str, Any]] = []
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "samples": self.sampler.samples,
+            "queries": len(self.sql),
+        }
+
+    def detail(self) -> Dict[str, Any]:
+        return {**self.summary(), "sample_interval": self.sampler.interval, "sql": self.sql}
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format (``frame;frame;frame count``)."""
+        return "".join(f"{';'.join(stack)} {n}\n" for stack, n in self.sampler.stacks.most_common())
+
+    def speedscope(self) -> Dict[str, Any]:
+        """speedscope file format: a sampled profile weighted by sample count."""
+        frames: Dict[str, int] = {}
+        samples, weights = [], []
+        for stack, n in self.sampler.stacks.items():
+            samples.append([frames.setdefault(name, len(frames)) for name in stack])
+            weights.append(n)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path}",
+            "exporter": settings.app_name,
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{self.method} {self.path} ({len(self.sql)} consultas SQL)",
+                "unit": "none",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+class ProfileStore:
+    """Last ``max_entries`` recordings, oldest evicted first."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Recording]" = OrderedDict()
+
+    def add(self, recording: Recording) -> None:
+        with self._lock:
+            self._entries[recording.id] = recording
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Recording]:
+        with self._lock:
+            return self._entries.get(profile_id)
+
+    def list(self) -> list[Dict[str, Any]]:
+        with self._lock:
+            return [r.summary() for r in reversed(self._entries.values())]
+
+
+profile_store = ProfileStore(settings.profiling_keep)
+_active: ContextVar[Optional[Recording]] = ContextVar("profiling_recording", default=None)
+# Una sola petición perfilada a la vez: cada muestreo lee las pilas de todos los hilos
+_busy = threading.Lock()
+
+
+def attach(engine: Engine) -> None:
+    """Record the SQL statements run by ``engine`` inside a profiled request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        recording = _active.get()
+        if recording is not None and context is not None:
+            context._profiling_start = time.perf_counter()
+            # El SQL corre en este hilo (engine síncrono en el threadpool) o en el del driver (aiosqlite)
+            recording.sampler.follow(threading.get_ident())
+            driver = conn.connection.driver_connection
+            if isinstance(driver, threading.Thread):
+                recording.sampler.follow(driver.ident)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        recording = _active.get()
+        start = getattr(context, "_profiling_start", None)
+        if recording is not None and start is not None:
+            # Sin parámetros: pueden contener datos personales o contraseñas
+            recording.sql.append({
+                "statement": statement[:MAX_STATEMENT_CHARS],
+                "executemany": executemany,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+def _requested(scope: Scope) -> bool:
+    if PROFILE_QUERY in scope.get("query_string", b"").split(b"&"):
+        return True
+    return any(name == PROFILE_HEADER and value.strip() in (b"1", b"true") for name, value in scope["headers"])
+
+
+def _allowed(scope: Scope) -> bool:
+    """Whether the caller's token carries a role from ``PROFILING_ACCESS``."""
+    request = Request(scope)
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header.split(" ", 1)[1] if auth_header.startswith("Bearer ") else request.cookies.get("access_token")
+    if not token:
+        return False
+    try:
+        return decode_token(token).get("role") in PROFILING_ACCESS["roles"]
+    except Exception:
+        return False
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; requests without the profiling flag pass straight through."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.profiling_enabled or not _requested(scope) or not _allowed(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _busy.acquire(blocking=False):
+            # Ya hay otra petición perfilándose: esta se sirve sin perfil
+            await self.app(scope, receive, send)
+            return
+        recording = Recording(scope["method"], scope["path"])
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                recording.status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", recording.id.encode())]}
+            await send(message)
+
+        token = _active.set(recording)
+        start = time.perf_counter()
+        recording.sampler.start(sys._getframe())
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            recording.sampler.stop()
+            recording.duration = time.perf_counter() - start
+            _active.reset(token)
+            try:
+                # join fuera del event loop: el muestreador puede estar a mitad de una muestra
+                await asyncio.get_running_loop().run_in_executor(None, recording.sampler.join)
+            finally:
+                _busy.release()
+                profile_store.add(recording)
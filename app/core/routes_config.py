@@ -6,11 +6,17 @@ ROUTES_ACCESS = {
     "/api/v1/login": {"public": True},
     "/api/v1/logout": {"public": True},
     "/api/v1/admin": {"roles": ["admin"]},
+    "/api/v1/admin/token-cache": {"roles": ["admin"]},
+    "/api/v1/admin/response-cache": {"roles": ["admin"]},
+    "/api/v1/admin/db-pool": {"roles": ["admin"]},
+    "/api/v1/admin/profiles": {"roles": ["admin"]},
     "/api/v1/profile": {"roles": ["admin", "user"]},
 }
 
 # Prefix-based configuration for resource groups (supports method-specific roles)
 ROUTES_ACCESS_PREFIXES = [
+    # Perfiles de peticiones guardados (/admin/profiles/{id})
+    {"prefix": "/api/v1/admin/profiles", "roles": ["admin"]},
     # Users: read for admin/user; write only admin
     {"prefix": "/api/v1/users", "methods": ["GET"], "roles": ["admin", "user"]},
     {"prefix": "/api/v1/users", "methods": ["POST", "PUT", "PATCH", "DELETE"], "roles": ["admin"]},
@@ -23,4 +29,7 @@ ROUTES_ACCESS_PREFIXES = [
     # Profiles: lectura y escritura para admin y user
     {"prefix": "/api/v1/profiles", "methods": ["GET"], "roles": ["admin", "user"]},
     {"prefix": "/api/v1/profiles", "methods": ["POST", "PUT", "PATCH", "DELETE"], "roles": ["admin", "user"]},
-]
\ No newline at end of file
+]
+
+# Roles que pueden pedir el perfilado de una petición (X-Profile: 1 o ?_profile=1) en cualquier ruta
+PROFILING_ACCESS = {"roles": ["admin"]}
@@ -1,10 +1,82 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+import hashlib
+import threading
+import time
 import jwt  # PyJWT
 from fastapi import HTTPException, status
 from app.core.config import settings
 
 
+class TokenCache:
+    """Bounded LRU cache of verified JWT claims.
+
+    Keys are SHA-256 digests of the token (raw bearer tokens are never kept)
+    and each entry expires at the token's ``exp`` claim.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[1])
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        # Sin exp no hay un límite de validez que respetar: no se cachea
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(exp), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> bool:
+        with self._lock:
+            return self._entries.pop(self._key(token), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache(settings.jwt_cache_max_size)
+
+
 def create_access_token(data: Dict[str, Any], expires_minutes: int | None = None) -> str:
     """Create a JWT token with HS256 and expiration.
     Payload must include user identifiers and role.
@@ -17,11 +89,22 @@ def create_access_token(data: Dict[str, Any], expires_minutes: int | None = None
 
 
 def decode_token(token: str) -> Dict[str, Any]:
-    """Decode and validate JWT token; raises HTTPException if invalid/expired."""
+    """Decode and validate JWT token; raises HTTPException if invalid/expired.
+    Verified claims are served from ``token_cache`` until the token expires.
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expirado")
     except jwt.InvalidTokenError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
+    token_cache.put(token, payload)
+    return payload
+
+
+def invalidate_token(token: str) -> bool:
+    """Drop a token from the verified-token cache (e.g. on logout)."""
+    return token_cache.invalidate(token)
@@ -1,12 +1,20 @@
-from fastapi import FastAPI
-from scalar_fastapi import get_scalar_api_reference
+import asyncio
+import logging
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.routers import api_router
+from app.api.v1.routers import API_PREFIX, api_router, lazy_routers
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core import lazy_routes, migrations, openapi_document
+from app.core.database import Base, engine, async_engine, database_health, pool_metrics, prewarm_pool
 from app.core.auth_middleware import RoleAuthMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.passwords import password_hasher
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from app.core.profiling import ProfilingMiddleware
 
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title=settings.app_name)
 
 # CORS
@@ -16,23 +24,85 @@ app.add_middleware(
     allow_credentials=settings.cors_allow_credentials,
     allow_methods=settings.cors_allow_methods,
     allow_headers=settings.cors_allow_headers,
+    expose_headers=settings.cors_expose_headers,
 )
 
+# Compresión gzip/brotli según Accept-Encoding (dentro de roles y métricas: miden el tiempo de comprimir)
+app.add_middleware(CompressionMiddleware)
+
 # AuthZ Middleware (roles & JWT)
 app.add_middleware(RoleAuthMiddleware)
 
-# Rutas API
+# Métricas (el último añadido es el más externo: también mide las respuestas 401/403)
+app.add_middleware(MetricsMiddleware)
+
+# Perfilado bajo demanda de una petición (X-Profile: 1, solo admin)
+app.add_middleware(ProfilingMiddleware)
+
+# Rutas API (con FAST_STARTUP, los routers de LAZY_ROUTERS se importan en su primera petición)
 app.include_router(api_router)
+lazy_routes.register(app, API_PREFIX, lazy_routers())
+_build_openapi = app.openapi
+
+
+def openapi():
+    # El esquema documenta también los routers que aún no se han importado
+    lazy_routes.load_all(app)
+    return _build_openapi()
+
+
+app.openapi = openapi
+# /openapi.json desde memoria con ETag fuerte y variantes comprimidas (OPENAPI_FILE lo trae ya generado)
+openapi_document.install(app)
 
 @app.get("/health")
-def health():
-    return {"status": "ok"}
+async def health(response: Response):
+    """DB reachability and pool saturation; 503 when the database cannot be reached."""
+    report = await database_health()
+    if report["status"] == "unavailable":
+        response.status_code = 503
+    return report
 
 
-@app.on_event("startup")
-def on_startup():
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition: requests, SQL queries, pools and the write queue."""
+    return Response(metrics.render(pool_metrics()), media_type=CONTENT_TYPE)
+
+
+def init_schema() -> None:
+    """Create missing tables and apply pending migrations (``AUTO_CREATE_TABLES`` / ``AUTO_MIGRATE``).
+
+    With ``FAST_STARTUP`` both are skipped when the stored schema fingerprint matches the models.
+    """
+    if settings.fast_startup and (settings.auto_create_tables or settings.auto_migrate) and migrations.schema_current(engine):
+        return
     if settings.auto_create_tables:
         Base.metadata.create_all(bind=engine)
+    if settings.auto_migrate:
+        migrations.upgrade(engine)
+    if settings.auto_create_tables and settings.auto_migrate and not migrations.mark_current(engine):
+        # Sin huella: el siguiente arranque vuelve a comprobarlo todo
+        logger.warning("Faltan columnas en la base de datos: %s", ", ".join(migrations.missing_columns(engine)))
+
+
+@app.on_event("startup")
+async def on_startup():
+    init_schema()
+    openapi_document.load(app)
+    password_hasher.start()
+    if settings.fast_startup and settings.db_prewarm_connections > 0:
+        # En segundo plano: el servidor acepta peticiones sin esperar a las conexiones
+        app.state.prewarm = asyncio.create_task(prewarm_pool(settings.db_prewarm_connections))
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    prewarm = getattr(app.state, "prewarm", None)
+    if prewarm is not None:
+        prewarm.cancel()
+    password_hasher.shutdown()
+    await async_engine.dispose()
 
 
 @app.get("/")
@@ -42,6 +112,9 @@ def read_root():
 
 @app.get("/scalar", include_in_schema=False)
 async def scalar_html():
+    # Importado al abrir la documentación, no al arrancar
+    from scalar_fastapi import get_scalar_api_reference
+
     return get_scalar_api_reference(
         # Your OpenAPI document
         openapi_url=app.openapi_url,
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Index, Integer, String, Table, ForeignKey, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -7,9 +7,12 @@ from app.core.database import Base
 item_category = Table(
     "item_category",
     Base.metadata,
-    Column("item_id", Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True, index=True),
-    Column("category_id", Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True, index=True),
+    Column("item_id", Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True),
+    Column("category_id", Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
     UniqueConstraint("item_id", "category_id", name="uq_item_category"),
+    # La PK (item_id, category_id) sirve las búsquedas por ítem; este índice las de
+    # "ítems de la categoría X por id" y cubre la consulta (no lee la tabla)
+    Index("ix_item_category_category_id_item_id", "category_id", "item_id"),
 )
 
 
@@ -19,10 +22,16 @@ class Category(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, index=True, nullable=False)
     description = Column(String(300))
+    # Nº de ítems (desnormalizado; lo mantiene app/services/item_counts.py)
+    item_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    # Versión de la fila: +1 en cada UPDATE (ETag de las lecturas condicionales)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=text("version + 1"))
 
     # Relación M:N con Item mediante la tabla de asociación
     items = relationship(
         "Item",
         secondary=item_category,
         back_populates="categories",
-    )
\ No newline at end of file
+    )
+    # Recupera la versión nueva con RETURNING tras cada flush (sin lazy-load en AsyncSession)
+    __mapper_args__ = {"eager_defaults": True}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.category import item_category
@@ -10,7 +10,9 @@ class Item(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(String(500))
-    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Versión de la fila: +1 en cada UPDATE (ETag de las lecturas condicionales)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=text("version + 1"))
     owner = relationship("User", back_populates="items")
     # Relación M:N con Category
     categories = relationship(
@@ -18,4 +20,10 @@ class Item(Base):
         secondary=item_category,
         back_populates="items",
     )
-    
\ No newline at end of file
+
+    __table_args__ = (
+        # "Ítems de un usuario por id" (filtro owner_id + orden/cursor por id) sin ordenar aparte
+        Index("ix_items_owner_id_id", "owner_id", "id"),
+    )
+    # Recupera la versión nueva con RETURNING tras cada flush (sin lazy-load en AsyncSession)
+    __mapper_args__ = {"eager_defaults": True}
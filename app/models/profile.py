@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -13,10 +13,14 @@ class Profile(Base):
     bio = Column(String(500), nullable=True)
     phone = Column(String(50), nullable=True)
     avatar_url = Column(String(255), nullable=True)
+    # Versión de la fila: +1 en cada UPDATE (ETag de las lecturas condicionales)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=text("version + 1"))
 
     # Relación uno a uno hacia User
     user = relationship("User", back_populates="profile")
 
     __table_args__ = (
         UniqueConstraint("user_id", name="uq_profiles_user_id"),
-    )
\ No newline at end of file
+    )
+    # Recupera la versión nueva con RETURNING tras cada flush (sin lazy-load en AsyncSession)
+    __mapper_args__ = {"eager_defaults": True}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -21,6 +21,10 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     # Role: 'admin', 'user', or 'guest'
     role = Column(String(20), nullable=False, default="user")
+    # Nº de ítems (desnormalizado; lo mantiene app/services/item_counts.py)
+    item_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    # Versión de la fila: +1 en cada UPDATE (ETag de las lecturas condicionales)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=text("version + 1"))
 
     # Relación uno a uno con Profile
     profile = relationship(
@@ -29,4 +33,6 @@ class User(Base):
         uselist=False,
         cascade="all, delete-orphan",
         passive_deletes=True,
-    )
\ No newline at end of file
+    )
+    # Recupera la versión nueva con RETURNING tras cada flush (sin lazy-load en AsyncSession)
+    __mapper_args__ = {"eager_defaults": True}
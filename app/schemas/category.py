@@ -13,6 +13,8 @@ class CategoryCreate(CategoryBase):
 
 class CategoryRead(CategoryBase):
     id: int
+    # Total de ítems de la categoría (contador precalculado)
+    item_count: int = 0
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -31,4 +33,11 @@ class ItemSummaryForCategory(BaseModel):
 
 
 class CategoryReadWithItems(CategoryRead):
-    items: list[ItemSummaryForCategory] = []
\ No newline at end of file
+    items: list[ItemSummaryForCategory] = []
+
+
+# Fila de listado: resumen por defecto; ítems solo con ?expand=items
+class CategoryListRead(CategoryRead):
+    # Primeros N ítems (items_limit) y total de ítems de la categoría (= item_count)
+    items: list[ItemSummaryForCategory] | None = None
+    items_total: int | None = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic import ConfigDict
 
 
@@ -42,4 +42,36 @@ class ItemReadWithOwner(ItemRead):
         name: str
         model_config = ConfigDict(from_attributes=True)
 
-    categories: list[CategorySummary] = []
\ No newline at end of file
+    categories: list[CategorySummary] = []
+
+# Operaciones masivas (una transacción por petición)
+MAX_BULK_ITEMS = 10000
+
+
+class ItemBulkCreate(BaseModel):
+    items: list[ItemCreate] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class ItemBulkUpdateEntry(ItemUpdate):
+    id: int
+
+
+class ItemBulkUpdate(BaseModel):
+    items: list[ItemBulkUpdateEntry] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class ItemBulkDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkRowError(BaseModel):
+    # Posición de la fila en la petición
+    index: int
+    id: int | None = None
+    detail: str
+
+
+class ItemBulkResult(BaseModel):
+    # Ids de las filas aplicadas, en el orden de la petición y sin repetir
+    ids: list[int] = []
+    errors: list[BulkRowError] = []
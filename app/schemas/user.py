@@ -15,6 +15,8 @@ class UserCreate(UserBase):
 class UserRead(UserBase):
     id: int
     role: str
+    # Total de ítems del usuario (contador precalculado)
+    item_count: int = 0
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -53,4 +55,12 @@ class UserReadWithProfile(UserRead):
 # Usuario con ítems y perfil embebidos
 class UserReadFull(UserRead):
     items: list[ItemSummary] = []
-    profile: ProfileSummary | None = None
\ No newline at end of file
+    profile: ProfileSummary | None = None
+
+
+# Fila de listado: resumen por defecto; relaciones solo con ?expand=items,profile
+class UserListRead(UserRead):
+    # Primeros N ítems (items_limit) y total de ítems del usuario (= item_count)
+    items: list[ItemSummary] | None = None
+    items_total: int | None = None
+    profile: ProfileSummary | None = None
@@ -0,0 +1,210 @@
+"""Arranque de producción con varios procesos: ``python -m app.serve``.
+
+- Con gunicorn instalado (Linux/macOS): maestro gunicorn con workers de
+  uvicorn. La app se importa en el maestro (``SERVE_PRELOAD``) y los workers
+  la heredan al hacer fork, compartiendo esa memoria por copy-on-write. Cada
+  worker se recicla tras ``SERVE_MAX_REQUESTS`` peticiones (más un margen
+  aleatorio) y se reinicia si deja de dar señales de vida.
+- Sin gunicorn (p. ej. Windows): supervisor de uvicorn con ``workers``. Cada
+  worker importa la app por su cuenta (sin precarga) y se recicla sin margen.
+
+uvloop y httptools se usan si están instalados (``SERVE_LOOP`` / ``SERVE_HTTP``
+en ``auto``). El esquema (``create_all`` y migraciones) se prepara una sola vez
+en el maestro, antes de crear los workers.
+
+``SERVE_WORKERS=0`` arranca un worker por CPU, salvo con SQLite y la cola de
+escritura activa (``SQLITE_SINGLE_WRITER``): solo ordena las escrituras de su
+proceso, así que arranca uno. Las métricas y los perfiles también guardan su
+estado en cada proceso; con varios workers se avisa al arrancar.
+"""
+import argparse
+import os
+import sys
+import warnings
+from typing import Any, Dict, List
+
+from app.core.config import settings
+
+SERVERS = ("auto", "gunicorn", "uvicorn")
+
+
+def default_workers() -> int:
+    """One worker per CPU this process may run on (affinity/cpuset aware where available)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def single_writer() -> bool:
+    """SQLite write queue active: it only orders the writes of its own process."""
+    from app.core.database import db_writer
+
+    return db_writer.enabled
+
+
+def per_process_features() -> List[str]:
+    """Enabled features whose state lives in each worker and is not shared between them."""
+    features = []
+    if settings.metrics_enabled:
+        features.append("METRICS_ENABLED: /metrics muestra solo los contadores del worker que responde")
+    if settings.profiling_enabled:
+        features.append("PROFILING_ENABLED: /api/v1/admin/profiles/{id} solo encuentra el perfil en el worker que lo grabó")
+    if single_writer():
+        features.append("SQLITE_SINGLE_WRITER: la cola de escritura solo ordena las escrituras de su worker")
+    return features
+
+
+def resolve_workers(requested: int, write_queue: bool) -> int:
+    """``requested`` when set; otherwise one per CPU, or 1 while the SQLite write queue is on."""
+    if requested:
+        return requested
+    return 1 if write_queue else default_workers()
+
+
+def has_gunicorn() -> bool:
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def prepare_master() -> None:
+    """Import the app and prepare the schema once, before any worker exists.
+
+    Los workers no repiten ``create_all`` ni las migraciones: heredan
+    ``settings`` al hacer fork y el entorno cuando se arrancan con spawn.
+    """
+    from app.core.database import engine
+    from app.main import init_schema
+
+    init_schema()
+    settings.auto_create_tables = settings.auto_migrate = False
+    os.environ["AUTO_CREATE_TABLES"] = os.environ["AUTO_MIGRATE"] = "false"
+    # Sin conexiones abiertas en el maestro: un socket compartido entre procesos tras el fork se corrompe
+    engine.dispose()
+
+
+def reset_engines_after_fork() -> None:
+    """Give the worker fresh pools; connections inherited from the master stay untouched for it."""
+    from app.core.database import async_engine, engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+
+def _uvicorn_worker_class():
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        # Paquete separado en versiones recientes; uvicorn.workers sigue disponible pero avisa de que está obsoleto
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            from uvicorn.workers import UvicornWorker
+
+    class Worker(UvicornWorker):
+        CONFIG_KWARGS = {
+            "loop": settings.serve_loop,
+            "http": settings.serve_http,
+            "lifespan": "on",
+            "timeout_graceful_shutdown": settings.serve_graceful_timeout,
+            "access_log": settings.serve_access_log,
+        }
+
+    return Worker
+
+
+def gunicorn_options(host: str, port: int, workers: int) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": _uvicorn_worker_class(),
+        "preload_app": settings.serve_preload,
+        "timeout": settings.serve_timeout,
+        "graceful_timeout": settings.serve_graceful_timeout,
+        "keepalive": settings.serve_keepalive,
+        "max_requests": settings.serve_max_requests,
+        "max_requests_jitter": settings.serve_max_requests_jitter if settings.serve_max_requests else 0,
+        "backlog": settings.serve_backlog,
+        "loglevel": settings.serve_log_level,
+        "accesslog": "-" if settings.serve_access_log else None,
+        "post_fork": lambda server, worker: reset_engines_after_fork(),
+    }
+    # Latido de los workers en memoria: /tmp puede ser un overlay lento en contenedores
+    if os.path.isdir("/dev/shm"):
+        options["worker_tmp_dir"] = "/dev/shm"
+    return options
+
+
+def run_gunicorn(host: str, port: int, workers: int) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    options = gunicorn_options(host, port, workers)
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+
+            return app
+
+    Application().run()
+
+
+def run_uvicorn(host: str, port: int, workers: int) -> None:
+    import uvicorn
+
+    uvicorn.run(
+        # Con varios workers uvicorn necesita la ruta de importación (cada proceso la importa)
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop=settings.serve_loop,
+        http=settings.serve_http,
+        timeout_keep_alive=settings.serve_keepalive,
+        timeout_graceful_shutdown=settings.serve_graceful_timeout,
+        limit_max_requests=settings.serve_max_requests or None,
+        backlog=settings.serve_backlog,
+        access_log=settings.serve_access_log,
+        log_level=settings.serve_log_level,
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Production server with several worker processes (SERVE_* settings; these flags override them)")
+    parser.add_argument("--host", default=settings.serve_host)
+    parser.add_argument("--port", type=int, default=settings.serve_port)
+    parser.add_argument("--workers", type=int, default=settings.serve_workers, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--server", choices=SERVERS, default=settings.serve_server, help="Process manager")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    workers = resolve_workers(args.workers, single_writer())
+    features = per_process_features()
+    if workers > 1 and features:
+        print(f"{workers} workers con estado por proceso:\n" + "\n".join(f"  - {f}" for f in features), file=sys.stderr)
+    elif not args.workers and workers == 1 and default_workers() > 1:
+        print("1 worker (SERVE_WORKERS=0): la cola de escritura de SQLite solo ordena las escrituras de su worker", file=sys.stderr)
+    server = args.server
+    if server == "auto":
+        server = "gunicorn" if has_gunicorn() and sys.platform != "win32" else "uvicorn"
+    elif server == "gunicorn" and not has_gunicorn():
+        print("SERVE_SERVER=gunicorn pero gunicorn no está instalado (pip install gunicorn)", file=sys.stderr)
+        return 2
+    prepare_master()
+    print(f"Sirviendo en {args.host}:{args.port} con {workers} workers ({server})", file=sys.stderr)
+    if server == "gunicorn":
+        run_gunicorn(args.host, args.port, workers)
+    else:
+        run_uvicorn(args.host, args.port, workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
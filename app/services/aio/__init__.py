@@ -0,0 +1 @@
+# Versiones asíncronas (AsyncSession) de la capa de servicios usadas por la API
\ No newline at end of file
@@ -0,0 +1,145 @@
+from typing import AsyncIterator, Sequence
+from sqlalchemy import select, or_, func, delete
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.core.cache import response_cache
+from app.core.database import db_writer
+from app.services import search_index, versions
+
+
+# Etiquetas de las respuestas cacheadas (app.core.cache); todas las filas del
+# listado muestran item_count, así que cualquier escritura de ítems lo cambia
+LIST_CACHE_TAGS = ("categories", "items")
+
+
+def detail_cache_tags(category_id: int) -> tuple[str, ...]:
+    return (f"category:{category_id}",)
+
+
+async def _invalidate_cache(category_id: int) -> None:
+    # Los ítems embeben sus categorías: "categories" también invalida sus lecturas
+    await response_cache.invalidate("categories", f"category:{category_id}")
+
+
+def _filter_categories(stmt, q: str | None):
+    """Apply the list filters to ``stmt``; returns it with the search match subquery (or None)."""
+    if not q:
+        return stmt, None
+    matched = search_index.match("categories", q)
+    if matched is None:
+        like = f"%{q}%"
+        return stmt.where(or_(Category.name.like(like), Category.description.like(like))), None
+    return stmt.join(matched, matched.c.id == Category.id), matched
+
+
+async def list_categories(db: AsyncSession, skip: int = 0, limit: int = 100, q: str | None = None, after_id: int | None = None) -> list[Category]:
+    # Sin relaciones por defecto: los ítems se piden aparte y acotados (get_item_previews)
+    stmt = select(Category)
+    stmt, matched = _filter_categories(stmt, q)
+    order_by = [Category.id.asc()]
+    # Orden por relevancia, salvo en modo cursor (keyset por id)
+    if matched is not None and after_id is None:
+        order_by.insert(0, matched.c.rank)
+    if after_id is not None:
+        # Keyset: continúa tras el último id visto (usa el índice de la PK en lugar de OFFSET)
+        stmt = stmt.where(Category.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    result = await db.scalars(stmt.order_by(*order_by).limit(limit))
+    return list(result.all())
+
+
+EXPORT_COLUMNS = (Category.id, Category.name, Category.description)
+
+
+async def export_categories(db: AsyncSession, q: str | None = None, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+    """Yield batches of plain rows with the ``list_categories`` filters, ordered by id (server-side cursor)."""
+    stmt, _ = _filter_categories(select(*EXPORT_COLUMNS), q)
+    result = await db.stream(stmt.order_by(Category.id).execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def get_item_previews(db: AsyncSession, category_ids: list[int], items_limit: int) -> dict[int, list[Row]]:
+    """First ``items_limit`` items (by id) per category, computed in SQL (totals: ``Category.item_count``)."""
+    previews: dict[int, list[Row]] = {cid: [] for cid in category_ids}
+    if not category_ids or items_limit <= 0:
+        return previews
+    link = item_category.c
+    # Orden por link.item_id (igual a Item.id por el join): lo entrega el índice (category_id, item_id)
+    rn = func.row_number().over(partition_by=link.category_id, order_by=link.item_id).label("rn")
+    ranked = (
+        select(link.category_id, Item.id, Item.title, Item.description, Item.owner_id, rn)
+        .join(Item, Item.id == link.item_id)
+        .where(link.category_id.in_(category_ids))
+        .subquery()
+    )
+    rows = await db.execute(select(ranked).where(ranked.c.rn <= items_limit).order_by(ranked.c.category_id, ranked.c.id))
+    for row in rows.all():
+        previews[row.category_id].append(row)
+    return previews
+
+
+async def get_category(db: AsyncSession, category_id: int) -> Category | None:
+    return await db.scalar(select(Category).options(selectinload(Category.items)).where(Category.id == category_id))
+
+
+async def get_category_etag(db: AsyncSession, category_id: int) -> str | None:
+    """Weak ETag of the category detail (the row plus the items it embeds); None if it does not exist."""
+    row = (await db.execute(select(Category.version, versions.current("items")).where(Category.id == category_id))).first()
+    return versions.row_etag("category", category_id, *row) if row else None
+
+
+async def get_category_by_name(db: AsyncSession, name: str) -> Category | None:
+    return await db.scalar(select(Category).where(Category.name == name))
+
+
+@db_writer.serialized
+async def create_category(db: AsyncSession, payload: CategoryCreate) -> Category:
+    cat = Category(name=payload.name, description=payload.description, items=[])
+    db.add(cat)
+    # Nombre único: lo garantiza la restricción UNIQUE (sin SELECT previo, y también ante escrituras concurrentes)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("La categoría ya existe")
+    await _invalidate_cache(cat.id)
+    return cat
+
+
+@db_writer.serialized
+async def update_category(db: AsyncSession, category_id: int, payload: CategoryUpdate) -> Category | None:
+    # La respuesta no incluye los ítems: no se cargan
+    cat = await db.get(Category, category_id)
+    if not cat:
+        return None
+    if payload.name is not None:
+        cat.name = payload.name
+    if payload.description is not None:
+        cat.description = payload.description
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Otra categoría ya usa ese nombre")
+    await _invalidate_cache(category_id)
+    return cat
+
+
+@db_writer.serialized
+async def delete_category(db: AsyncSession, category_id: int) -> bool:
+    cat = await db.get(Category, category_id)
+    if not cat:
+        return False
+    # Enlaces borrados en SQL en lugar de cargar todos los ítems de la categoría para que el ORM los quite
+    await db.execute(delete(item_category).where(item_category.c.category_id == category_id))
+    await db.delete(cat)
+    await db.commit()
+    await _invalidate_cache(category_id)
+    return True
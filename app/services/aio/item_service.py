@@ -0,0 +1,306 @@
+from collections import Counter
+from typing import AsyncIterator, Iterable, Sequence
+from sqlalchemy import select, or_, insert, update, delete, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.item import Item
+from app.models.user import User
+from app.models.category import Category, item_category
+from app.schemas.item import ItemCreate, ItemUpdate, ItemBulkUpdateEntry
+from app.core.cache import response_cache
+from app.core.database import db_writer
+from app.services import bulk, item_counts, search_index, versions
+
+# Etiquetas de las respuestas cacheadas (app.core.cache): los listados embeben owner y categorías
+LIST_CACHE_TAGS = ("items", "categories", "users")
+
+
+def detail_cache_tags(item_id: int) -> tuple[str, ...]:
+    return (f"item:{item_id}", "categories", "users")
+
+
+async def _invalidate_cache(item_ids: Iterable[int] = (), category_ids: Iterable[int] = ()) -> None:
+    """Drop cached item reads plus the category details that embed these items."""
+    await response_cache.invalidate("items", *(f"item:{i}" for i in item_ids), *(f"category:{c}" for c in set(category_ids)))
+
+
+async def get_item_etag(db: AsyncSession, item_id: int) -> str | None:
+    """Weak ETag of the item detail from row/collection versions only (None if it does not exist)."""
+    stmt = select(Item.version, User.version, versions.current("categories")).join(User, User.id == Item.owner_id).where(Item.id == item_id)
+    row = (await db.execute(stmt)).first()
+    return versions.row_etag("item", item_id, *row) if row else None
+
+
+async def _linked_category_ids(db: AsyncSession, item_ids: Iterable[int]) -> set[int]:
+    link = item_category.c
+    return set((await db.scalars(select(link.category_id).where(link.item_id.in_(set(item_ids))).distinct())).all())
+
+
+def _filter_items(stmt, owner_id: int | None, q: str | None, category_id: int | None):
+    """Apply the list filters to ``stmt``; returns it with the search match subquery (or None)."""
+    matched = None
+    if owner_id is not None:
+        stmt = stmt.where(Item.owner_id == owner_id)
+    if q:
+        matched = search_index.match("items", q)
+        if matched is None:
+            like = f"%{q}%"
+            stmt = stmt.where(or_(Item.title.like(like), Item.description.like(like)))
+        else:
+            stmt = stmt.join(matched, matched.c.id == Item.id)
+    if category_id is not None:
+        # Solo la tabla de enlaces: el índice (category_id, item_id) entrega los ítems ya ordenados por id
+        link = item_category.c
+        stmt = stmt.join(item_category, link.item_id == Item.id).where(link.category_id == category_id)
+    return stmt, matched
+
+
+def _id_column(category_id: int | None):
+    """Column to sort and page by: with a category filter the link's ``item_id`` (equal to ``Item.id``), which
+    the (category_id, item_id) index already returns in order; SQLite would otherwise sort ``Item.id`` apart."""
+    return item_category.c.item_id if category_id is not None else Item.id
+
+
+async def list_items(db: AsyncSession, skip: int = 0, limit: int = 100, owner_id: int | None = None, q: str | None = None, category_id: int | None = None, after_id: int | None = None) -> list[Item]:
+    stmt, matched = _filter_items(select(Item).options(selectinload(Item.owner), selectinload(Item.categories)), owner_id, q, category_id)
+    id_column = _id_column(category_id)
+    order_by = [id_column.asc()]
+    # Orden por relevancia, salvo en modo cursor (keyset por id)
+    if matched is not None and after_id is None:
+        order_by.insert(0, matched.c.rank)
+    if after_id is not None:
+        # Keyset: continúa tras el último id visto (usa el índice de la PK en lugar de OFFSET)
+        stmt = stmt.where(id_column > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    result = await db.scalars(stmt.order_by(*order_by).limit(limit))
+    return list(result.all())
+
+
+EXPORT_COLUMNS = (Item.id, Item.title, Item.description, Item.owner_id)
+
+
+async def export_items(db: AsyncSession, owner_id: int | None = None, q: str | None = None, category_id: int | None = None, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+    """Yield batches of plain rows (no ORM objects) with the ``list_items`` filters, ordered by id.
+    Uses a server-side cursor so memory stays bounded by ``batch_size``.
+    """
+    stmt, _ = _filter_items(select(*EXPORT_COLUMNS), owner_id, q, category_id)
+    result = await db.stream(stmt.order_by(_id_column(category_id)).execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def get_item(db: AsyncSession, item_id: int) -> Item | None:
+    stmt = select(Item).options(selectinload(Item.owner), selectinload(Item.categories)).where(Item.id == item_id)
+    return await db.scalar(stmt)
+
+
+async def _get_categories(db: AsyncSession, category_ids: list[int]) -> list[Category]:
+    result = await db.scalars(select(Category).where(Category.id.in_(category_ids)))
+    return list(result.all())
+
+
+@db_writer.serialized
+async def create_item(db: AsyncSession, payload: ItemCreate) -> Item:
+    owner = await db.get(User, payload.owner_id)
+    if not owner:
+        raise ValueError("Owner no existe")
+    # Asignar categorías si vienen en payload (mismo commit que el ítem)
+    cats: list[Category] = []
+    if getattr(payload, "category_ids", None):
+        cats = await _get_categories(db, payload.category_ids)
+    item = Item(title=payload.title, description=payload.description, owner=owner, categories=cats)
+    db.add(item)
+    await db.run_sync(lambda session: item_counts.adjust(session.connection(), {owner.id: 1}, {c.id: 1 for c in cats}))
+    await db.commit()
+    await _invalidate_cache(category_ids=[c.id for c in cats])
+    return item
+
+
+@db_writer.serialized
+async def update_item(db: AsyncSession, item_id: int, payload: ItemUpdate) -> Item | None:
+    item = await get_item(db, item_id)
+    if not item:
+        return None
+    # Categorías antes y después del cambio: ambas embeben el ítem en su detalle
+    category_ids = {c.id for c in item.categories}
+    owner_id = item.owner_id
+    if payload.title is not None:
+        item.title = payload.title
+    if payload.description is not None:
+        item.description = payload.description
+    if payload.owner_id is not None:
+        owner = await db.get(User, payload.owner_id)
+        if not owner:
+            raise ValueError("Owner no existe")
+        item.owner = owner
+    # Reemplazar categorías si se especifica
+    if getattr(payload, "category_ids", None) is not None:
+        cats: list[Category] = []
+        if payload.category_ids:
+            cats = await _get_categories(db, payload.category_ids)
+        item.categories = cats
+    new_category_ids = {c.id for c in item.categories}
+    owner_deltas = {owner_id: -1, item.owner.id: 1} if item.owner.id != owner_id else {}
+    category_deltas = {**{cid: -1 for cid in category_ids - new_category_ids}, **{cid: 1 for cid in new_category_ids - category_ids}}
+    await db.run_sync(lambda session: item_counts.adjust(session.connection(), owner_deltas, category_deltas))
+    await db.commit()
+    await _invalidate_cache([item_id], category_ids | new_category_ids)
+    return item
+
+
+@db_writer.serialized
+async def delete_item(db: AsyncSession, item_id: int) -> bool:
+    # Solo las categorías (enlaces a borrar y contadores); el owner no hace falta
+    item = await db.scalar(select(Item).options(selectinload(Item.categories)).where(Item.id == item_id))
+    if not item:
+        return False
+    category_ids = [c.id for c in item.categories]
+    await db.delete(item)
+    await db.run_sync(lambda session: item_counts.adjust(session.connection(), {item.owner_id: -1}, {cid: -1 for cid in category_ids}))
+    await db.commit()
+    await _invalidate_cache([item_id], category_ids)
+    return True
+
+
+async def _existing_ids(db: AsyncSession, column, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    return set((await db.scalars(select(column).where(column.in_(ids)))).all())
+
+
+def _missing_categories(category_ids: list[int] | None, existing: set[int]) -> list[int]:
+    return [cid for cid in (category_ids or []) if cid not in existing]
+
+
+@db_writer.serialized
+async def bulk_create_items(db: AsyncSession, payloads: list[ItemCreate]) -> tuple[list[int], list[dict]]:
+    """Insert many items in one transaction: one IN query per referenced table,
+    one batched INSERT for items and one for item_category.
+    Invalid rows are skipped and reported as ``{"index", "detail"}`` errors.
+    """
+    owners = await _existing_ids(db, User.id, {p.owner_id for p in payloads})
+    categories = await _existing_ids(db, Category.id, {cid for p in payloads for cid in (p.category_ids or [])})
+    errors: list[dict] = []
+    valid: list[ItemCreate] = []
+    for index, p in enumerate(payloads):
+        missing = _missing_categories(p.category_ids, categories)
+        if p.owner_id not in owners:
+            errors.append({"index": index, "detail": "Owner no existe"})
+        elif missing:
+            errors.append({"index": index, "detail": f"Categorías no existen: {missing}"})
+        else:
+            valid.append(p)
+    if not valid:
+        return [], errors
+
+    rows = [{"title": p.title, "description": p.description, "owner_id": p.owner_id} for p in valid]
+    ids = await db.run_sync(lambda session: bulk.insert_returning_ids(session.connection(), Item, rows))
+    links = [{"item_id": item_id, "category_id": cid} for item_id, p in zip(ids, valid) for cid in dict.fromkeys(p.category_ids or [])]
+    if links:
+        await db.execute(insert(item_category), links)
+    # Los INSERT masivos no pasan por el flush del ORM: el índice de búsqueda se actualiza aquí
+    indexed = [{"id": item_id, **row} for item_id, row in zip(ids, rows)]
+    await db.run_sync(lambda session: search_index.upsert(session.connection(), "items", indexed))
+    await db.run_sync(lambda session: versions.bump(session.connection(), "items"))
+    owner_counts, category_counts = Counter(p.owner_id for p in valid), Counter(link["category_id"] for link in links)
+    await db.run_sync(lambda session: item_counts.adjust(session.connection(), owner_counts, category_counts))
+    await db.commit()
+    await _invalidate_cache(category_ids=category_counts)
+    return ids, errors
+
+
+@db_writer.serialized
+async def bulk_update_items(db: AsyncSession, entries: list[ItemBulkUpdateEntry]) -> tuple[list[int], list[dict]]:
+    """Partial update of many items by id in one transaction (same rules as ``update_item``)."""
+    current = {
+        row.id: row
+        for row in (await db.execute(select(Item.id, Item.title, Item.description, Item.owner_id).where(Item.id.in_({e.id for e in entries})))).all()
+    }
+    owners = await _existing_ids(db, User.id, {e.owner_id for e in entries if e.owner_id is not None})
+    categories = await _existing_ids(db, Category.id, {cid for e in entries for cid in (e.category_ids or [])})
+    old_category_ids = await _linked_category_ids(db, current)
+    errors: list[dict] = []
+    # Por id: un id repetido aplica sus entradas en orden (la última gana en cada campo)
+    changes: dict[int, dict] = {}
+    category_updates: dict[int, list[int]] = {}
+    for index, e in enumerate(entries):
+        missing = _missing_categories(e.category_ids, categories)
+        if e.id not in current:
+            errors.append({"index": index, "id": e.id, "detail": "Ítem no encontrado"})
+            continue
+        if e.owner_id is not None and e.owner_id not in owners:
+            errors.append({"index": index, "id": e.id, "detail": "Owner no existe"})
+            continue
+        if missing:
+            errors.append({"index": index, "id": e.id, "detail": f"Categorías no existen: {missing}"})
+            continue
+        values = e.model_dump(include={"title", "description", "owner_id"}, exclude_none=True)
+        if values:
+            changes.setdefault(e.id, {}).update(values)
+        if e.category_ids is not None:
+            category_updates[e.id] = list(dict.fromkeys(e.category_ids))
+    updates = [{"id": item_id, **values} for item_id, values in changes.items()]
+    new_owners = {item_id: values["owner_id"] for item_id, values in changes.items() if "owner_id" in values}
+    reindex = [
+        {"id": item_id, "title": values.get("title", current[item_id].title), "description": values.get("description", current[item_id].description)}
+        for item_id, values in changes.items()
+        if "title" in values or "description" in values
+    ]
+    if updates:
+        # UPDATE masivo por clave primaria (executemany agrupado por columnas)
+        await db.execute(update(Item), updates)
+    # Contadores: owner final de cada ítem frente al anterior
+    owner_counts: Counter[int] = Counter()
+    for item_id, owner_id in new_owners.items():
+        if owner_id != current[item_id].owner_id:
+            owner_counts.update({current[item_id].owner_id: -1, owner_id: 1})
+    category_counts: Counter[int] = Counter()
+    if category_updates:
+        # Diferencia entre enlaces anteriores y nuevos para los contadores de categorías
+        link = item_category.c
+        old_links = set((await db.execute(select(link.item_id, link.category_id).where(link.item_id.in_(category_updates)))).all())
+        category_counts.subtract(cid for item_id, cid in old_links if cid not in category_updates[item_id])
+        category_counts.update(cid for item_id, cids in category_updates.items() for cid in cids if (item_id, cid) not in old_links)
+        # Cambios solo de categorías: no hay UPDATE de la fila que suba su versión
+        links_only = set(category_updates) - {u["id"] for u in updates}
+        if links_only:
+            await db.execute(update(Item).where(Item.id.in_(links_only)).values(version=Item.version + 1).execution_options(synchronize_session=False))
+        await db.execute(delete(item_category).where(item_category.c.item_id.in_(category_updates)))
+        links = [{"item_id": item_id, "category_id": cid} for item_id, cids in category_updates.items() for cid in cids]
+        if links:
+            await db.execute(insert(item_category), links)
+    if reindex:
+        await db.run_sync(lambda session: search_index.upsert(session.connection(), "items", reindex))
+    if updates or category_updates:
+        await db.run_sync(lambda session: versions.bump(session.connection(), "items"))
+        await db.run_sync(lambda session: item_counts.adjust(session.connection(), owner_counts, category_counts))
+    await db.commit()
+    failed = {err["index"] for err in errors}
+    # Un id repetido se actualiza una sola vez: aparece una vez, en la posición de su primera entrada aplicada
+    updated = list(dict.fromkeys(e.id for index, e in enumerate(entries) if index not in failed))
+    new_category_ids = {cid for cids in category_updates.values() for cid in cids}
+    await _invalidate_cache(updated, old_category_ids | new_category_ids)
+    return updated, errors
+
+
+@db_writer.serialized
+async def bulk_delete_items(db: AsyncSession, item_ids: list[int]) -> tuple[list[int], list[dict]]:
+    """Delete many items (and their category links) in one transaction."""
+    existing = await _existing_ids(db, Item.id, set(item_ids))
+    errors = [{"index": index, "id": item_id, "detail": "Ítem no encontrado"} for index, item_id in enumerate(item_ids) if item_id not in existing]
+    if existing:
+        category_ids = await _linked_category_ids(db, existing)
+        link = item_category.c
+        owner_counts = {owner_id: -n for owner_id, n in (await db.execute(select(Item.owner_id, func.count()).where(Item.id.in_(existing)).group_by(Item.owner_id))).all()}
+        category_counts = {cid: -n for cid, n in (await db.execute(select(link.category_id, func.count()).where(link.item_id.in_(existing)).group_by(link.category_id))).all()}
+        # item_category se borra explícitamente: SQLite no aplica ON DELETE CASCADE sin PRAGMA foreign_keys
+        await db.execute(delete(item_category).where(item_category.c.item_id.in_(existing)))
+        await db.execute(delete(Item).where(Item.id.in_(existing)).execution_options(synchronize_session=False))
+        await db.run_sync(lambda session: search_index.delete(session.connection(), "items", list(existing)))
+        await db.run_sync(lambda session: versions.bump(session.connection(), "items"))
+        await db.run_sync(lambda session: item_counts.adjust(session.connection(), owner_counts, category_counts))
+        await db.commit()
+        await _invalidate_cache(existing, category_ids)
+    return [item_id for item_id in dict.fromkeys(item_ids) if item_id in existing], errors
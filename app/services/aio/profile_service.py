@@ -0,0 +1,107 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.profile import Profile
+from app.models.user import User
+from app.schemas.profile import ProfileCreate, ProfileUpdate
+from app.core.database import db_writer
+from app.services import versions
+
+
+async def list_profiles(db: AsyncSession, skip: int = 0, limit: int = 100, user_id: int | None = None, after_id: int | None = None) -> list[Profile]:
+    stmt = select(Profile).options(selectinload(Profile.user))
+    if user_id is not None:
+        stmt = stmt.where(Profile.user_id == user_id)
+    if after_id is not None:
+        # Keyset: continúa tras el último id visto (usa el índice de la PK en lugar de OFFSET)
+        stmt = stmt.where(Profile.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    result = await db.scalars(stmt.order_by(Profile.id.asc()).limit(limit))
+    return list(result.all())
+
+
+async def get_profile(db: AsyncSession, profile_id: int) -> Profile | None:
+    return await db.scalar(select(Profile).options(selectinload(Profile.user)).where(Profile.id == profile_id))
+
+
+async def get_profile_by_user_id(db: AsyncSession, user_id: int) -> Profile | None:
+    return await db.scalar(select(Profile).options(selectinload(Profile.user)).where(Profile.user_id == user_id))
+
+
+async def get_profile_etag(db: AsyncSession, profile_id: int | None = None, user_id: int | None = None) -> str | None:
+    """Weak ETag of a profile with its user, looked up by id or by ``user_id``; None if it does not exist."""
+    stmt = select(Profile.id, Profile.version, User.version).join(User, User.id == Profile.user_id)
+    stmt = stmt.where(Profile.id == profile_id) if profile_id is not None else stmt.where(Profile.user_id == user_id)
+    row = (await db.execute(stmt)).first()
+    return versions.row_etag("profile", row.id, row[1], row[2]) if row else None
+
+
+async def _get_user_with_profile(db: AsyncSession, user_id: int) -> User | None:
+    # Una sola consulta: el usuario y su perfil actual (sin lazy-load al asignar la relación 1:1)
+    return await db.scalar(select(User).options(joinedload(User.profile)).where(User.id == user_id))
+
+
+async def _commit_one_per_user(db: AsyncSession, message: str) -> None:
+    """Commit; the UNIQUE constraint on ``profiles.user_id`` rejects a second profile (also under concurrency)."""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError(message)
+
+
+@db_writer.serialized
+async def create_profile(db: AsyncSession, payload: ProfileCreate) -> Profile:
+    # Validar que el usuario exista (y cargarlo para la respuesta)
+    user = await _get_user_with_profile(db, payload.user_id)
+    if not user:
+        raise ValueError("Usuario no encontrado")
+    # Un perfil por usuario
+    if user.profile is not None:
+        raise ValueError("El usuario ya tiene un perfil")
+
+    profile = Profile(
+        user=user,
+        bio=payload.bio,
+        phone=payload.phone,
+        avatar_url=payload.avatar_url,
+    )
+    db.add(profile)
+    await _commit_one_per_user(db, "El usuario ya tiene un perfil")
+    return profile
+
+
+@db_writer.serialized
+async def update_profile(db: AsyncSession, profile_id: int, payload: ProfileUpdate) -> Profile | None:
+    profile = await get_profile(db, profile_id)
+    if not profile:
+        return None
+    if payload.user_id is not None and payload.user_id != profile.user_id:
+        # Permitir reasignar perfil a otro usuario solo si ese otro no tiene perfil
+        user = await _get_user_with_profile(db, payload.user_id)
+        if not user:
+            raise ValueError("Usuario no encontrado")
+        if user.profile is not None:
+            raise ValueError("El usuario de destino ya tiene un perfil")
+        # Reasignar por relación para que `profile.user` refleje el nuevo usuario sin lazy-load
+        profile.user = user
+    if payload.bio is not None:
+        profile.bio = payload.bio
+    if payload.phone is not None:
+        profile.phone = payload.phone
+    if payload.avatar_url is not None:
+        profile.avatar_url = payload.avatar_url
+    await _commit_one_per_user(db, "El usuario de destino ya tiene un perfil")
+    return profile
+
+
+@db_writer.serialized
+async def delete_profile(db: AsyncSession, profile_id: int) -> bool:
+    profile = await get_profile(db, profile_id)
+    if not profile:
+        return False
+    await db.delete(profile)
+    await db.commit()
+    return True
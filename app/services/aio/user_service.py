@@ -0,0 +1,152 @@
+from typing import AsyncIterator, Sequence
+from sqlalchemy import select, or_, func
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.user import User
+from app.models.profile import Profile
+from app.models.item import Item
+from app.models.category import item_category
+from app.schemas.user import UserCreate, UserUpdate
+from app.core.passwords import password_hasher
+from app.core.cache import response_cache
+from app.core.database import db_writer
+from app.services import item_counts, search_index, versions
+
+
+def _filter_users(stmt, search: str | None):
+    """Apply the list filters to ``stmt``; returns it with the search match subquery (or None)."""
+    if not search:
+        return stmt, None
+    matched = search_index.match("users", search)
+    if matched is None:
+        like = f"%{search}%"
+        return stmt.where(or_(User.name.like(like), User.email.like(like))), None
+    return stmt.join(matched, matched.c.id == User.id), matched
+
+
+async def list_users(db: AsyncSession, skip: int = 0, limit: int = 100, search: str | None = None, after_id: int | None = None, with_profile: bool = False) -> list[User]:
+    # Sin relaciones por defecto: los ítems se piden aparte y acotados (get_item_previews)
+    stmt = select(User)
+    if with_profile:
+        stmt = stmt.options(selectinload(User.profile))
+    stmt, matched = _filter_users(stmt, search)
+    order_by = [User.id.asc()]
+    # Orden por relevancia, salvo en modo cursor (keyset por id)
+    if matched is not None and after_id is None:
+        order_by.insert(0, matched.c.rank)
+    if after_id is not None:
+        # Keyset: continúa tras el último id visto (usa el índice de la PK en lugar de OFFSET)
+        stmt = stmt.where(User.id > after_id)
+    else:
+        stmt = stmt.offset(skip)
+    result = await db.scalars(stmt.order_by(*order_by).limit(limit))
+    return list(result.all())
+
+
+EXPORT_COLUMNS = (User.id, User.name, User.email, User.role)
+
+
+async def export_users(db: AsyncSession, search: str | None = None, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+    """Yield batches of plain rows with the ``list_users`` filters, ordered by id (server-side cursor)."""
+    stmt, _ = _filter_users(select(*EXPORT_COLUMNS), search)
+    result = await db.stream(stmt.order_by(User.id).execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def get_item_previews(db: AsyncSession, user_ids: list[int], items_limit: int) -> dict[int, list[Row]]:
+    """First ``items_limit`` items (by id) per user, computed in SQL (totals: ``User.item_count``)."""
+    previews: dict[int, list[Row]] = {uid: [] for uid in user_ids}
+    if not user_ids or items_limit <= 0:
+        return previews
+    rn = func.row_number().over(partition_by=Item.owner_id, order_by=Item.id).label("rn")
+    ranked = select(Item.id, Item.title, Item.description, Item.owner_id, rn).where(Item.owner_id.in_(user_ids)).subquery()
+    rows = await db.execute(select(ranked).where(ranked.c.rn <= items_limit).order_by(ranked.c.owner_id, ranked.c.id))
+    for row in rows.all():
+        previews[row.owner_id].append(row)
+    return previews
+
+
+async def get_user(db: AsyncSession, user_id: int) -> User | None:
+    stmt = select(User).options(selectinload(User.items), selectinload(User.profile)).where(User.id == user_id)
+    return await db.scalar(stmt)
+
+
+def list_collections(expand: frozenset[str]) -> tuple[str, ...]:
+    """Collections whose versions determine a users list response (see ``versions.collection_etag``)."""
+    # Todas las filas muestran item_count: los ítems cuentan aunque no se expandan
+    return ("users", "items") + (("profiles",) if "profile" in expand else ())
+
+
+async def get_user_etag(db: AsyncSession, user_id: int) -> str | None:
+    """Weak ETag of the full user (row, profile and embedded items); None if it does not exist."""
+    stmt = select(User.version, Profile.version, versions.current("items")).outerjoin(Profile, Profile.user_id == User.id).where(User.id == user_id)
+    row = (await db.execute(stmt)).first()
+    return versions.row_etag("user", user_id, *row) if row else None
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    return await db.scalar(select(User).where(User.email == email))
+
+
+async def get_user_by_name(db: AsyncSession, name: str) -> User | None:
+    return await db.scalar(select(User).where(User.name == name).limit(1))
+
+
+async def _commit_unique_email(db: AsyncSession) -> None:
+    """Commit; the UNIQUE index on ``users.email`` rejects duplicates (no SELECT beforehand)."""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Email ya registrado")
+
+
+async def create_user(db: AsyncSession, payload: UserCreate) -> User:
+    # Hash password using bcrypt (pool dedicado; 503 si está saturado)
+    hashed = await password_hasher.hash(payload.password)
+    # Relaciones inicializadas: evita lazy-loads (no permitidos en AsyncSession) al serializar
+    user = User(name=payload.name, email=payload.email, hashed_password=hashed, role=payload.role, items=[], profile=None)
+    # Turno de escritura tras el hash: bcrypt no debe retener la cola de escrituras
+    async with db_writer.slot(db):
+        db.add(user)
+        await _commit_unique_email(db)
+    return user
+
+
+async def update_user(db: AsyncSession, user_id: int, payload: UserUpdate) -> User | None:
+    user = await get_user(db, user_id)
+    if not user:
+        return None
+    if payload.name is not None:
+        user.name = payload.name
+    if payload.email is not None:
+        user.email = payload.email
+    if payload.password is not None:
+        user.hashed_password = await password_hasher.hash(payload.password)
+    if payload.role is not None:
+        user.role = payload.role
+    async with db_writer.slot(db):
+        await _commit_unique_email(db)
+    if payload.name is not None or payload.email is not None:
+        # Los ítems cacheados embeben a su owner
+        await response_cache.invalidate("users")
+    return user
+
+
+@db_writer.serialized
+async def delete_user(db: AsyncSession, user_id: int) -> bool:
+    user = await get_user(db, user_id)
+    if not user:
+        return False
+    # Sus ítems se borran en cascada: también cambian los detalles y contadores de sus categorías
+    link = item_category.c
+    stmt = select(link.category_id, func.count()).join(Item, Item.id == link.item_id).where(Item.owner_id == user_id).group_by(link.category_id)
+    category_counts = {cid: -n for cid, n in (await db.execute(stmt)).all()}
+    await db.delete(user)
+    await db.run_sync(lambda session: item_counts.adjust(session.connection(), categories=category_counts))
+    await db.commit()
+    await response_cache.invalidate("users", "items", *(f"category:{c}" for c in category_counts))
+    return True
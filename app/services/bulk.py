@@ -0,0 +1,19 @@
+"""Helpers compartidos para escrituras masivas (endpoints bulk y scripts de importación)."""
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection
+
+
+def insert_returning_ids(conn: Connection, model, rows: list[dict]) -> list[int]:
+    """Insert ``rows`` into ``model``'s table with one executemany and return the new ids in order."""
+    if not rows:
+        return []
+    if conn.dialect.name != "sqlite":
+        # PostgreSQL: INSERT ... VALUES (...), (...) RETURNING por lotes, ordenado por parámetro
+        result = conn.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+        return list(result.scalars().all())
+    # SQLite no garantiza el orden de RETURNING y SQLAlchemy cae a un INSERT por fila.
+    # Con executemany la transacción retiene el único bloqueo de escritura y los rowid
+    # nuevos son consecutivos (max(rowid) + 1), así que se deducen del último insertado.
+    conn.execute(insert(model), rows)
+    last_id = conn.execute(text("SELECT last_insert_rowid()")).scalar_one()
+    return list(range(last_id - len(rows) + 1, last_id + 1))
@@ -1,15 +1,23 @@
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import or_
-from app.models.category import Category
+from sqlalchemy import or_, delete
+from sqlalchemy.exc import IntegrityError
+from app.models.category import Category, item_category
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services import search_index, versions  # noqa: F401 (versions registra los hooks de versiones de filas y colecciones)
 
 
 def list_categories(db: Session, skip: int = 0, limit: int = 100, q: str | None = None) -> list[Category]:
     qy = db.query(Category).options(selectinload(Category.items))
+    order_by = [Category.id.asc()]
     if q:
-        like = f"%{q}%"
-        qy = qy.filter(or_(Category.name.like(like), Category.description.like(like)))
-    return qy.order_by(Category.id.asc()).offset(skip).limit(limit).all()
+        matched = search_index.match("categories", q)
+        if matched is None:
+            like = f"%{q}%"
+            qy = qy.filter(or_(Category.name.like(like), Category.description.like(like)))
+        else:
+            qy = qy.join(matched, matched.c.id == Category.id)
+            order_by.insert(0, matched.c.rank)
+    return qy.order_by(*order_by).offset(skip).limit(limit).all()
 
 
 def get_category(db: Session, category_id: int) -> Category | None:
@@ -21,37 +29,39 @@ def get_category_by_name(db: Session, name: str) -> Category | None:
 
 
 def create_category(db: Session, payload: CategoryCreate) -> Category:
-    if get_category_by_name(db, payload.name):
-        raise ValueError("La categoría ya existe")
     cat = Category(name=payload.name, description=payload.description)
     db.add(cat)
-    db.commit()
-    db.refresh(cat)
+    # Nombre único: lo garantiza la restricción UNIQUE, sin SELECT previo
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("La categoría ya existe")
     return cat
 
 
 def update_category(db: Session, category_id: int, payload: CategoryUpdate) -> Category | None:
-    cat = get_category(db, category_id)
+    cat = db.get(Category, category_id)
     if not cat:
         return None
     if payload.name is not None:
-        # Evitar duplicados de nombre
-        exists = db.query(Category).filter(Category.name == payload.name, Category.id != category_id).first()
-        if exists:
-            raise ValueError("Otra categoría ya usa ese nombre")
         cat.name = payload.name
     if payload.description is not None:
         cat.description = payload.description
-    db.add(cat)
-    db.commit()
-    db.refresh(cat)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Otra categoría ya usa ese nombre")
     return cat
 
 
 def delete_category(db: Session, category_id: int) -> bool:
-    cat = get_category(db, category_id)
+    cat = db.get(Category, category_id)
     if not cat:
         return False
+    # Enlaces borrados en SQL en lugar de cargar todos los ítems de la categoría
+    db.execute(delete(item_category).where(item_category.c.category_id == category_id))
     db.delete(cat)
     db.commit()
     return True
\ No newline at end of file
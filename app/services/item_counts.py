@@ -0,0 +1,65 @@
+"""Contadores desnormalizados ``item_count`` de ``users`` y ``categories``.
+
+Los servicios de ítems los ajustan con incrementos en SQL (``adjust``) en la
+misma transacción que cada alta, cambio de owner/categorías o baja, así los
+listados muestran el total sin cargar ni contar la relación. ``reconcile``
+los compara con los recuentos reales y opcionalmente los corrige
+(``scripts/reconcile_item_counts.py``).
+"""
+from collections import defaultdict
+from typing import Mapping
+from sqlalchemy import Table, func, select, update
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.sql.selectable import ScalarSelect
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.models.user import User
+from app.services import versions
+
+COUNTED = {"users": User.__table__, "categories": Category.__table__}
+
+
+def _adjust_table(conn: Connection, table: Table, deltas: Mapping[int, int]) -> None:
+    # Una sentencia por valor de incremento: las cargas masivas suelen repetir pocos valores
+    ids_by_delta: dict[int, list[int]] = defaultdict(list)
+    for row_id, delta in deltas.items():
+        if delta:
+            ids_by_delta[delta].append(row_id)
+    for delta, ids in ids_by_delta.items():
+        conn.execute(update(table).where(table.c.id.in_(ids)).values(item_count=table.c.item_count + delta))
+
+
+def adjust(conn: Connection, users: Mapping[int, int] | None = None, categories: Mapping[int, int] | None = None) -> None:
+    """Add ``{id: delta}`` to ``users.item_count`` / ``categories.item_count`` (atomic SQL increments)."""
+    if users:
+        _adjust_table(conn, COUNTED["users"], users)
+    if categories:
+        _adjust_table(conn, COUNTED["categories"], categories)
+
+
+def actual_count(table: str) -> ScalarSelect:
+    """Correlated subquery with the real number of items of each row of ``table``."""
+    if table == "users":
+        return select(func.count(Item.id)).where(Item.owner_id == User.__table__.c.id).scalar_subquery()
+    link = item_category.c
+    return (
+        select(func.count(link.item_id))
+        .join(Item, Item.id == link.item_id)
+        .where(link.category_id == Category.__table__.c.id)
+        .scalar_subquery()
+    )
+
+
+def reconcile(conn: Connection, fix: bool = False) -> dict[str, list[Row]]:
+    """Return the rows whose stored count differs from the real one as ``(id, item_count, actual)``.
+    With ``fix`` the counters are rewritten from the real counts in the same transaction.
+    """
+    drift: dict[str, list[Row]] = {}
+    for name, table in COUNTED.items():
+        actual = actual_count(name)
+        mismatch = table.c.item_count != actual
+        drift[name] = list(conn.execute(select(table.c.id, table.c.item_count, actual.label("actual")).where(mismatch).order_by(table.c.id)).all())
+        if fix and drift[name]:
+            conn.execute(update(table).where(mismatch).values(item_count=actual))
+            versions.bump(conn, name)
+    return drift
@@ -1,21 +1,29 @@
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import and_, or_
+from sqlalchemy import or_
 from app.models.item import Item
 from app.models.user import User
-from app.models.category import Category
+from app.models.category import Category, item_category
 from app.schemas.item import ItemCreate, ItemUpdate
+from app.services import item_counts, search_index, versions  # noqa: F401 (versions registra los hooks de versiones de filas y colecciones)
 
 
 def list_items(db: Session, skip: int = 0, limit: int = 100, owner_id: int | None = None, q: str | None = None, category_id: int | None = None) -> list[Item]:
     query = db.query(Item).options(selectinload(Item.owner), selectinload(Item.categories))
     if owner_id is not None:
         query = query.filter(Item.owner_id == owner_id)
+    # Con filtro de categoría se ordena por item_category.item_id (= Item.id): lo entrega el índice (category_id, item_id)
+    order_by = [item_category.c.item_id.asc() if category_id is not None else Item.id.asc()]
     if q:
-        like = f"%{q}%"
-        query = query.filter(or_(Item.title.like(like), Item.description.like(like)))
+        matched = search_index.match("items", q)
+        if matched is None:
+            like = f"%{q}%"
+            query = query.filter(or_(Item.title.like(like), Item.description.like(like)))
+        else:
+            query = query.join(matched, matched.c.id == Item.id)
+            order_by.insert(0, matched.c.rank)
     if category_id is not None:
-        query = query.join(Item.categories).filter(Category.id == category_id)
-    return query.order_by(Item.id.asc()).offset(skip).limit(limit).all()
+        query = query.join(item_category, item_category.c.item_id == Item.id).filter(item_category.c.category_id == category_id)
+    return query.order_by(*order_by).offset(skip).limit(limit).all()
 
 
 def get_item(db: Session, item_id: int) -> Item | None:
@@ -26,17 +34,14 @@ def create_item(db: Session, payload: ItemCreate) -> Item:
     owner = db.get(User, payload.owner_id)
     if not owner:
         raise ValueError("Owner no existe")
-    item = Item(title=payload.title, description=payload.description, owner=owner)
-    db.add(item)
-    db.commit()
-    db.refresh(item)
-    # Asignar categorías si vienen en payload
+    # Asignar categorías si vienen en payload (mismo commit que el ítem)
+    cats: list[Category] = []
     if getattr(payload, "category_ids", None):
         cats = db.query(Category).filter(Category.id.in_(payload.category_ids)).all()
-        item.categories = cats
-        db.add(item)
-        db.commit()
-        db.refresh(item)
+    item = Item(title=payload.title, description=payload.description, owner=owner, categories=cats)
+    db.add(item)
+    item_counts.adjust(db.connection(), {owner.id: 1}, {c.id: 1 for c in cats})
+    db.commit()
     return item
 
 
@@ -44,6 +49,8 @@ def update_item(db: Session, item_id: int, payload: ItemUpdate) -> Item | None:
     item = get_item(db, item_id)
     if not item:
         return None
+    owner_id = item.owner_id
+    category_ids = {c.id for c in item.categories}
     if payload.title is not None:
         item.title = payload.title
     if payload.description is not None:
@@ -59,16 +66,19 @@ def update_item(db: Session, item_id: int, payload: ItemUpdate) -> Item | None:
         if payload.category_ids:
             cats = db.query(Category).filter(Category.id.in_(payload.category_ids)).all()
         item.categories = cats
-    db.add(item)
+    new_category_ids = {c.id for c in item.categories}
+    owner_deltas = {owner_id: -1, item.owner.id: 1} if item.owner.id != owner_id else {}
+    category_deltas = {**{cid: -1 for cid in category_ids - new_category_ids}, **{cid: 1 for cid in new_category_ids - category_ids}}
+    item_counts.adjust(db.connection(), owner_deltas, category_deltas)
     db.commit()
-    db.refresh(item)
     return item
 
 
 def delete_item(db: Session, item_id: int) -> bool:
-    item = get_item(db, item_id)
+    item = db.query(Item).options(selectinload(Item.categories)).filter(Item.id == item_id).first()
     if not item:
         return False
+    item_counts.adjust(db.connection(), {item.owner_id: -1}, {c.id: -1 for c in item.categories})
     db.delete(item)
     db.commit()
     return True
\ No newline at end of file
@@ -1,7 +1,9 @@
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.profile import Profile
 from app.models.user import User
 from app.schemas.profile import ProfileCreate, ProfileUpdate
+from app.services import versions  # noqa: F401 (versions registra los hooks de versiones de filas y colecciones)
 
 
 def list_profiles(db: Session, skip: int = 0, limit: int = 100, user_id: int | None = None) -> list[Profile]:
@@ -19,25 +21,37 @@ def get_profile_by_user_id(db: Session, user_id: int) -> Profile | None:
     return db.query(Profile).options(selectinload(Profile.user)).filter(Profile.user_id == user_id).first()
 
 
+def _get_user_with_profile(db: Session, user_id: int) -> User | None:
+    # Una sola consulta: el usuario y su perfil actual
+    return db.query(User).options(joinedload(User.profile)).filter(User.id == user_id).first()
+
+
+def _commit_one_per_user(db: Session, message: str) -> None:
+    """Commit; the UNIQUE constraint on ``profiles.user_id`` rejects a second profile."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(message)
+
+
 def create_profile(db: Session, payload: ProfileCreate) -> Profile:
     # Validar que el usuario exista
-    user = db.query(User).filter(User.id == payload.user_id).first()
+    user = _get_user_with_profile(db, payload.user_id)
     if not user:
         raise ValueError("Usuario no encontrado")
     # Un perfil por usuario
-    existing = get_profile_by_user_id(db, payload.user_id)
-    if existing:
+    if user.profile is not None:
         raise ValueError("El usuario ya tiene un perfil")
 
     profile = Profile(
-        user_id=payload.user_id,
+        user=user,
         bio=payload.bio,
         phone=payload.phone,
         avatar_url=payload.avatar_url,
     )
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    _commit_one_per_user(db, "El usuario ya tiene un perfil")
     return profile
 
 
@@ -47,20 +61,19 @@ def update_profile(db: Session, profile_id: int, payload: ProfileUpdate) -> Prof
         return None
     if payload.user_id is not None and payload.user_id != profile.user_id:
         # Permitir reasignar perfil a otro usuario solo si ese otro no tiene perfil
-        if not db.query(User).filter(User.id == payload.user_id).first():
+        user = _get_user_with_profile(db, payload.user_id)
+        if not user:
             raise ValueError("Usuario no encontrado")
-        if get_profile_by_user_id(db, payload.user_id):
+        if user.profile is not None:
             raise ValueError("El usuario de destino ya tiene un perfil")
-        profile.user_id = payload.user_id
+        profile.user = user
     if payload.bio is not None:
         profile.bio = payload.bio
     if payload.phone is not None:
         profile.phone = payload.phone
     if payload.avatar_url is not None:
         profile.avatar_url = payload.avatar_url
-    db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    _commit_one_per_user(db, "El usuario de destino ya tiene un perfil")
     return profile
 
 
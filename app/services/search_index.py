@@ -0,0 +1,194 @@
+"""Índice de búsqueda de texto completo para items, users y categories.
+
+- SQLite: tabla virtual FTS5 ``<tabla>_search`` (rowid = id de la entidad).
+- PostgreSQL: tabla ``<tabla>_search`` con columna ``tsvector`` e índice GIN.
+
+Las tablas se crean/borran junto con ``Base.metadata`` y se mantienen
+sincronizadas en la misma transacción que las escrituras de los servicios
+(hook ``after_flush`` de la sesión). Un índice vacío junto a una tabla con
+filas (base anterior al índice) se reconstruye en el mismo ``create_all``. Otros motores no tienen índice y los
+servicios vuelven a ``LIKE``.
+"""
+import re
+from typing import Iterable
+from sqlalchemy import Float, Integer, event, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+from app.core.database import Base, engine
+from app.models.category import Category
+from app.models.item import Item
+from app.models.user import User
+
+# Tabla de la entidad -> (modelo, columnas indexadas)
+INDEXED = {
+    "items": (Item, ("title", "description")),
+    "users": (User, ("name", "email")),
+    "categories": (Category, ("name", "description")),
+}
+_TABLE_BY_MODEL = {model: table for table, (model, _) in INDEXED.items()}
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Configuración de texto de PostgreSQL: sin stemming, como el LIKE al que sustituye
+PG_TS_CONFIG = "simple"
+
+
+def index_table(table: str) -> str:
+    return f"{table}_search"
+
+
+def supported(dialect_name: str) -> bool:
+    return dialect_name in ("sqlite", "postgresql")
+
+
+def tokenize(q: str) -> list[str]:
+    return _TOKEN_RE.findall(q.lower())
+
+
+def _ddl(dialect_name: str, table: str) -> list[str]:
+    fields = INDEXED[table][1]
+    name = index_table(table)
+    if dialect_name == "sqlite":
+        return [f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5({', '.join(fields)}, tokenize = 'unicode61 remove_diacritics 2')"]
+    return [
+        f"CREATE TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY REFERENCES {table}(id) ON DELETE CASCADE, document TSVECTOR NOT NULL)",
+        f"CREATE INDEX IF NOT EXISTS ix_{name}_document ON {name} USING gin (document)",
+    ]
+
+
+def _pg_document(fields: Iterable[str], prefix: str = ":") -> str:
+    return f"to_tsvector('{PG_TS_CONFIG}', concat_ws(' ', {', '.join(prefix + f for f in fields)}))"
+
+
+def create_all(conn: Connection) -> None:
+    if not supported(conn.dialect.name):
+        return
+    for table in INDEXED:
+        for stmt in _ddl(conn.dialect.name, table):
+            conn.execute(text(stmt))
+
+
+def drop_all(conn: Connection) -> None:
+    if not supported(conn.dialect.name):
+        return
+    for table in INDEXED:
+        conn.execute(text(f"DROP TABLE IF EXISTS {index_table(table)}"))
+
+
+def delete(conn: Connection, table: str, ids: list[int]) -> None:
+    if not ids or not supported(conn.dialect.name):
+        return
+    key = "rowid" if conn.dialect.name == "sqlite" else "id"
+    conn.execute(text(f"DELETE FROM {index_table(table)} WHERE {key} = :id"), [{"id": i} for i in ids])
+
+
+def upsert(conn: Connection, table: str, rows: list[dict]) -> None:
+    """Index (or re-index) ``rows``: dicts with ``id`` plus the indexed columns."""
+    if not rows or not supported(conn.dialect.name):
+        return
+    fields = INDEXED[table][1]
+    name = index_table(table)
+    params = [{"id": r["id"], **{f: r.get(f) for f in fields}} for r in rows]
+    if conn.dialect.name == "sqlite":
+        delete(conn, table, [r["id"] for r in rows])
+        conn.execute(text(f"INSERT INTO {name} (rowid, {', '.join(fields)}) VALUES (:id, {', '.join(':' + f for f in fields)})"), params)
+    else:
+        conn.execute(
+            text(f"INSERT INTO {name} (id, document) VALUES (:id, {_pg_document(fields)}) ON CONFLICT (id) DO UPDATE SET document = excluded.document"),
+            params,
+        )
+
+
+def rebuild(conn: Connection, table: str) -> int:
+    """Rebuild the index of ``table`` from its rows; returns the number of indexed rows."""
+    if not supported(conn.dialect.name):
+        return 0
+    fields = INDEXED[table][1]
+    name = index_table(table)
+    for stmt in _ddl(conn.dialect.name, table):
+        conn.execute(text(stmt))
+    conn.execute(text(f"DELETE FROM {name}"))
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(f"INSERT INTO {name} (rowid, {', '.join(fields)}) SELECT id, {', '.join(fields)} FROM {table}"))
+    else:
+        conn.execute(text(f"INSERT INTO {name} (id, document) SELECT id, {_pg_document(fields, prefix='')} FROM {table}"))
+    return conn.execute(text(f"SELECT count(*) FROM {name}")).scalar_one()
+
+
+def fill_empty(conn: Connection) -> list[str]:
+    """Rebuild the indexes that are empty while their table has rows; returns the rebuilt tables."""
+    if not supported(conn.dialect.name):
+        return []
+    rebuilt = []
+    for table in INDEXED:
+        indexed = conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {index_table(table)})")).scalar()
+        if not indexed and conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar():
+            rebuild(conn, table)
+            rebuilt.append(table)
+    return rebuilt
+
+
+def match(table: str, q: str) -> Subquery | None:
+    """Subquery ``(id, rank)`` of rows matching every token of ``q`` as a prefix.
+    Lower rank is more relevant. Returns None when the database has no index.
+    """
+    dialect_name = engine.dialect.name
+    if not supported(dialect_name):
+        return None
+    name = index_table(table)
+    tokens = tokenize(q)
+    if dialect_name == "sqlite":
+        if tokens:
+            sql = f"SELECT rowid AS id, bm25({name}) AS rank FROM {name} WHERE {name} MATCH :query"
+        else:
+            sql = f"SELECT rowid AS id, 0.0 AS rank FROM {name} WHERE 0"
+        query = " ".join(f'"{t}"*' for t in tokens)
+    else:
+        if tokens:
+            sql = f"SELECT id, -ts_rank(document, to_tsquery('{PG_TS_CONFIG}', :query)) AS rank FROM {name} WHERE document @@ to_tsquery('{PG_TS_CONFIG}', :query)"
+        else:
+            sql = f"SELECT id, 0.0 AS rank FROM {name} WHERE false"
+        query = " & ".join(f"{t}:*" for t in tokens)
+    stmt = text(sql).columns(id=Integer, rank=Float)
+    if tokens:
+        stmt = stmt.bindparams(query=query)
+    return stmt.subquery(f"{table}_match")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _after_create(target, connection, **kw):
+    create_all(connection)
+    # Sin esto, ?q= no encontraría las filas anteriores al índice hasta reconstruirlo a mano
+    fill_empty(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _before_drop(target, connection, **kw):
+    drop_all(connection)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_after_flush(session: Session, flush_context):
+    """Mirror ORM inserts/updates/deletes of indexed entities into the search tables."""
+    upserts: dict[str, list[dict]] = {}
+    deletes: dict[str, list[int]] = {}
+    new, dirty = list(session.new), list(session.dirty)
+    for obj in new + dirty:
+        table = _TABLE_BY_MODEL.get(type(obj))
+        if table is None:
+            continue
+        fields = INDEXED[table][1]
+        state = inspect(obj)
+        if not state.pending and not any(state.attrs[f].history.has_changes() for f in fields):
+            continue
+        upserts.setdefault(table, []).append({"id": obj.id, **{f: getattr(obj, f) for f in fields}})
+    for obj in session.deleted:
+        table = _TABLE_BY_MODEL.get(type(obj))
+        if table is not None:
+            deletes.setdefault(table, []).append(obj.id)
+    if not upserts and not deletes:
+        return
+    conn = session.connection()
+    for table, ids in deletes.items():
+        delete(conn, table, ids)
+    for table, rows in upserts.items():
+        upsert(conn, table, rows)
@@ -1,16 +1,26 @@
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import or_
+from sqlalchemy import or_, func, select
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
+from app.models.item import Item
+from app.models.category import item_category
 from app.schemas.user import UserCreate, UserUpdate
-import bcrypt
+from app.core.passwords import hash_password
+from app.services import item_counts, search_index, versions  # noqa: F401 (versions registra los hooks de versiones de filas y colecciones)
 
 
 def list_users(db: Session, skip: int = 0, limit: int = 100, search: str | None = None) -> list[User]:
     q = db.query(User).options(selectinload(User.items), selectinload(User.profile))
+    order_by = [User.id.asc()]
     if search:
-        like = f"%{search}%"
-        q = q.filter(or_(User.name.like(like), User.email.like(like)))
-    return q.order_by(User.id.asc()).offset(skip).limit(limit).all()
+        matched = search_index.match("users", search)
+        if matched is None:
+            like = f"%{search}%"
+            q = q.filter(or_(User.name.like(like), User.email.like(like)))
+        else:
+            q = q.join(matched, matched.c.id == User.id)
+            order_by.insert(0, matched.c.rank)
+    return q.order_by(*order_by).offset(skip).limit(limit).all()
 
 
 def get_user(db: Session, user_id: int) -> User | None:
@@ -25,16 +35,21 @@ def get_user_by_name(db: Session, name: str) -> User | None:
     return db.query(User).filter(User.name == name).first()
 
 
-def create_user(db: Session, payload: UserCreate) -> User:
-    existing = get_user_by_email(db, payload.email)
-    if existing:
+def _commit_unique_email(db: Session) -> None:
+    """Commit; the UNIQUE index on ``users.email`` rejects duplicates (no SELECT beforehand)."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
         raise ValueError("Email ya registrado")
+
+
+def create_user(db: Session, payload: UserCreate) -> User:
     # Hash password using bcrypt
-    hashed = bcrypt.hashpw(payload.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    hashed = hash_password(payload.password)
     user = User(name=payload.name, email=payload.email, hashed_password=hashed, role=payload.role)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    _commit_unique_email(db)
     return user
 
 
@@ -42,20 +57,15 @@ def update_user(db: Session, user_id: int, payload: UserUpdate) -> User | None:
     user = get_user(db, user_id)
     if not user:
         return None
-    if payload.email and payload.email != user.email:
-        if get_user_by_email(db, payload.email):
-            raise ValueError("Email ya registrado")
     if payload.name is not None:
         user.name = payload.name
     if payload.email is not None:
         user.email = payload.email
     if payload.password is not None:
-        user.hashed_password = bcrypt.hashpw(payload.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        user.hashed_password = hash_password(payload.password)
     if payload.role is not None:
         user.role = payload.role
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    _commit_unique_email(db)
     return user
 
 
@@ -63,6 +73,10 @@ def delete_user(db: Session, user_id: int) -> bool:
     user = get_user(db, user_id)
     if not user:
         return False
+    # Sus ítems se borran en cascada: descontarlos de sus categorías
+    link = item_category.c
+    stmt = select(link.category_id, func.count()).join(Item, Item.id == link.item_id).where(Item.owner_id == user_id).group_by(link.category_id)
+    item_counts.adjust(db.connection(), categories={cid: -n for cid, n in db.execute(stmt).all()})
     db.delete(user)
     db.commit()
     return True
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Versiones de filas y colecciones para ETags y GET condicionales.
+
+- Cada fila de ``items``, ``users``, ``categories`` y ``profiles`` tiene una
+  columna ``version`` que sube en cada UPDATE (``onupdate`` del modelo); los
+  cambios que solo tocan relaciones (p. ej. las categorías de un ítem) la
+  fuerzan aquí antes del flush.
+- La tabla ``collection_versions`` guarda un contador por colección que sube
+  en la misma transacción que cualquier alta, cambio o baja (hook
+  ``after_flush`` de la sesión). Los listados derivan su ETag de estos
+  contadores sin leer las filas.
+
+Las escrituras Core/bulk que no pasan por la sesión llaman a ``bump``.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import Column, Integer, String, Table, event, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import ScalarSelect
+from app.core.cache import ResponseCache
+from app.core.database import Base
+from app.core.etag import weak_etag
+from app.models.category import Category
+from app.models.item import Item
+from app.models.profile import Profile
+from app.models.user import User
+
+collection_versions = Table(
+    "collection_versions",
+    Base.metadata,
+    Column("name", String(50), primary_key=True),
+    Column("version", Integer, nullable=False, default=0),
+)
+
+# Colección -> modelo versionado
+COLLECTIONS = {"items": Item, "users": User, "categories": Category, "profiles": Profile}
+_COLLECTION_BY_MODEL = {model: name for name, model in COLLECTIONS.items()}
+# Bajas que arrastran otras colecciones (ON DELETE CASCADE / tabla de asociación)
+CASCADES = {"users": ("items", "profiles"), "categories": ("items",)}
+
+
+def seed(conn: Connection) -> None:
+    """Insert the missing counters (idempotent)."""
+    existing = set(conn.execute(select(collection_versions.c.name)).scalars().all())
+    missing = [{"name": name, "version": 0} for name in COLLECTIONS if name not in existing]
+    if missing:
+        conn.execute(collection_versions.insert(), missing)
+
+
+def bump(conn: Connection, *names: str) -> None:
+    """Increment the counters of ``names`` (creating the missing ones first)."""
+    names = set(names)
+    if not names:
+        return
+    c = collection_versions.c
+    stmt = update(collection_versions).where(c.name.in_(names)).values(version=c.version + 1)
+    if conn.execute(stmt).rowcount != len(names):
+        # Sin fila el UPDATE no hace nada y los ETags no cambiarían nunca: se crea ya incrementada
+        existing = set(conn.execute(select(c.name).where(c.name.in_(names))).scalars().all())
+        conn.execute(collection_versions.insert(), [{"name": name, "version": 1} for name in sorted(names - existing)])
+
+
+def current(name: str) -> ScalarSelect:
+    """Scalar subquery with the counter of ``name`` (to embed in a row-version lookup)."""
+    c = collection_versions.c
+    return select(c.version).where(c.name == name).scalar_subquery()
+
+
+async def collection_etag(db: AsyncSession, names: Iterable[str], endpoint: str, params: Dict[str, Any]) -> str:
+    """Weak ETag of a list response: counters of ``names`` plus the normalized query params."""
+    names = sorted(set(names))
+    c = collection_versions.c
+    counters = dict((await db.execute(select(c.name, c.version).where(c.name.in_(names)))).all())
+    digest = hashlib.sha1(ResponseCache.key(endpoint, params).encode()).hexdigest()[:16]
+    return weak_etag(*(f"{name}.{counters.get(name, 0)}" for name in names), digest)
+
+
+def row_etag(kind: str, row_id: int, *versions: Optional[int]) -> str:
+    # Las relaciones opcionales ausentes (p. ej. usuario sin perfil) cuentan como 0
+    return weak_etag(kind, row_id, *(v or 0 for v in versions))
+
+
+@event.listens_for(collection_versions, "after_create")
+def _after_create(target, connection, **kw):
+    seed(connection)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_relationship_only_changes(session: Session, flush_context, instances):
+    """Force the row version of objects whose only changes are in relationships (no UPDATE otherwise)."""
+    for obj in session.dirty:
+        model = type(obj)
+        if model not in _COLLECTION_BY_MODEL:
+            continue
+        state = inspect(obj)
+        changed = [attr.key for attr in state.attrs if attr.history.has_changes()]
+        if changed and not any(key in state.mapper.column_attrs for key in changed):
+            obj.version = model.version + 1
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session: Session, flush_context):
+    """Increment the counters of the collections touched by the flush."""
+    names = set()
+    for obj in session.new:
+        name = _COLLECTION_BY_MODEL.get(type(obj))
+        if name is not None:
+            names.add(name)
+    for obj in session.deleted:
+        name = _COLLECTION_BY_MODEL.get(type(obj))
+        if name is not None:
+            names.update((name, *CASCADES.get(name, ())))
+    for obj in session.dirty:
+        name = _COLLECTION_BY_MODEL.get(type(obj))
+        if name is not None and session.is_modified(obj):
+            names.add(name)
+    if names:
+        bump(session.connection(), *names)
@@ -0,0 +1,16 @@
+"""Suite de rendimiento de la API: ``python -m benchmarks <comando>``.
+
+- ``generate``: dataset reproducible (misma semilla, mismas filas) a escala
+  ``10k``, ``100k`` o ``1m`` ítems, con los modelos de ``app/models``.
+- ``micro``: micro-benchmarks en proceso (ASGI, sin red) de cada router de
+  ``app/api/v1/endpoints``.
+- ``load``: carga mixta contra uvicorn con varios workers.
+- ``compare``: compara dos resultados JSON y marca las regresiones.
+
+``micro`` y ``load`` escriben sus resultados en JSON y, si existe, los
+comparan con la línea base guardada en ``benchmarks/baselines/``.
+
+Los módulos que importan ``app`` (``dataset``, ``micro``) deben importarse
+después de fijar ``DATABASE_URL``: los engines se crean al importar
+``app.core.database``. ``__main__`` se encarga de ese orden.
+"""
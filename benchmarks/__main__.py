@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks import results
+
+SCALES = ["10k", "100k", "1m"]
+DEFAULT_CACHE_DIR = results.BENCH_DIR / ".data"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="API benchmark suite: reproducible dataset, in-process micro-benchmarks and a multi-worker load scenario")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def dataset_args(p):
+        p.add_argument("--scale", choices=SCALES, default="10k", help="Dataset size (items; users, profiles, categories and links scale with it)")
+        p.add_argument("--seed", type=int, default=42, help="Generator seed")
+        p.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Where generated SQLite datasets are kept")
+        p.add_argument("--database-url", default=None, help="Use this database instead of a copy of the cached SQLite dataset (it must already hold a generated dataset)")
+
+    def output_args(p):
+        p.add_argument("--cache", action="store_true", help="Keep the response cache enabled (off by default: every request reaches the database)")
+        p.add_argument("--output", type=Path, default=None, help="Results JSON (default: benchmarks/results/<suite>-<scale>-<timestamp>.json)")
+        p.add_argument("--baseline", type=Path, default=None, help="Baseline JSON to compare with (default: benchmarks/baselines/<suite>-<scale>.json if it exists)")
+        p.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+        p.add_argument("--tolerance", type=float, default=results.DEFAULT_TOLERANCE, help="Allowed relative slowdown before flagging a regression")
+
+    p = sub.add_parser("generate", help="Generate the dataset (cached SQLite file, or --database-url: drops and recreates its schema)")
+    dataset_args(p)
+    p.add_argument("--force", action="store_true", help="Regenerate even if the cached file exists")
+
+    p = sub.add_parser("micro", help="In-process ASGI micro-benchmarks per router")
+    dataset_args(p)
+    output_args(p)
+    p.add_argument("--iterations", type=int, default=200, help="Measured requests per case")
+    p.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per case before measuring")
+    p.add_argument("--router", action="append", default=None, help="Only cases of this router (repeatable): users, items, categories, profiles, auth")
+
+    p = sub.add_parser("load", help="Mixed load against python -m app.serve with several workers")
+    dataset_args(p)
+    output_args(p)
+    p.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    p.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    p.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+
+    p = sub.add_parser("scaling", help="The load scenario with 1..N workers: throughput per worker count and speedup over the first")
+    dataset_args(p)
+    output_args(p)
+    p.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 1, 2, 4... up to the CPUs available)")
+    p.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    p.add_argument("--duration", type=float, default=20.0, help="Seconds of load per worker count")
+
+    p = sub.add_parser("compare", help="Compare two results JSON files")
+    p.add_argument("current", type=Path)
+    p.add_argument("baseline", type=Path)
+    p.add_argument("--tolerance", type=float, default=results.DEFAULT_TOLERANCE, help="Allowed relative slowdown before flagging a regression")
+    return parser.parse_args()
+
+
+def prepare_database(args) -> tuple[str, dict]:
+    """Point DATABASE_URL at the benchmark database and return it with the dataset metadata.
+
+    Must run before anything imports ``app``: the engines are created on import.
+    """
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+        from sqlalchemy.engine import make_url
+        return args.database_url, {"scale": args.scale, "seed": args.seed, "dialect": make_url(args.database_url).get_backend_name()}
+    # Copia desechable: los casos de escritura no alteran el dataset cacheado
+    run_db = Path(tempfile.mkdtemp(prefix="bench-")) / "bench.db"
+    url = f"sqlite:///{run_db}"
+    os.environ["DATABASE_URL"] = url
+    from benchmarks import dataset
+
+    cached = dataset.ensure_sqlite(args.scale, args.seed, args.cache_dir)
+    shutil.copyfile(cached, run_db)
+    # Datasets cacheados con un esquema anterior: mismas migraciones que aplicaría la app al arrancar
+    from app.core import migrations
+    from app.core.database import engine
+
+    migrations.upgrade(engine)
+    meta = dataset.load_meta(cached)
+    return url, {key: meta[key] for key in ("scale", "seed", "dialect", "rows")}
+
+
+def worker_counts() -> list[int]:
+    """1, 2, 4... up to the CPUs available, always ending at that number."""
+    from app.serve import default_workers
+
+    cpus = default_workers()
+    counts = [1]
+    while counts[-1] * 2 < cpus:
+        counts.append(counts[-1] * 2)
+    return counts + [cpus] if cpus > 1 else counts
+
+
+def finish(suite: str, args, meta: dict, res: dict) -> int:
+    doc = results.document(suite, meta, res)
+    output = args.output or results.default_output(suite, args.scale)
+    results.save(doc, output)
+    print(f"Resultados: {output}")
+    baseline = args.baseline or results.default_baseline(suite, args.scale)
+    regressed = False
+    if baseline.exists():
+        base = results.load(baseline)
+        regressed = results.print_comparison(results.compare(doc, base, args.tolerance), doc, base)
+    elif args.baseline:
+        print(f"No existe la línea base {baseline}")
+        return 2
+    if args.save_baseline:
+        results.save(doc, results.default_baseline(suite, args.scale))
+        print(f"Línea base guardada: {results.default_baseline(suite, args.scale)}")
+    return 1 if regressed else 0
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "compare":
+        current, base = results.load(args.current), results.load(args.baseline)
+        return 1 if results.print_comparison(results.compare(current, base, args.tolerance), current, base) else 0
+
+    if args.command == "generate":
+        if args.database_url:
+            os.environ["DATABASE_URL"] = args.database_url
+            from sqlalchemy import create_engine
+            from benchmarks import dataset
+
+            engine = create_engine(args.database_url)
+            dataset.populate(engine, args.scale, args.seed)
+            engine.dispose()
+        else:
+            from benchmarks import dataset
+
+            print(f"Dataset: {dataset.ensure_sqlite(args.scale, args.seed, args.cache_dir, force=args.force)}")
+        return 0
+
+    os.environ["RESPONSE_CACHE_BACKEND"] = "memory" if args.cache else "none"
+    url, meta = prepare_database(args)
+    meta["response_cache"] = args.cache
+
+    if args.command == "micro":
+        from benchmarks import micro
+
+        unknown = set(args.router or ()) - set(micro.ROUTERS)
+        if unknown:
+            print(f"Routers desconocidos: {', '.join(sorted(unknown))} (disponibles: {', '.join(micro.ROUTERS)})")
+            return 2
+        meta.update(iterations=args.iterations, warmup=args.warmup)
+        res = asyncio.run(micro.run(args.iterations, args.warmup, args.seed, args.router))
+        return finish("micro", args, meta, res)
+
+    from sqlalchemy import create_engine
+    from benchmarks import dataset, load
+
+    engine = create_engine(url)
+    sizes = dataset.table_sizes(engine)
+    engine.dispose()
+    env = {"RESPONSE_CACHE_BACKEND": os.environ["RESPONSE_CACHE_BACKEND"]}
+    if args.command == "scaling":
+        counts = [int(w) for w in args.workers.split(",")] if args.workers else worker_counts()
+        meta.update(workers=counts, clients=args.clients, duration=args.duration)
+        res = load.scaling(url, sizes, counts, args.clients, args.duration, args.seed, env)
+        return finish("scaling", args, meta, res)
+    meta.update(workers=args.workers, clients=args.clients, duration=args.duration)
+    res = load.run(url, sizes, args.workers, args.clients, args.duration, args.seed, env)
+    return finish("load", args, meta, res)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Generador determinista del dataset de benchmarks.
+
+Cada tabla usa su propio ``random.Random`` sembrado con ``<semilla>:<tabla>``:
+la misma semilla y escala producen siempre las mismas filas (también los ids
+y el hash de la contraseña, con sal fija). Las filas se insertan por lotes con
+``insert()`` de Core; después se reconstruye el índice de búsqueda y se
+recalculan los contadores ``item_count``, como harían los servicios.
+"""
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+import bcrypt
+from sqlalchemy import create_engine, event, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core import migrations
+from app.core.config import settings
+from app.core.database import Base
+from app.models.user import User
+from app.models.item import Item
+from app.models.category import Category, item_category
+from app.models.profile import Profile
+from app.services import item_counts, search_index
+
+# Escala -> número de ítems; el resto de tablas se deriva de él
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 42
+# Todos los usuarios comparten contraseña; el 1 es admin
+PASSWORD = "bench-password"
+ADMIN_ID = 1
+BATCH_SIZE = 10_000
+# Sal fija (22 caracteres del alfabeto de bcrypt): el hash también es reproducible
+_SALT = b"benchmarkdatasetsalt.."
+
+WORDS = (
+    "libro mesa silla lámpara teclado ratón monitor cable cargador mochila taza botella cuaderno lápiz "
+    "sartén cazo cuchillo receta novela historia ciencia viaje música película juego bicicleta reloj "
+    "cámara altavoz auricular zapatilla chaqueta camiseta bufanda planta maceta semilla herramienta"
+).split()
+ADJECTIVES = "nuevo usado rojo azul verde grande pequeño ligero clásico moderno barato premium".split()
+
+
+def sizes(scale: str) -> Dict[str, int]:
+    items = SCALES[scale]
+    users = max(100, items // 10)
+    return {"items": items, "users": users, "categories": max(20, items // 1000)}
+
+
+def _rng(seed: int, table: str) -> random.Random:
+    return random.Random(f"{seed}:{table}")
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def _users(seed: int, n: int) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "users")
+    hashed = bcrypt.hashpw(PASSWORD.encode(), b"$2b$%02d$%s" % (settings.bcrypt_rounds, _SALT)).decode()
+    for i in range(1, n + 1):
+        role = "admin" if i == ADMIN_ID else ("guest" if rng.random() < 0.05 else "user")
+        yield {"id": i, "name": f"{rng.choice(ADJECTIVES).capitalize()} {rng.choice(WORDS)} {i}", "email": f"user{i}@example.com", "hashed_password": hashed, "role": role}
+
+
+def _profiles(seed: int, users: int) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "profiles")
+    profile_id = 0
+    for user_id in range(1, users + 1):
+        # El admin siempre tiene perfil (GET /profiles/me); el resto, 8 de cada 10
+        if user_id == ADMIN_ID or rng.random() < 0.8:
+            profile_id += 1
+            yield {"id": profile_id, "user_id": user_id, "bio": _sentence(rng, 5, 30), "phone": f"6{rng.randint(0, 99_999_999):08d}", "avatar_url": None}
+
+
+def _categories(seed: int, n: int) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "categories")
+    for i in range(1, n + 1):
+        yield {"id": i, "name": f"{rng.choice(WORDS).capitalize()} {i}", "description": _sentence(rng, 3, 12)}
+
+
+def _items(seed: int, n: int, users: int) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "items")
+    for i in range(1, n + 1):
+        # Propietarios sesgados hacia los ids bajos: pocos usuarios con muchos ítems, como en producción
+        owner_id = int(users * rng.random() ** 2) + 1
+        yield {"id": i, "title": f"{rng.choice(WORDS).capitalize()} {rng.choice(ADJECTIVES)} {i}", "description": _sentence(rng, 6, 40), "owner_id": owner_id}
+
+
+def _links(seed: int, items: int, categories: int) -> Iterator[Dict[str, Any]]:
+    rng = _rng(seed, "item_category")
+    for item_id in range(1, items + 1):
+        for category_id in rng.sample(range(1, categories + 1), rng.randint(1, 3)):
+            yield {"item_id": item_id, "category_id": category_id}
+
+
+def _batched(rows: Iterator[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def populate(engine: Engine, scale: str, seed: int = DEFAULT_SEED, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """Drop and recreate the schema on ``engine`` and fill it; returns the dataset metadata."""
+    n = sizes(scale)
+    tables = [
+        (User, lambda: _users(seed, n["users"])),
+        (Profile, lambda: _profiles(seed, n["users"])),
+        (Category, lambda: _categories(seed, n["categories"])),
+        (Item, lambda: _items(seed, n["items"], n["users"])),
+        (item_category, lambda: _links(seed, n["items"], n["categories"])),
+    ]
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+    counts: Dict[str, int] = {}
+    start = time.perf_counter()
+    for target, rows in tables:
+        table = getattr(target, "__table__", target)
+        step = time.perf_counter()
+        # Una transacción por tabla
+        with engine.begin() as conn:
+            for batch in _batched(rows()):
+                conn.execute(insert(table), batch)
+            counts[table.name] = conn.execute(select(func.count()).select_from(table)).scalar_one()
+        log(f" - {table.name}: {counts[table.name]:,} filas en {time.perf_counter() - step:.1f}s")
+    with engine.begin() as conn:
+        if search_index.supported(engine.dialect.name):
+            for table in search_index.INDEXED:
+                search_index.rebuild(conn, table)
+        item_counts.reconcile(conn, fix=True)
+        _reset_sequences(conn)
+    log(f"Dataset {scale} (semilla {seed}) generado en {time.perf_counter() - start:.1f}s")
+    return {"scale": scale, "seed": seed, "dialect": engine.dialect.name, "rows": counts, "password": PASSWORD}
+
+
+def _reset_sequences(conn: Connection) -> None:
+    """PostgreSQL: move the id sequences past the explicit ids inserted (SQLite needs nothing)."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in ("users", "profiles", "categories", "items"):
+        conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"))
+
+
+def ensure_sqlite(scale: str, seed: int, cache_dir: Path, force: bool = False, log: Callable[[str], None] = print) -> Path:
+    """Path of the cached SQLite file for ``scale``/``seed``, generating it if missing.
+
+    The file is never modified by the benchmarks: they run on a copy.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{scale}-seed{seed}.db"
+    meta_path = path.with_suffix(".json")
+    # El .json se escribe al final: sin él, el fichero está a medias
+    if path.exists() and meta_path.exists() and not force:
+        return path
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    engine = create_engine(f"sqlite:///{tmp}")
+
+    @event.listens_for(engine, "connect")
+    def _fast_load(dbapi_conn, record):
+        # Solo para generar: sin diario ni fsync (si falla, se regenera)
+        dbapi_conn.execute("PRAGMA journal_mode=OFF")
+        dbapi_conn.execute("PRAGMA synchronous=OFF")
+
+    meta = populate(engine, scale, seed, log)
+    engine.dispose()
+    tmp.replace(path)
+    meta_path.write_text(json.dumps(meta, indent=2))
+    return path
+
+
+def table_sizes(engine: Engine) -> Dict[str, int]:
+    """Row counts the benchmarks draw valid ids from."""
+    with engine.connect() as conn:
+        return {model.__tablename__: conn.execute(select(func.count()).select_from(model)).scalar_one() for model in (User, Profile, Category, Item)}
+
+
+def load_meta(path: Path) -> Dict[str, Any]:
+    return json.loads(path.with_suffix(".json").read_text())
@@ -0,0 +1,131 @@
+"""Escenario de carga contra el servidor de producción con varios workers.
+
+Arranca ``python -m app.serve --workers N`` (gunicorn o uvicorn, como en
+producción) en un puerto libre sobre la base de datos indicada, espera a
+``/health`` y lanza ``clients`` clientes que repiten una mezcla ponderada de
+operaciones durante ``duration`` segundos.
+"""
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks import dataset
+from benchmarks.results import ROOT_DIR, summarize
+
+# Operación -> (peso, método, ruta, cuerpo); ``n`` son los tamaños del dataset
+Op = Tuple[int, str, Callable[[Dict[str, int], random.Random], str], Callable[[Dict[str, int], random.Random], Any]]
+MIX: Dict[str, Op] = {
+    "items.list": (25, "GET", lambda n, rng: f"/api/v1/items/?limit=20&owner_id={rng.randint(1, n['users'])}", None),
+    "items.get": (25, "GET", lambda n, rng: f"/api/v1/items/{rng.randint(1, n['items'])}", None),
+    "items.search": (10, "GET", lambda n, rng: f"/api/v1/items/?limit=20&q={rng.choice(dataset.WORDS)}", None),
+    "categories.get": (10, "GET", lambda n, rng: f"/api/v1/categories/{rng.randint(1, n['categories'])}", None),
+    "users.list_expand": (10, "GET", lambda n, rng: "/api/v1/users/?limit=20&expand=items,profile", None),
+    "profiles.me": (5, "GET", lambda n, rng: "/api/v1/profiles/me", None),
+    "items.create": (10, "POST", lambda n, rng: "/api/v1/items/", lambda n, rng: {"title": "Carga", "description": "ítem de la prueba de carga", "owner_id": rng.randint(1, n["users"]), "category_ids": [rng.randint(1, n["categories"])]}),
+    "items.patch": (5, "PATCH", lambda n, rng: f"/api/v1/items/{rng.randint(1, n['items'])}", lambda n, rng: {"title": "Editado en carga"}),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, workers: int, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    # Sin procesos de bcrypt por worker: la mezcla no hace login y multiplicaría los procesos
+    server_env = {**os.environ, "DATABASE_URL": database_url, "PASSWORD_HASH_WORKERS": "0", "SERVE_LOG_LEVEL": "warning", "SERVE_ACCESS_LOG": "false", **env}
+    return subprocess.Popen(cmd, cwd=ROOT_DIR, env=server_env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+async def wait_ready(base_url: str, server: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"El servidor terminó al arrancar:\n{server.stderr.read()[-2000:]}")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {timeout:.0f}s")
+
+
+async def _drive(base_url: str, token: str, sizes: Dict[str, int], clients: int, duration: float, seed: int) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    names = list(MIX)
+    weights = [MIX[name][0] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, headers={"Authorization": f"Bearer {token}"}, limits=limits, timeout=60) as client:
+
+        async def loop(client_id: int, deadline: float) -> None:
+            rng = random.Random(f"{seed}:load:{client_id}")
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                _, method, path, body = MIX[name]
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path(sizes, rng), json=body(sizes, rng) if body else None)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                latencies[name].append(time.perf_counter() - start)
+                errors[name] += failed
+
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(loop(i, deadline) for i in range(clients)))
+        return latencies, errors, time.perf_counter() - start
+
+
+def run(database_url: str, sizes: Dict[str, int], workers: int, clients: int, duration: float, seed: int, env: Dict[str, str], log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """Run the load scenario; returns ``{operation: stats, "total": stats}``."""
+    from app.core.security import create_access_token
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(database_url, workers, port, env)
+    try:
+        asyncio.run(wait_ready(base_url, server))
+        log(f"app.serve con {workers} workers en {base_url}; {clients} clientes durante {duration:.0f}s")
+        token = create_access_token({"sub": str(dataset.ADMIN_ID), "role": "admin"})
+        latencies, errors, elapsed = asyncio.run(_drive(base_url, token, sizes, clients, duration, seed))
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    results = {name: summarize(values, elapsed, errors[name]) for name, values in latencies.items()}
+    results["total"] = summarize([v for values in latencies.values() for v in values], elapsed, sum(errors.values()))
+    log(f"{'operación':<22}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'errores':>9}")
+    for name, stats in results.items():
+        log(f"{name:<22}{stats['n']:>8}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['ops_per_sec']:>10,.0f}{stats['errors']:>9}")
+    return results
+
+
+def scaling(database_url: str, sizes: Dict[str, int], worker_counts: List[int], clients: int, duration: float, seed: int, env: Dict[str, str], log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """Run the load scenario once per worker count; returns ``{"workers=N": total stats plus speedup}``."""
+    results: Dict[str, Any] = {}
+    base = None
+    for workers in worker_counts:
+        total = run(database_url, sizes, workers, clients, duration, seed, env, log=lambda _: None)["total"]
+        base = base or total["ops_per_sec"]
+        total["speedup"] = round(total["ops_per_sec"] / base, 2) if base else 0.0
+        results[f"workers={workers}"] = total
+    log(f"{'workers':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errores':>9}{'aceleración':>13}")
+    for name, stats in results.items():
+        log(f"{name.split('=')[1]:<10}{stats['ops_per_sec']:>10,.0f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['errors']:>9}{stats['speedup']:>12.2f}x")
+    return results
@@ -0,0 +1,137 @@
+"""Micro-benchmarks en proceso de cada router de ``app/api/v1/endpoints``.
+
+Las peticiones pasan por la pila ASGI completa (middlewares incluidos) con
+``httpx.ASGITransport``, sin red ni servidor. Cada caso se ejecuta en serie:
+primero ``warmup`` peticiones que no cuentan y después ``iterations``
+medidas. Además de la latencia se cuentan las consultas SQL por petición.
+"""
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import httpx
+from sqlalchemy import event
+
+from app.main import app
+from app.core.database import async_engine, engine
+from app.core.pagination import encode_cursor
+from app.core.security import create_access_token
+from benchmarks import dataset
+from benchmarks.results import summarize
+
+# Tamaño de las tablas: los casos eligen ids válidos a partir de él
+Sizes = Dict[str, int]
+PathFn = Callable[[Sizes, random.Random, int], str]
+BodyFn = Callable[[Sizes, random.Random, int], Any]
+
+
+class Case:
+    """One benchmarked request; ``path`` and ``body`` get the table sizes, a seeded RNG and a sequence number."""
+
+    def __init__(self, name: str, method: str, path: PathFn, body: Optional[BodyFn] = None, max_iterations: Optional[int] = None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        # Tope para los casos caros (bcrypt, exportaciones completas)
+        self.max_iterations = max_iterations
+
+    @property
+    def router(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+def _some(table: str) -> Callable[[Sizes, random.Random], int]:
+    return lambda n, rng: rng.randint(1, n[table])
+
+
+item_id, user_id, category_id, profile_id = _some("items"), _some("users"), _some("categories"), _some("profiles")
+
+
+def _new_item(n: Sizes, rng: random.Random, i: int) -> Dict[str, Any]:
+    return {"title": f"Bench {i}", "description": "ítem creado por el benchmark", "owner_id": user_id(n, rng), "category_ids": [category_id(n, rng)]}
+
+
+CASES: List[Case] = [
+    Case("users.list", "GET", lambda n, rng, i: "/api/v1/users/?limit=100"),
+    Case("users.list_expand", "GET", lambda n, rng, i: "/api/v1/users/?limit=100&expand=items,profile"),
+    Case("users.list_cursor", "GET", lambda n, rng, i: f"/api/v1/users/?limit=100&cursor={encode_cursor(user_id(n, rng))}"),
+    Case("users.search", "GET", lambda n, rng, i: f"/api/v1/users/?limit=20&search={rng.choice(dataset.WORDS)}"),
+    Case("users.get", "GET", lambda n, rng, i: f"/api/v1/users/{user_id(n, rng)}"),
+    Case("users.patch", "PATCH", lambda n, rng, i: f"/api/v1/users/{user_id(n, rng)}", lambda n, rng, i: {"name": f"Renombrado {i}"}),
+    Case("users.create", "POST", lambda n, rng, i: "/api/v1/users/", lambda n, rng, i: {"name": f"Nuevo {i}", "email": f"bench{i}@example.com", "password": dataset.PASSWORD}, max_iterations=10),
+    Case("users.export", "GET", lambda n, rng, i: "/api/v1/users/export", max_iterations=5),
+    Case("items.list", "GET", lambda n, rng, i: "/api/v1/items/?limit=100"),
+    Case("items.list_cursor", "GET", lambda n, rng, i: f"/api/v1/items/?limit=100&cursor={encode_cursor(item_id(n, rng))}"),
+    Case("items.list_owner", "GET", lambda n, rng, i: f"/api/v1/items/?limit=100&owner_id={user_id(n, rng)}"),
+    Case("items.list_category", "GET", lambda n, rng, i: f"/api/v1/items/?limit=100&category_id={category_id(n, rng)}"),
+    Case("items.search", "GET", lambda n, rng, i: f"/api/v1/items/?limit=20&q={rng.choice(dataset.WORDS)}"),
+    Case("items.get", "GET", lambda n, rng, i: f"/api/v1/items/{item_id(n, rng)}"),
+    Case("items.create", "POST", lambda n, rng, i: "/api/v1/items/", _new_item),
+    Case("items.patch", "PATCH", lambda n, rng, i: f"/api/v1/items/{item_id(n, rng)}", lambda n, rng, i: {"title": f"Editado {i}"}),
+    Case("items.bulk_create", "POST", lambda n, rng, i: "/api/v1/items/bulk", lambda n, rng, i: {"items": [_new_item(n, rng, i * 100 + k) for k in range(100)]}, max_iterations=50),
+    # Borra desde el final: cada iteración un id distinto que existe
+    Case("items.delete", "DELETE", lambda n, rng, i: f"/api/v1/items/{n['items'] - i}"),
+    Case("items.export_owner", "GET", lambda n, rng, i: f"/api/v1/items/export?owner_id={rng.randint(1, 10)}", max_iterations=20),
+    Case("categories.list", "GET", lambda n, rng, i: "/api/v1/categories/?limit=100"),
+    Case("categories.list_expand", "GET", lambda n, rng, i: "/api/v1/categories/?limit=100&expand=items"),
+    Case("categories.get", "GET", lambda n, rng, i: f"/api/v1/categories/{category_id(n, rng)}"),
+    Case("categories.create", "POST", lambda n, rng, i: "/api/v1/categories/", lambda n, rng, i: {"name": f"Bench {i}", "description": "categoría del benchmark"}),
+    Case("categories.update", "PUT", lambda n, rng, i: f"/api/v1/categories/{category_id(n, rng)}", lambda n, rng, i: {"description": f"Editada {i}"}),
+    Case("profiles.list", "GET", lambda n, rng, i: "/api/v1/profiles/?limit=100"),
+    Case("profiles.me", "GET", lambda n, rng, i: "/api/v1/profiles/me"),
+    Case("profiles.get", "GET", lambda n, rng, i: f"/api/v1/profiles/{profile_id(n, rng)}"),
+    Case("profiles.update", "PUT", lambda n, rng, i: f"/api/v1/profiles/{profile_id(n, rng)}", lambda n, rng, i: {"bio": f"Bio editada {i}"}),
+    Case("auth.login", "POST", lambda n, rng, i: "/api/v1/login", lambda n, rng, i: {"email": f"user{dataset.ADMIN_ID}@example.com", "password": dataset.PASSWORD}, max_iterations=10),
+    Case("auth.profile", "GET", lambda n, rng, i: "/api/v1/profile"),
+]
+
+ROUTERS = sorted({case.router for case in CASES})
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(async_engine.sync_engine, "after_cursor_execute", self._after)
+
+    def _after(self, *args):
+        self.count += 1
+
+
+async def run(iterations: int, warmup: int, seed: int, routers: Optional[Iterable[str]] = None, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """Run the selected cases; returns ``{case name: stats}``."""
+    selected = [case for case in CASES if routers is None or case.router in set(routers)]
+    sizes = dataset.table_sizes(engine)
+    counter = QueryCounter()
+    token = create_access_token({"sub": str(dataset.ADMIN_ID), "role": "admin"})
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results: Dict[str, Any] = {}
+    log(f"{'caso':<26}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'ops/s':>10}{'consultas':>11}{'errores':>9}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}, timeout=600) as client:
+        for case in selected:
+            rng = random.Random(f"{seed}:{case.name}")
+            total = min(iterations, case.max_iterations or iterations)
+            latencies: List[float] = []
+            errors = 0
+            queries = 0
+            elapsed = 0.0
+            for i in range(min(warmup, total) + total):
+                measured = i >= min(warmup, total)
+                body = case.body(sizes, rng, i) if case.body else None
+                request = client.build_request(case.method, case.path(sizes, rng, i), json=body)
+                before = counter.count
+                start = time.perf_counter()
+                response = await client.send(request)
+                await response.aread()
+                took = time.perf_counter() - start
+                if measured:
+                    latencies.append(took)
+                    elapsed += took
+                    queries += counter.count - before
+                    errors += response.status_code >= 400
+            stats = summarize(latencies, elapsed, errors)
+            stats["queries"] = round(queries / len(latencies), 2) if latencies else 0.0
+            results[case.name] = stats
+            log(f"{case.name:<26}{stats['n']:>6}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['ops_per_sec']:>10,.0f}{stats['queries']:>11}{errors:>9}")
+    await async_engine.dispose()
+    return results
@@ -0,0 +1,125 @@
+"""Resultados en JSON y comparación con una línea base.
+
+Formato de un fichero de resultados::
+
+    {"suite": "micro", "meta": {...}, "results": {"items.list": {"p50_ms": ..., ...}}}
+
+``compare`` recorre las métricas de ``METRICS`` presentes en ambos ficheros y
+marca como regresión los empeoramientos por encima de la tolerancia.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent
+BASELINE_DIR = BENCH_DIR / "baselines"
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_TOLERANCE = 0.15
+
+# Métrica -> sentido de la mejora y tolerancia propia (None = la de --tolerance)
+METRICS: Dict[str, tuple[str, Optional[float]]] = {
+    "p50_ms": ("lower", None),
+    "p95_ms": ("lower", None),
+    "ops_per_sec": ("higher", None),
+    # Las consultas por petición son deterministas: cualquier aumento es regresión (p. ej. un N+1)
+    "queries": ("lower", 0.0),
+}
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, Any]:
+    """Latency stats in ms from a list of seconds; ``elapsed`` is the wall time they took."""
+    values = sorted(latencies)
+    n = len(values)
+
+    def pct(q: float) -> float:
+        return round(values[min(n - 1, int(q * n))] * 1000, 3) if n else 0.0
+
+    return {
+        "n": n,
+        "errors": errors,
+        "mean_ms": round(sum(values) / n * 1000, 3) if n else 0.0,
+        "p50_ms": pct(0.5),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(values[-1] * 1000, 3) if n else 0.0,
+        "ops_per_sec": round(n / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def document(suite: str, meta: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+    return {"suite": suite, "meta": {**environment(), **meta}, "results": results}
+
+
+def default_output(suite: str, scale: str) -> Path:
+    return RESULTS_DIR / f"{suite}-{scale}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+
+
+def default_baseline(suite: str, scale: str) -> Path:
+    return BASELINE_DIR / f"{suite}-{scale}.json"
+
+
+def save(doc: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(doc, indent=2, ensure_ascii=False) + "\n")
+
+
+def load(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """One row per (case, metric) present in both documents; ``regression`` flags the worse ones."""
+    rows = []
+    for case, base in baseline["results"].items():
+        now = current["results"].get(case)
+        if now is None:
+            continue
+        for metric, (better, own_tolerance) in METRICS.items():
+            if metric not in base or metric not in now:
+                continue
+            limit = tolerance if own_tolerance is None else own_tolerance
+            old, new = base[metric], now[metric]
+            change = (new - old) / old if old else (float("inf") if new > old else 0.0)
+            worse = change > limit if better == "lower" else change < -limit
+            rows.append({"case": case, "metric": metric, "baseline": old, "current": new, "change": change, "regression": worse})
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], current: Dict[str, Any], baseline: Dict[str, Any], out=sys.stdout) -> bool:
+    """Print the comparison table; returns True if there is any regression."""
+    for key in ("suite", "scale", "seed", "dialect"):
+        a = current.get(key, current["meta"].get(key))
+        b = baseline.get(key, baseline["meta"].get(key))
+        if a != b:
+            print(f"Aviso: {key} distinto ({a} frente a {b} en la línea base)", file=out)
+    print(f"{'caso':<32}{'métrica':<14}{'base':>11}{'actual':>11}{'cambio':>9}", file=out)
+    for row in rows:
+        mark = "  REGRESIÓN" if row["regression"] else ""
+        print(f"{row['case']:<32}{row['metric']:<14}{row['baseline']:>11,.2f}{row['current']:>11,.2f}{row['change']:>+9.1%}{mark}", file=out)
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{regressions} regresiones en {len(rows)} comparaciones (línea base {baseline['meta'].get('commit')}, {baseline['meta'].get('timestamp')})", file=out)
+    return regressions > 0
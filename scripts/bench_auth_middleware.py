@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from app.core.auth_middleware import RoleAuthMiddleware
+from app.core.routes_config import ROUTES_ACCESS, ROUTES_ACCESS_PREFIXES
+from app.core.security import create_access_token, decode_token
+
+
+class LegacyRoleAuthMiddleware(BaseHTTPMiddleware):
+    """Previous implementation (BaseHTTPMiddleware + linear prefix scan), kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        path = request.url.path
+        method = request.method.upper()
+        access_cfg = ROUTES_ACCESS.get(path)
+        prefix_cfg = None
+        if not access_cfg:
+            for cfg in ROUTES_ACCESS_PREFIXES:
+                methods = cfg.get("methods")
+                if path.startswith(cfg.get("prefix")) and (methods is None or method in methods):
+                    prefix_cfg = cfg
+                    break
+        effective_cfg = access_cfg or prefix_cfg
+        if not effective_cfg or effective_cfg.get("public"):
+            return await call_next(request)
+        auth_header = request.headers.get("Authorization", "")
+        if auth_header.startswith("Bearer "):
+            token = auth_header.split(" ", 1)[1]
+        else:
+            token = request.cookies.get("access_token")
+            if not token:
+                return JSONResponse({"detail": "Autorización requerida"}, status_code=401)
+        try:
+            payload = decode_token(token)
+        except Exception:
+            return JSONResponse({"detail": "Token inválido"}, status_code=401)
+        request.state.role = payload.get("role")
+        if "roles" in effective_cfg and request.state.role not in effective_cfg["roles"]:
+            return JSONResponse({"detail": "Permisos insuficientes"}, status_code=403)
+        return await call_next(request)
+
+
+async def endpoint(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def make_scope(method: str, path: str, token: str | None) -> dict:
+    headers = [(b"host", b"bench")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": headers, "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+
+async def time_app(app, scope: dict, n: int) -> float:
+    """Return mean microseconds per request for calling ``app`` directly as ASGI."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    for _ in range(min(n, 200)):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark of RoleAuthMiddleware overhead per request")
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per scenario")
+    args = parser.parse_args()
+
+    token = create_access_token({"sub": "1", "email": "admin@example.com", "role": "admin"})
+    scenarios = [
+        ("public (/api/v1/login)", make_scope("POST", "/api/v1/login", None)),
+        ("unconfigured (/health)", make_scope("GET", "/health", None)),
+        ("protected (GET /api/v1/items/5)", make_scope("GET", "/api/v1/items/5", token)),
+        ("protected (DELETE /api/v1/categories/1)", make_scope("DELETE", "/api/v1/categories/1", token)),
+    ]
+    apps = {"legacy": LegacyRoleAuthMiddleware(endpoint), "asgi": RoleAuthMiddleware(endpoint)}
+
+    print(f"{'scenario':<42}{'legacy us':>12}{'asgi us':>12}{'speedup':>10}")
+    for name, scope in scenarios:
+        base = await time_app(endpoint, scope, args.requests)
+        legacy = await time_app(apps["legacy"], scope, args.requests) - base
+        asgi = await time_app(apps["asgi"], scope, args.requests) - base
+        print(f"{name:<42}{legacy:>12.1f}{asgi:>12.1f}{legacy / max(asgi, 0.01):>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark item creation: one POST per row vs bulk insert")
+    parser.add_argument("--items", type=int, default=10000, help="Items to create with the bulk service")
+    parser.add_argument("--single", type=int, default=1000, help="Items to create one by one (extrapolated to --items)")
+    parser.add_argument("--categories", type=int, default=3, help="Categories per item")
+    parser.add_argument("--database-url", default=None, help="Sync database URL (default: temporary SQLite file)")
+    return parser.parse_args()
+
+
+args = parse_args()
+# La URL debe fijarse antes de importar app.core.database (crea los engines al importarse)
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+
+from sqlalchemy import insert
+
+from app.core.database import Base, engine, async_engine, AsyncSessionLocal
+from app.models.user import User
+from app.models.category import Category
+from app.models.profile import Profile  # noqa: F401 (registra el mapper de User.profile)
+from app.schemas.item import ItemCreate, ItemBulkUpdateEntry
+from app.services.aio import item_service
+
+
+def seed():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "user"} for i in range(1, 101)])
+        conn.execute(insert(Category), [{"id": i, "name": f"Cat {i}"} for i in range(1, 21)])
+
+
+def payloads(n: int) -> list[ItemCreate]:
+    return [
+        ItemCreate(title=f"Item {i}", description="bench", owner_id=i % 100 + 1, category_ids=[(i + k) % 20 + 1 for k in range(args.categories)])
+        for i in range(n)
+    ]
+
+
+async def main():
+    seed()
+    async with AsyncSessionLocal() as db:
+        single = payloads(args.single)
+        start = time.perf_counter()
+        for p in single:
+            await item_service.create_item(db, p)
+        single_s = time.perf_counter() - start
+        print(f"create_item x{args.single}: {single_s:.2f}s (~{single_s * args.items / args.single:.1f}s para {args.items})")
+
+        bulk = payloads(args.items)
+        start = time.perf_counter()
+        ids, errors = await item_service.bulk_create_items(db, bulk)
+        print(f"bulk_create_items x{args.items}: {time.perf_counter() - start:.2f}s ({len(errors)} errores)")
+
+        entries = [ItemBulkUpdateEntry(id=i, title=f"Renamed {i}", category_ids=[1]) for i in ids]
+        start = time.perf_counter()
+        await item_service.bulk_update_items(db, entries)
+        print(f"bulk_update_items x{len(entries)}: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        await item_service.bulk_delete_items(db, ids)
+        print(f"bulk_delete_items x{len(ids)}: {time.perf_counter() - start:.2f}s")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
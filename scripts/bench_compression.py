@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compressed size and compression cost per endpoint (gzip levels and brotli if installed)")
+    parser.add_argument("--items", type=int, default=5000, help="Items to seed")
+    parser.add_argument("--rounds", type=int, default=50, help="Compressions per endpoint and setting")
+    parser.add_argument("--page", type=int, default=100, help="Page size of the list endpoints")
+    return parser.parse_args()
+
+
+args = parse_args()
+# La URL debe fijarse antes de importar app.core.database (crea los engines al importarse)
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+os.environ["COMPRESSION_ENABLED"] = "false"
+
+import httpx
+from sqlalchemy import insert
+
+from app.main import app
+from app.core.database import Base, engine, async_engine
+from app.core.security import create_access_token
+from app.models.user import User
+from app.models.item import Item
+from app.models.category import Category, item_category
+from app.models.profile import Profile
+
+try:
+    import brotli
+except ImportError:  # opcional: sin el paquete solo se mide gzip
+    brotli = None
+
+ENDPOINTS = [
+    "/api/v1/items/1",
+    "/api/v1/items/?limit={page}",
+    "/api/v1/users/?limit={page}&expand=items,profile",
+    "/api/v1/categories/?limit={page}&expand=items",
+    "/api/v1/items/export",
+]
+
+SETTINGS = [(f"gzip-{level}", lambda body, level=level: zlib.compress(body, level, wbits=31)) for level in (1, 6, 9)]
+if brotli is not None:
+    SETTINGS += [(f"br-{quality}", lambda body, quality=quality: brotli.compress(body, quality=quality)) for quality in (1, 4, 11)]
+
+
+def seed():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "user"} for i in range(1, 201)])
+        conn.execute(insert(Profile), [{"user_id": i, "bio": f"Bio del usuario {i}", "phone": "600000000"} for i in range(1, 201)])
+        conn.execute(insert(Category), [{"id": i, "name": f"Cat {i}", "description": "bench"} for i in range(1, 201)])
+        conn.execute(insert(Item), [{"id": i, "title": f"Item {i}", "description": "Descripción de prueba " * 4, "owner_id": i % 200 + 1} for i in range(1, args.items + 1)])
+        conn.execute(insert(item_category), [{"item_id": i, "category_id": (i + k) % 200 + 1} for i in range(1, args.items + 1) for k in range(3)])
+
+
+async def bodies() -> dict[str, bytes]:
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1', 'role': 'admin'})}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", headers=headers) as client:
+        result = {}
+        for template in ENDPOINTS:
+            path = template.format(page=args.page)
+            response = await client.get(path)
+            response.raise_for_status()
+            result[path] = response.content
+    return result
+
+
+async def main():
+    seed()
+    print(f"{'endpoint':<48}{'setting':>10}{'KB':>9}{'ratio':>7}{'ms':>8}")
+    for path, body in (await bodies()).items():
+        print(f"{path:<48}{'identity':>10}{len(body) / 1024:>9.1f}")
+        for name, fn in SETTINGS:
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                compressed = fn(body)
+            ms = (time.perf_counter() - start) / args.rounds * 1000
+            print(f"{'':<48}{name:>10}{len(compressed) / 1024:>9.1f}{len(body) / len(compressed):>7.1f}{ms:>8.2f}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
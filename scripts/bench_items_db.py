@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark GET /api/v1/items/ with sync Session vs AsyncSession")
+    parser.add_argument("--items", type=int, default=2000, help="Items to seed in the benchmark database")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent in-flight requests")
+    parser.add_argument("--limit", type=int, default=100, help="Page size for each request")
+    parser.add_argument("--database-url", default=None, help="Sync database URL (default: temporary SQLite file)")
+    return parser.parse_args()
+
+
+args = parse_args()
+# La URL debe fijarse antes de importar app.core.database (crea los engines al importarse)
+if args.database_url:
+    os.environ["DATABASE_URL"] = args.database_url
+else:
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, SessionLocal, engine, async_engine, get_db, get_async_db
+from app.models.user import User
+from app.models.item import Item
+from app.models.category import Category
+from app.models.profile import Profile  # noqa: F401 (registra el mapper de User.profile)
+from app.schemas.item import ItemReadWithOwner
+from app.services import item_service
+from app.services.aio import item_service as async_item_service
+
+
+def seed(n_items: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        users = [User(name=f"User {i}", email=f"user{i}@example.com", hashed_password="x", role="user") for i in range(50)]
+        cats = [Category(name=f"Cat {i}") for i in range(20)]
+        db.add_all(users + cats)
+        db.flush()
+        for i in range(n_items):
+            db.add(Item(title=f"Item {i}", description="bench", owner=users[i % len(users)], categories=[cats[i % len(cats)]]))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_sync_app() -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get("/api/v1/items/", response_model=list[ItemReadWithOwner])
+    def list_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+        return item_service.list_items(db, skip=skip, limit=limit)
+
+    return bench_app
+
+
+def build_async_app() -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get("/api/v1/items/", response_model=list[ItemReadWithOwner])
+    async def list_items(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+        return await async_item_service.list_items(db, skip=skip, limit=limit)
+
+    return bench_app
+
+
+async def run_mode(name: str, bench_app: FastAPI) -> float:
+    transport = httpx.ASGITransport(app=bench_app)
+    sem = asyncio.Semaphore(args.concurrency)
+    max_skip = max(args.items - args.limit, 1)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with sem:
+                r = await client.get("/api/v1/items/", params={"skip": (i * args.limit) % max_skip, "limit": args.limit})
+                r.raise_for_status()
+
+        try:
+            # Calentamiento: abre conexiones del pool y compila las consultas
+            await asyncio.gather(*(one(i) for i in range(min(args.concurrency, args.requests))))
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.requests)))
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            # Con concurrencia > pool el modo sync puede agotar el pool mientras ocupa el threadpool
+            print(f"{name:>5}: failed ({type(e).__name__}: {e})")
+            return 0.0
+
+    rps = args.requests / elapsed
+    print(f"{name:>5}: {args.requests} requests in {elapsed:.2f}s -> {rps:.1f} req/s")
+    return rps
+
+
+async def main():
+    seed(args.items)
+    print(f"Dataset: {args.items} items, concurrency={args.concurrency}, limit={args.limit}")
+    sync_rps = await run_mode("sync", build_sync_app())
+    async_rps = await run_mode("async", build_async_app())
+    if sync_rps and async_rps:
+        print(f"async/sync: {async_rps / sync_rps:.2f}x")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark page latency vs depth: OFFSET (skip) vs keyset (cursor)")
+    parser.add_argument("--items", type=int, default=200000, help="Items to seed in the benchmark database")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 10, 100, 500, 1000, 1900], help="Page numbers to measure")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement (best time is reported)")
+    parser.add_argument("--database-url", default=None, help="Sync database URL (default: temporary SQLite file)")
+    return parser.parse_args()
+
+
+args = parse_args()
+# La URL debe fijarse antes de importar app.core.database (crea los engines al importarse)
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+
+from sqlalchemy import insert
+
+from app.core.database import Base, engine, async_engine, AsyncSessionLocal
+from app.models.user import User
+from app.models.item import Item
+from app.models.category import Category, item_category
+from app.models.profile import Profile  # noqa: F401 (registra el mapper de User.profile)
+from app.services.aio import item_service
+
+
+def seed(n_items: int, batch: int = 10000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "user"} for i in range(1, 101)])
+        conn.execute(insert(Category), [{"id": i, "name": f"Cat {i}"} for i in range(1, 21)])
+        for start in range(1, n_items + 1, batch):
+            ids = range(start, min(start + batch, n_items + 1))
+            conn.execute(insert(Item), [{"id": i, "title": f"Item {i}", "description": "bench", "owner_id": i % 100 + 1} for i in ids])
+            conn.execute(insert(item_category), [{"item_id": i, "category_id": i % 20 + 1} for i in ids])
+
+
+async def best_of(fn) -> float:
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+async def main():
+    seed(args.items)
+    print(f"Dataset: {args.items} items, limit={args.limit}")
+    print(f"{'page':>6}{'offset ms':>12}{'keyset ms':>12}")
+    async with AsyncSessionLocal() as db:
+        for page in args.depths:
+            depth = page * args.limit
+            if depth >= args.items:
+                continue
+            offset_ms = await best_of(lambda: item_service.list_items(db, skip=depth, limit=args.limit))
+            # El cursor de la página N codifica el último id de la página N-1 (ids consecutivos aquí)
+            keyset_ms = await best_of(lambda: item_service.list_items(db, limit=args.limit, after_id=depth))
+            print(f"{page:>6}{offset_ms:>12.2f}{keyset_ms:>12.2f}")
+            db.expunge_all()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark GET /categories/ and GET /items/{id} with and without the response cache")
+    parser.add_argument("--items", type=int, default=20000, help="Items to seed")
+    parser.add_argument("--categories", type=int, default=50, help="Categories to seed")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and mode")
+    parser.add_argument("--hot-items", type=int, default=200, help="Distinct item ids requested (hot set)")
+    parser.add_argument("--database-url", default=None, help="Sync database URL (default: temporary SQLite file)")
+    return parser.parse_args()
+
+
+args = parse_args()
+# La URL debe fijarse antes de importar app.core.database (crea los engines al importarse)
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+
+import httpx
+from sqlalchemy import insert
+
+from app.main import app
+from app.core.cache import MemoryCacheBackend, response_cache
+from app.core.database import Base, engine, async_engine
+from app.core.security import create_access_token
+from app.models.user import User
+from app.models.item import Item
+from app.models.category import Category, item_category
+
+
+def seed():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "user"} for i in range(1, 101)])
+        conn.execute(insert(Category), [{"id": i, "name": f"Cat {i}", "description": "bench"} for i in range(1, args.categories + 1)])
+        conn.execute(insert(Item), [{"id": i, "title": f"Item {i}", "description": "bench", "owner_id": i % 100 + 1} for i in range(1, args.items + 1)])
+        conn.execute(insert(item_category), [{"item_id": i, "category_id": i % args.categories + 1} for i in range(1, args.items + 1)])
+
+
+async def run(client: httpx.AsyncClient, paths: list[str]) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        r = await client.get(path)
+        r.raise_for_status()
+    return len(paths) / (time.perf_counter() - start)
+
+
+async def main():
+    seed()
+    rng = random.Random(42)
+    hot = rng.sample(range(1, args.items + 1), min(args.hot_items, args.items))
+    workloads = {
+        "GET /categories/?expand=items": ["/api/v1/categories/?expand=items"] * args.requests,
+        "GET /items/{id}": [f"/api/v1/items/{rng.choice(hot)}" for _ in range(args.requests)],
+    }
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1', 'role': 'admin'})}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", headers=headers) as client:
+        print(f"{'endpoint':<32}{'sin caché req/s':>18}{'con caché req/s':>18}")
+        for name, paths in workloads.items():
+            response_cache.backend = None
+            uncached = await run(client, paths)
+            response_cache.backend = MemoryCacheBackend(10000)
+            cached = await run(client, paths)
+            print(f"{name:<32}{uncached:>18,.0f}{cached:>18,.0f}")
+    print(response_cache.stats())
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
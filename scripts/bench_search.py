@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark item search: LIKE '%q%' scan vs full-text index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000], help="Dataset sizes (items)")
+    parser.add_argument("--queries", nargs="+", default=["solar", "cocina rapida", "zz9"], help="Search terms")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best time is reported)")
+    parser.add_argument("--database-url", default=None, help="Sync database URL (default: temporary SQLite file)")
+    return parser.parse_args()
+
+
+args = parse_args()
+# La URL debe fijarse antes de importar app.core.database (crea los engines al importarse)
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+
+from sqlalchemy import insert, or_, select
+
+from app.core.database import Base, engine, async_engine, AsyncSessionLocal
+from app.models.user import User
+from app.models.item import Item
+from app.models.profile import Profile  # noqa: F401 (registra el mapper de User.profile)
+from app.services import search_index
+from app.services.aio import item_service
+
+WORDS = ["solar", "cocina", "rapida", "libro", "novela", "laptop", "receta", "pasta", "energia", "historia", "jardin", "planta", "verde", "azul", "mesa"]
+
+
+def seed(n_items: int, batch: int = 20000):
+    rng = random.Random(42)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "user"} for i in range(1, 101)])
+        for start in range(1, n_items + 1, batch):
+            rows = [
+                {"id": i, "title": " ".join(rng.choices(WORDS, k=2)) + f" {i}", "description": " ".join(rng.choices(WORDS, k=8)), "owner_id": i % 100 + 1}
+                for i in range(start, min(start + batch, n_items + 1))
+            ]
+            conn.execute(insert(Item), rows)
+    with engine.begin() as conn:
+        search_index.rebuild(conn, "items")
+
+
+async def best_of(fn) -> float:
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+async def like_search(db, q: str):
+    # Filtro anterior: escaneo completo con LIKE
+    like = f"%{q}%"
+    stmt = select(Item).where(or_(Item.title.like(like), Item.description.like(like))).order_by(Item.id).limit(args.limit)
+    return (await db.scalars(stmt)).all()
+
+
+async def main():
+    for size in args.sizes:
+        start = time.perf_counter()
+        seed(size)
+        print(f"\nDataset: {size} items (seed + index {time.perf_counter() - start:.1f}s)")
+        print(f"{'query':<16}{'LIKE ms':>10}{'index ms':>10}")
+        async with AsyncSessionLocal() as db:
+            for q in args.queries:
+                like_ms = await best_of(lambda: like_search(db, q))
+                index_ms = await best_of(lambda: item_service.list_items(db, q=q, limit=args.limit))
+                print(f"{q:<16}{like_ms:>10.2f}{index_ms:>10.2f}")
+                db.expunge_all()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serialization cost per endpoint: FastAPI response_model path vs json_response (TypeAdapter.dump_json)")
+    parser.add_argument("--items", type=int, default=5000, help="Items to seed")
+    parser.add_argument("--rounds", type=int, default=200, help="Serializations per endpoint and path")
+    parser.add_argument("--page", type=int, default=100, help="Page size of the list endpoints")
+    return parser.parse_args()
+
+
+args = parse_args()
+# La URL debe fijarse antes de importar app.core.database (crea los engines al importarse)
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+import httpx
+from fastapi.routing import APIRoute, serialize_response
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert
+from starlette.routing import Match
+
+from app.main import app
+from app.api.v1.endpoints import categories, items, profiles, users
+from app.core import cache
+from app.core.database import Base, engine, async_engine
+from app.core.security import create_access_token
+from app.models.user import User
+from app.models.item import Item
+from app.models.category import Category, item_category
+from app.models.profile import Profile
+
+try:
+    import orjson
+except ImportError:  # opcional: solo para comparar
+    orjson = None
+
+ENDPOINTS = [
+    "/api/v1/items/?limit={page}",
+    "/api/v1/items/1",
+    "/api/v1/users/?limit={page}&expand=items,profile",
+    "/api/v1/users/1",
+    "/api/v1/categories/?limit={page}&expand=items",
+    "/api/v1/categories/1",
+    "/api/v1/profiles/?limit={page}",
+]
+
+
+def seed():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "user"} for i in range(1, 201)])
+        conn.execute(insert(Profile), [{"user_id": i, "bio": f"Bio del usuario {i}", "phone": "600000000"} for i in range(1, 201)])
+        conn.execute(insert(Category), [{"id": i, "name": f"Cat {i}", "description": "bench"} for i in range(1, 201)])
+        conn.execute(insert(Item), [{"id": i, "title": f"Item {i}", "description": "Descripción de prueba " * 4, "owner_id": i % 200 + 1} for i in range(1, args.items + 1)])
+        conn.execute(insert(item_category), [{"item_id": i, "category_id": (i + k) % 200 + 1} for i in range(1, args.items + 1) for k in range(3)])
+
+
+async def capture() -> dict[str, tuple]:
+    """Run each endpoint once and keep what it passed to ``json_response`` (model type, data, exclude_unset)."""
+    captured: dict[str, tuple] = {}
+    current = {}
+
+    def recorder(model_type, data, exclude_unset=False):
+        captured[current["path"]] = (model_type, data, exclude_unset)
+        return cache.json_response(model_type, data, exclude_unset)
+
+    for module in (categories, items, profiles, users):
+        module.json_response = recorder
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1', 'role': 'admin'})}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", headers=headers) as client:
+        for template in ENDPOINTS:
+            current["path"] = template.format(page=args.page)
+            (await client.get(current["path"])).raise_for_status()
+    return captured
+
+
+def route_for(path: str) -> APIRoute:
+    scope = {"type": "http", "method": "GET", "path": path.split("?")[0]}
+    return next(r for r in app.routes if isinstance(r, APIRoute) and r.matches(scope)[0] == Match.FULL)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        fn()
+    return (time.perf_counter() - start) / args.rounds * 1000
+
+
+async def main():
+    seed()
+    captured = await capture()
+    header = f"{'endpoint':<48}{'KB':>7}{'response_model ms':>19}{'json_response ms':>18}{'x':>6}"
+    print(header + (f"{'orjson ms':>11}" if orjson else ""))
+    for path, (model_type, data, exclude_unset) in captured.items():
+        route = route_for(path)
+
+        async def legacy() -> bytes:
+            # Ruta de FastAPI con response_model: validación, jsonable_encoder y json.dumps
+            content = await serialize_response(field=route.response_field, response_content=data, exclude_unset=exclude_unset)
+            return JSONResponse(content).body
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await legacy()
+        legacy_ms = (time.perf_counter() - start) / args.rounds * 1000
+        fast_ms = timed(lambda: cache.json_response(model_type, data, exclude_unset))
+        size = len(cache.json_response(model_type, data, exclude_unset).body) / 1024
+        line = f"{path:<48}{size:>7.1f}{legacy_ms:>19.2f}{fast_ms:>18.2f}{legacy_ms / fast_ms:>6.1f}"
+        if orjson:
+            adapter = cache._adapter(model_type)
+            line += f"{timed(lambda: orjson.dumps(adapter.dump_python(adapter.validate_python(data, from_attributes=True), mode='json', exclude_unset=exclude_unset))):>11.2f}"
+        print(line)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
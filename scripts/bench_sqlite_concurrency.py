@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Variables de entorno de cada perfil (cada uno corre en un proceso: los engines se crean al importar app)
+PROFILES = {
+    "legacy": {"SQLITE_PRAGMAS": "false", "SQLITE_SINGLE_WRITER": "false"},
+    "wal": {"SQLITE_PRAGMAS": "true", "SQLITE_SINGLE_WRITER": "false"},
+    "wal+writer": {"SQLITE_PRAGMAS": "true", "SQLITE_SINGLE_WRITER": "true"},
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mixed read/write load against a SQLite file: legacy settings vs WAL pragmas vs WAL plus the single writer")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per profile")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Fraction of requests that write (POST/PUT /items)")
+    parser.add_argument("--items", type=int, default=5000, help="Items to seed")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=None, help="Run only this profile (used internally by the parent process)")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def run_profiles() -> None:
+    """Run each profile in a child process and print the comparison table."""
+    print(f"{args.clients} clientes, {args.duration:.0f}s por perfil, {args.write_ratio:.0%} escrituras")
+    print(f"{'perfil':<12}{'req/s':>9}{'lect p50':>10}{'lect p95':>10}{'escr p50':>10}{'escr p95':>10}{'errores':>9}")
+    for name, overrides in PROFILES.items():
+        cmd = [sys.executable, __file__, "--profile", name, "--clients", str(args.clients), "--duration", str(args.duration), "--write-ratio", str(args.write_ratio), "--items", str(args.items)]
+        out = subprocess.run(cmd, env={**os.environ, **overrides}, capture_output=True, text=True)
+        if out.returncode != 0:
+            print(f"{name:<12} falló:\n{out.stderr[-2000:]}")
+            continue
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{name:<12}{r['rps']:>9,.0f}{r['read_p50']:>10.1f}{r['read_p95']:>10.1f}{r['write_p50']:>10.1f}{r['write_p95']:>10.1f}{r['errors']:>9}")
+    print("Latencias en ms; errores = respuestas 5xx (p. ej. 'database is locked')")
+
+
+def run_profile() -> None:
+    # Base de datos en fichero (WAL no aplica en memoria) y sin caché de respuestas: cada GET llega a SQLite
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+    os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+    import httpx
+    from sqlalchemy import insert
+
+    from app.main import app
+    from app.core.database import Base, engine, async_engine, pool_metrics
+    from app.core.security import create_access_token
+    from app.models.user import User
+    from app.models.item import Item
+    from app.models.category import Category, item_category
+    from app.models.profile import Profile  # noqa: F401 (registra el mapper de User.profile)
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "user"} for i in range(1, 101)])
+        conn.execute(insert(Category), [{"id": i, "name": f"Cat {i}", "description": "bench"} for i in range(1, 21)])
+        conn.execute(insert(Item), [{"id": i, "title": f"Item {i}", "description": "bench", "owner_id": i % 100 + 1} for i in range(1, args.items + 1)])
+        conn.execute(insert(item_category), [{"item_id": i, "category_id": i % 20 + 1} for i in range(1, args.items + 1)])
+
+    latencies: dict[str, list[float]] = {"read": [], "write": []}
+    errors = 0
+
+    async def client_loop(client: httpx.AsyncClient, seed: int, deadline: float) -> None:
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            item_id = rng.randint(1, args.items)
+            kind = "write" if rng.random() < args.write_ratio else "read"
+            start = time.perf_counter()
+            try:
+                if kind == "read" and rng.random() < 0.5:
+                    r = await client.get(f"/api/v1/items/{item_id}")
+                elif kind == "read":
+                    r = await client.get("/api/v1/items/", params={"after_id": item_id, "limit": 20})
+                elif rng.random() < 0.5:
+                    r = await client.post("/api/v1/items/", json={"title": f"Nuevo {seed}", "description": "bench", "owner_id": rng.randint(1, 100), "category_ids": [rng.randint(1, 20)]})
+                else:
+                    r = await client.put(f"/api/v1/items/{item_id}", json={"title": f"Editado {seed}"})
+                failed = r.status_code >= 500
+            except Exception:
+                failed = True
+            latencies[kind].append(time.perf_counter() - start)
+            errors += failed
+
+    async def main() -> dict:
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': '1', 'role': 'admin'})}"}
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=60) as client:
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(*(client_loop(client, seed, deadline) for seed in range(args.clients)))
+            elapsed = time.perf_counter() - start
+        writer = pool_metrics()["writer"]
+        await async_engine.dispose()
+        total = len(latencies["read"]) + len(latencies["write"])
+        return {
+            "rps": total / elapsed,
+            "read_p50": percentile(latencies["read"], 0.5),
+            "read_p95": percentile(latencies["read"], 0.95),
+            "write_p50": percentile(latencies["write"], 0.5),
+            "write_p95": percentile(latencies["write"], 0.95),
+            "errors": errors,
+            "writer_max_waiting": writer["max_waiting"],
+        }
+
+    print(json.dumps(asyncio.run(main())))
+
+
+if __name__ == "__main__":
+    if args.profile:
+        run_profile()
+    else:
+        run_profiles()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the OpenAPI document once and write it (plus .gz/.br variants) for OPENAPI_FILE")
+    parser.add_argument("--output", default=os.environ.get("OPENAPI_FILE") or str(ROOT_DIR / "openapi.json"), help="Target file (default: OPENAPI_FILE or ./openapi.json)")
+    parser.add_argument("--check", action="store_true", help="Do not write; exit 1 if the file differs from the current routes")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    # Generar el esquema no toca la base de datos, pero importar la app crea los engines
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'openapi.db'}")
+    # Generado siempre con todos los routers importados al arrancar (mismo orden de rutas que sin FAST_STARTUP)
+    os.environ["FAST_STARTUP"] = "false"
+    os.environ["OPENAPI_FILE"] = ""
+
+    from app.main import app
+    from app.core import openapi_document
+
+    document = openapi_document.build(app)
+    output = Path(args.output)
+    if args.check:
+        current = openapi_document.read(output).digest if output.is_file() else None
+        if current != document.digest:
+            print(f"{output} no coincide con las rutas actuales (python scripts/build_openapi.py)")
+            return 1
+        print(f"{output} al día ({document.etag(None)})")
+        return 0
+    openapi_document.write(document, output)
+    sizes = ", ".join(f"{encoding} {len(body)}" for encoding, body in document.variants.items())
+    print(f"Esquema OpenAPI en {output}: {len(document.body)} bytes ({sizes}), ETag {document.etag(None)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
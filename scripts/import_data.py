@@ -0,0 +1,223 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Column, Integer, MetaData, String, Table, select, insert, update
+from sqlalchemy.engine import Connection
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core.config import settings
+from app.core.database import Base, engine
+from app.core.passwords import hash_password
+from app.models.user import User
+from app.models.item import Item
+from app.models.category import Category, item_category
+from app.models.profile import Profile  # noqa: F401 (registra el mapper de User.profile)
+from app.schemas.user import UserCreate
+from app.schemas.category import CategoryCreate
+from app.schemas.item import ItemCreate
+from app.services import bulk, item_counts, search_index, versions
+
+SCHEMAS: dict[str, type[BaseModel]] = {"users": UserCreate, "categories": CategoryCreate, "items": ItemCreate}
+HashMany = Callable[[list[str]], list[str]]
+
+# Progreso por fichero importado; se actualiza en la misma transacción que cada lote,
+# así --resume continúa exactamente tras el último lote confirmado
+checkpoints = Table(
+    "import_checkpoints",
+    MetaData(),
+    Column("source", String(500), primary_key=True),
+    Column("rows_done", Integer, nullable=False),
+)
+
+
+def read_rows(path: Path, fmt: str) -> Iterator[dict | str]:
+    """Yield one dict per record (or the error text when the record cannot be parsed)."""
+    with path.open(encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield _from_csv(row)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield f"JSON inválido: {e}"
+
+
+def _from_csv(row: dict) -> dict | str:
+    # Celdas vacías = campo ausente (aplican los valores por defecto del esquema)
+    data = {k: v for k, v in row.items() if v not in ("", None)}
+    if "category_ids" in data:
+        try:
+            data["category_ids"] = [int(x) for x in re.split(r"[;,\s]+", data["category_ids"].strip("[] ")) if x]
+        except ValueError:
+            # Se rechaza la fila, no la importación
+            return f"category_ids inválido: {data['category_ids']!r}"
+    return data
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def validate(schema: type[BaseModel], chunk: list, first_row: int) -> tuple[list[tuple[int, BaseModel]], list[tuple[int, str]]]:
+    valid, errors = [], []
+    for row_number, raw in enumerate(chunk, start=first_row):
+        if isinstance(raw, str):
+            errors.append((row_number, raw))
+            continue
+        try:
+            valid.append((row_number, schema.model_validate(raw)))
+        except ValidationError as e:
+            errors.append((row_number, str(e).replace("\n", " ")))
+    return valid, errors
+
+
+def _unique(conn: Connection, column, valid: list[tuple[int, BaseModel]], field: str, errors: list[tuple[int, str]]) -> list[tuple[int, BaseModel]]:
+    """Drop rows whose ``field`` already exists in the table or earlier in the chunk."""
+    values = [getattr(p, field) for _, p in valid]
+    seen = set(conn.execute(select(column).where(column.in_(set(values)))).scalars().all())
+    kept = []
+    for (row_number, p), value in zip(valid, values):
+        if value in seen:
+            errors.append((row_number, f"{field} ya existe: {value}"))
+        else:
+            seen.add(value)
+            kept.append((row_number, p))
+    return kept
+
+
+def write_users(conn: Connection, valid, errors, hash_many: HashMany) -> int:
+    valid = _unique(conn, User.email, valid, "email", errors)
+    if not valid:
+        return 0
+    hashes = hash_many([p.password for _, p in valid])
+    rows = [{"name": p.name, "email": p.email, "role": p.role, "hashed_password": h} for (_, p), h in zip(valid, hashes)]
+    ids = bulk.insert_returning_ids(conn, User, rows)
+    search_index.upsert(conn, "users", [{"id": i, **r} for i, r in zip(ids, rows)])
+    return len(ids)
+
+
+def write_categories(conn: Connection, valid, errors, hash_many: HashMany) -> int:
+    valid = _unique(conn, Category.name, valid, "name", errors)
+    if not valid:
+        return 0
+    rows = [{"name": p.name, "description": p.description} for _, p in valid]
+    ids = bulk.insert_returning_ids(conn, Category, rows)
+    search_index.upsert(conn, "categories", [{"id": i, **r} for i, r in zip(ids, rows)])
+    return len(ids)
+
+
+def write_items(conn: Connection, valid, errors, hash_many: HashMany) -> int:
+    owner_ids = {p.owner_id for _, p in valid}
+    category_ids = {cid for _, p in valid for cid in (p.category_ids or [])}
+    owners = set(conn.execute(select(User.id).where(User.id.in_(owner_ids))).scalars().all()) if owner_ids else set()
+    categories = set(conn.execute(select(Category.id).where(Category.id.in_(category_ids))).scalars().all()) if category_ids else set()
+    kept = []
+    for row_number, p in valid:
+        missing = [cid for cid in (p.category_ids or []) if cid not in categories]
+        if p.owner_id not in owners:
+            errors.append((row_number, "Owner no existe"))
+        elif missing:
+            errors.append((row_number, f"Categorías no existen: {missing}"))
+        else:
+            kept.append(p)
+    if not kept:
+        return 0
+    rows = [{"title": p.title, "description": p.description, "owner_id": p.owner_id} for p in kept]
+    ids = bulk.insert_returning_ids(conn, Item, rows)
+    links = [{"item_id": i, "category_id": cid} for i, p in zip(ids, kept) for cid in dict.fromkeys(p.category_ids or [])]
+    if links:
+        conn.execute(insert(item_category), links)
+    item_counts.adjust(conn, Counter(p.owner_id for p in kept), Counter(link["category_id"] for link in links))
+    search_index.upsert(conn, "items", [{"id": i, **r} for i, r in zip(ids, rows)])
+    return len(ids)
+
+
+WRITERS = {"users": write_users, "categories": write_categories, "items": write_items}
+
+
+def load_checkpoint(source: str) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(checkpoints.c.rows_done).where(checkpoints.c.source == source)).scalar() or 0
+
+
+def save_checkpoint(conn: Connection, source: str, rows_done: int) -> None:
+    if conn.execute(update(checkpoints).where(checkpoints.c.source == source).values(rows_done=rows_done)).rowcount == 0:
+        conn.execute(insert(checkpoints).values(source=source, rows_done=rows_done))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import users, categories or items from NDJSON/CSV in chunked transactions")
+    parser.add_argument("entity", choices=sorted(SCHEMAS), help="Entity to import")
+    parser.add_argument("path", type=Path, help="Input file (.ndjson/.jsonl or .csv)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None, help="Input format (default: from the file extension)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for bcrypt (users only)")
+    parser.add_argument("--resume", action="store_true", help="Skip the rows already committed by a previous run of the same file")
+    parser.add_argument("--max-errors", type=int, default=20, help="Rejected rows to print (all are counted)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    source = f"{args.entity}:{args.path.resolve()}"
+    Base.metadata.create_all(bind=engine)
+    checkpoints.create(bind=engine, checkfirst=True)
+    skip = load_checkpoint(source) if args.resume else 0
+    if skip:
+        print(f"Reanudando tras {skip} filas ya confirmadas")
+
+    schema, writer = SCHEMAS[args.entity], WRITERS[args.entity]
+    rows_done, inserted, rejected = skip, 0, 0
+    start = time.perf_counter()
+    # spawn: los procesos no heredan conexiones de DB del padre
+    workers = max(args.workers, 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+
+        def hash_many(passwords: list[str]) -> list[str]:
+            # bcrypt en paralelo: es el cuello de botella de la importación de usuarios
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(pool.map(hash_password, passwords, repeat(settings.bcrypt_rounds), chunksize=chunksize))
+
+        for chunk in chunked(islice(read_rows(args.path, fmt), skip, None), args.chunk_size):
+            valid, errors = validate(schema, chunk, first_row=rows_done + 1)
+            # Un lote = una transacción (filas + checkpoint): un fallo no deja lotes a medias
+            with engine.begin() as conn:
+                written = writer(conn, valid, errors, hash_many) if valid else 0
+                if written:
+                    # Los INSERT masivos no pasan por el flush del ORM: invalida los ETag de listados
+                    versions.bump(conn, args.entity)
+                inserted += written
+                rows_done += len(chunk)
+                save_checkpoint(conn, source, rows_done)
+            for row_number, detail in sorted(errors):
+                if rejected < args.max_errors:
+                    print(f"  fila {row_number}: {detail}", file=sys.stderr)
+                rejected += 1
+            elapsed = time.perf_counter() - start
+            print(f"{rows_done} filas leídas, {inserted} insertadas, {rejected} rechazadas ({(rows_done - skip) / elapsed:,.0f} filas/s)")
+
+    print(f"Importación completada en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
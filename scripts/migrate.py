@@ -0,0 +1,42 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core import migrations
+from app.core.database import engine
+from app.models.profile import Profile  # noqa: F401 (registra el mapper de User.profile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the pending schema migrations of app/core/migrations.py (idempotent)")
+    parser.add_argument("--status", action="store_true", help="Only list applied and pending migrations")
+    args = parser.parse_args()
+
+    if args.status:
+        with engine.begin() as conn:
+            done = migrations.applied(conn)
+        for m in migrations.MIGRATIONS:
+            state = f"aplicada {done[m.version]:%Y-%m-%d %H:%M}" if m.version in done else "pendiente"
+            print(f" - {m.version:04d} {m.name}: {state}")
+        missing = migrations.missing_columns(engine)
+        if missing:
+            print(f"Columnas de los modelos que faltan en la base: {', '.join(missing)}")
+        return
+
+    applied = migrations.upgrade(engine)
+    for m in applied:
+        print(f" - {m.version:04d} {m.name}: aplicada")
+    missing = migrations.missing_columns(engine)
+    if missing:
+        print(f"Faltan columnas tras migrar: {', '.join(missing)}")
+        sys.exit(1)
+    print(f"Esquema al día ({len(applied)} migraciones aplicadas)")
+
+
+if __name__ == "__main__":
+    main()
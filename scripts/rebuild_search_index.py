@@ -0,0 +1,33 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core.database import engine
+from app.services import search_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the full-text search index (FTS5 / tsvector) from the source tables")
+    parser.add_argument("--table", choices=sorted(search_index.INDEXED), action="append", help="Table to rebuild (repeatable); default: all")
+    args = parser.parse_args()
+
+    if not search_index.supported(engine.dialect.name):
+        print(f"El motor '{engine.dialect.name}' no tiene índice de búsqueda; se usa LIKE")
+        return
+
+    for table in args.table or list(search_index.INDEXED):
+        start = time.perf_counter()
+        # Una transacción por tabla: el índice nunca queda a medias
+        with engine.begin() as conn:
+            count = search_index.rebuild(conn, table)
+        print(f" - {table}: {count} filas indexadas en {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+# Ensure project root is on sys.path to import 'app.*'
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core.database import engine
+from app.services import item_counts
+
+
+def add_missing_columns() -> list[str]:
+    """Add ``item_count`` to tables created before the column existed; returns the altered tables."""
+    added = []
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in item_counts.COUNTED:
+            if table in inspector.get_table_names() and not any(c["name"] == "item_count" for c in inspector.get_columns(table)):
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0"))
+                added.append(table)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check (and optionally fix) the denormalized item_count of users and categories")
+    parser.add_argument("--fix", action="store_true", help="Rewrite the counters that differ from the real counts")
+    parser.add_argument("--show", type=int, default=20, help="Mismatched rows to print per table")
+    args = parser.parse_args()
+
+    added = add_missing_columns()
+    for table in added:
+        print(f" - {table}: columna item_count añadida")
+    start = time.perf_counter()
+    # Una transacción: comprobación y corrección ven el mismo estado
+    with engine.begin() as conn:
+        drift = item_counts.reconcile(conn, fix=args.fix or bool(added))
+    total = 0
+    for table, rows in drift.items():
+        total += len(rows)
+        print(f" - {table}: {len(rows)} contadores desfasados")
+        for row in rows[: args.show]:
+            print(f"     id={row.id}: guardado {row.item_count}, real {row.actual}")
+    print(f"Comprobación en {time.perf_counter() - start:.2f}s")
+    if total and (args.fix or added):
+        print("Contadores corregidos")
+    elif total:
+        print("Ejecuta con --fix para corregirlos")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
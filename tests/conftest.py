@@ -0,0 +1,62 @@
+"""Entorno común de las pruebas: base SQLite temporal y cliente HTTP sobre la app (sin servidor).
+
+Las variables se fijan antes de importar ``app``: ``app.core.database`` crea los
+engines al importarse.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'tests.db'}"
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core import migrations  # noqa: E402
+from app.core.database import Base, async_engine, engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+
+def reset_schema() -> None:
+    """Empty database with the current schema (tables, search index and migrations)."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+
+
+def call_api(requests: Callable[[httpx.AsyncClient], Awaitable[Any]]) -> Any:
+    """Run ``requests(client)`` against the app as an admin; returns its result."""
+
+    async def run():
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': '1', 'role': 'admin'})}"}
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", headers=headers) as client:
+                return await requests(client)
+        finally:
+            # Las conexiones de aiosqlite quedan ligadas al loop de asyncio.run
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(scope="module")
+def fresh_db():
+    """Reset the schema once per test module; yields the sync engine to seed it."""
+    reset_schema()
+    yield engine
+
+
+@pytest.fixture(scope="module")
+def api():
+    return call_api
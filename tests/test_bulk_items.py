@@ -0,0 +1,63 @@
+"""Bulk item endpoints: per-row errors and the ids they report."""
+import pytest
+from sqlalchemy import insert
+
+from app.models.category import Category
+from app.models.item import Item
+from app.models.user import User
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"U{i}", "email": f"u{i}@example.com", "hashed_password": "x", "role": "admin"} for i in (1, 2)])
+        conn.execute(insert(Category), [{"id": i, "name": f"C{i}"} for i in (1, 2)])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": 1} for i in range(1, 6)])
+
+
+def test_create_reports_failed_rows_and_applies_the_rest(seeded, api):
+    async def run(client):
+        body = {"items": [{"title": "A", "owner_id": 1}, {"title": "B", "owner_id": 99}, {"title": "C", "owner_id": 2, "category_ids": [1]}]}
+        response = await client.post("/api/v1/items/bulk", json=body)
+        created = [(await client.get(f"/api/v1/items/{item_id}")).json() for item_id in response.json()["ids"]]
+        return response, created
+
+    response, created = api(run)
+    assert response.status_code == 200
+    assert response.json()["errors"] == [{"index": 1, "id": None, "detail": "Owner no existe"}]
+    assert [(item["title"], item["owner"]["id"]) for item in created] == [("A", 1), ("C", 2)]
+    assert [c["id"] for c in created[1]["categories"]] == [1]
+
+
+def test_update_merges_a_repeated_id_and_reports_it_once(seeded, api):
+    async def run(client):
+        body = {"items": [
+            {"id": 1, "title": "Primero", "description": "d"},
+            {"id": 2, "category_ids": [99]},
+            {"id": 1, "title": "Último"},
+            {"id": 404, "title": "x"},
+        ]}
+        response = await client.patch("/api/v1/items/bulk", json=body)
+        return response, (await client.get("/api/v1/items/1")).json()
+
+    response, item = api(run)
+    assert response.status_code == 200
+    assert response.json() == {
+        "ids": [1],
+        "errors": [
+            {"index": 1, "id": 2, "detail": "Categorías no existen: [99]"},
+            {"index": 3, "id": 404, "detail": "Ítem no encontrado"},
+        ],
+    }
+    assert (item["title"], item["description"]) == ("Último", "d")
+
+
+def test_delete_reports_missing_ids_and_each_deleted_id_once(seeded, api):
+    async def run(client):
+        response = await client.request("DELETE", "/api/v1/items/bulk", json={"ids": [4, 404, 4, 5]})
+        return response, [(await client.get(f"/api/v1/items/{i}")).status_code for i in (4, 5)]
+
+    response, statuses = api(run)
+    assert response.status_code == 200
+    assert response.json() == {"ids": [4, 5], "errors": [{"index": 1, "id": 404, "detail": "Ítem no encontrado"}]}
+    assert statuses == [404, 404]
@@ -0,0 +1,111 @@
+"""Response compression: Accept-Encoding negotiation, Vary, streaming and cached compressed variants."""
+import gzip
+
+import pytest
+from sqlalchemy import insert
+
+from app.core import compression
+from app.core.cache import MemoryCacheBackend, response_cache
+from app.core.config import settings
+from app.models.item import Item
+from app.models.user import User
+
+LIST = "/api/v1/items/?limit=100"
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "name": "U1", "email": "u1@example.com", "hashed_password": "x", "role": "admin"}])
+        conn.execute(insert(Item), [{"id": i, "title": f"Item {i}", "description": "descripción " * 5, "owner_id": 1} for i in range(1, 41)])
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    """Resultados deterministas con o sin el paquete brotli instalado."""
+    monkeypatch.setattr(settings, "compression_encodings", ["gzip"])
+
+
+def get(api, path: str, accept_encoding: str):
+    async def run(client):
+        return await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    return api(run)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("deflate, gzip;q=0.1", "gzip"),
+        ("gzip;q=0, identity", None),
+        ("*", "gzip"),
+        ("*;q=0", None),
+        ("*, gzip;q=0", None),
+        ("identity", None),
+        ("", None),
+        ("gzip;q=abc", None),
+    ],
+)
+def test_negotiate_honours_quality_values_and_wildcard(gzip_only, header, expected):
+    assert compression.negotiate(header) == expected
+
+
+def test_negotiate_prefers_brotli_when_installed(monkeypatch):
+    pytest.importorskip("brotli")
+    monkeypatch.setattr(settings, "compression_encodings", ["br", "gzip"])
+    assert compression.negotiate("gzip, br") == "br"
+    assert compression.negotiate("gzip, br;q=0") == "gzip"
+
+
+def test_brotli_is_not_offered_without_the_package(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    monkeypatch.setattr(settings, "compression_encodings", ["br", "gzip"])
+    assert compression.negotiate("br") is None
+    assert compression.negotiate("br, gzip") == "gzip"
+
+
+def test_large_json_is_gzipped_with_vary(seeded, api, gzip_only):
+    plain, compressed = get(api, LIST, "identity"), get(api, LIST, "gzip")
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in plain.headers["vary"] and "Accept-Encoding" in compressed.headers["vary"]
+    # httpx descomprime: el cuerpo es el mismo y la longitud declarada es la comprimida
+    assert compressed.json() == plain.json() and len(compressed.json()) == 40
+    assert int(compressed.headers["content-length"]) < len(plain.content)
+
+
+def test_small_response_is_not_compressed(seeded, api, gzip_only):
+    response = get(api, "/api/v1/items/1", "gzip")
+    assert len(response.content) < settings.compression_minimum_size
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_streamed_export_is_compressed_chunk_by_chunk(seeded, api, gzip_only):
+    response = get(api, "/api/v1/items/export?format=ndjson", "gzip")
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip" and "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 40
+
+
+def test_cached_compressed_variant_is_served_as_a_hit(seeded, api, gzip_only, monkeypatch):
+    monkeypatch.setattr(response_cache, "backend", MemoryCacheBackend(100))
+    plain = get(api, LIST, "identity")
+
+    async def run(client):
+        headers = {"Accept-Encoding": "gzip"}
+        # stream() conserva el cuerpo tal como llega (sin descomprimir)
+        async with client.stream("GET", LIST, headers=headers) as first:
+            first_raw = b"".join([chunk async for chunk in first.aiter_raw()])
+        async with client.stream("GET", LIST, headers=headers) as second:
+            second_raw = b"".join([chunk async for chunk in second.aiter_raw()])
+        return first, first_raw, second, second_raw
+
+    first, first_raw, second, second_raw = api(run)
+    assert plain.headers["x-cache"] == "MISS"
+    # La primera petición gzip comprime la entrada ya cacheada; la segunda sirve esa variante
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("HIT", "HIT")
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+    assert second_raw == first_raw and gzip.decompress(second_raw) == plain.content
@@ -0,0 +1,87 @@
+"""Weak ETags and conditional GET (``If-None-Match`` -> 304) on details and lists."""
+import pytest
+from sqlalchemy import insert
+
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.models.user import User
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"U{i}", "email": f"u{i}@example.com", "hashed_password": "x", "role": "admin"} for i in (1, 2)])
+        conn.execute(insert(Category), [{"id": i, "name": f"C{i}"} for i in (1, 2)])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": 1} for i in (1, 2, 3)])
+        conn.execute(insert(item_category), [{"item_id": 1, "category_id": 1}])
+
+
+def get(api, path: str, etag: str | None = None):
+    async def run(client):
+        return await client.get(path, headers={"If-None-Match": etag} if etag else {})
+
+    return api(run)
+
+
+def write(api, method: str, path: str, body=None):
+    async def run(client):
+        response = await client.request(method, path, json=body)
+        assert response.status_code in (200, 204), response.text
+        return response
+
+    return api(run)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/items/1", "/api/v1/items/?limit=10", "/api/v1/categories/1", "/api/v1/users/?limit=10"])
+def test_matching_if_none_match_is_304_without_body(seeded, api, path):
+    first = get(api, path)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+    again = get(api, path, etag)
+    assert again.status_code == 304 and again.content == b"" and again.headers["etag"] == etag
+
+
+def test_if_none_match_uses_weak_comparison_and_lists(seeded, api):
+    etag = get(api, "/api/v1/items/2").headers["etag"]
+    assert get(api, "/api/v1/items/2", etag.removeprefix("W/")).status_code == 304
+    assert get(api, "/api/v1/items/2", f'"otro", {etag}').status_code == 304
+    assert get(api, "/api/v1/items/2", "*").status_code == 304
+    assert get(api, "/api/v1/items/2", 'W/"otro"').status_code == 200
+
+
+def test_patch_changes_the_etag_and_the_body(seeded, api):
+    old = get(api, "/api/v1/items/3").headers["etag"]
+    write(api, "PATCH", "/api/v1/items/3", {"title": "Nuevo"})
+    response = get(api, "/api/v1/items/3", old)
+    assert response.status_code == 200
+    assert response.headers["etag"] != old
+    assert response.json()["title"] == "Nuevo"
+
+
+def test_embedded_owner_change_changes_the_item_etag(seeded, api):
+    old = get(api, "/api/v1/items/1").headers["etag"]
+    write(api, "PATCH", "/api/v1/users/1", {"name": "Renombrado"})
+    response = get(api, "/api/v1/items/1", old)
+    assert response.status_code == 200
+    assert response.json()["owner"]["name"] == "Renombrado"
+
+
+def test_list_etag_changes_after_a_create(seeded, api):
+    old = get(api, "/api/v1/items/?limit=10").headers["etag"]
+    created = write(api, "POST", "/api/v1/items/", {"title": "Otro", "owner_id": 2}).json()
+    response = get(api, "/api/v1/items/?limit=10", old)
+    assert response.status_code == 200
+    assert created["id"] in [row["id"] for row in response.json()]
+
+
+def test_category_etag_changes_when_an_item_joins_it(seeded, api):
+    old = get(api, "/api/v1/categories/2").headers["etag"]
+    write(api, "PUT", "/api/v1/items/2", {"category_ids": [2]})
+    response = get(api, "/api/v1/categories/2", old)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [2]
+
+
+def test_missing_resource_is_404_without_etag(seeded, api):
+    response = get(api, "/api/v1/items/999", "*")
+    assert response.status_code == 404 and "etag" not in response.headers
@@ -0,0 +1,100 @@
+"""Peak RSS growth while exporting 1M items through ``GET /api/v1/items/export``.
+
+Se siembra con una CTE recursiva (sin filas en el proceso) y la exportación se
+conduce por ASGI directamente, sin un cliente que acumule el cuerpo. Marcada
+``slow``: siembra y exporta un millón de filas.
+"""
+import asyncio
+import resource
+import sys
+
+import pytest
+from sqlalchemy import event, text
+
+from app.main import app
+from app.core.database import async_engine
+from app.core.security import create_access_token
+
+ITEMS = 1_000_000
+MAX_RSS_GROWTH_MB = 32
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss: KB en Linux, bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def no_mmap(dbapi_connection, record):
+    # Las páginas del fichero mapeadas por SQLite (SQLITE_MMAP_SIZE) cuentan en el RSS sin ser memoria de la exportación
+    dbapi_connection.execute("PRAGMA mmap_size = 0")
+
+
+async def export(query: str) -> tuple[int, int]:
+    """Drive the ASGI app directly; returns ``(status, lines)``."""
+    token = create_access_token({"sub": "1", "role": "admin"})
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/v1/items/export", "raw_path": b"/api/v1/items/export", "root_path": "",
+        "query_string": query.encode(), "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+    }
+    state = {"status": 0, "lines": 0, "requested": False}
+    done = asyncio.Event()
+
+    async def receive():
+        if not state["requested"]:
+            state["requested"] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            state["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            state["lines"] += message.get("body", b"").count(b"\n")
+            if not message.get("more_body"):
+                done.set()
+
+    await app(scope, receive, send)
+    return state["status"], state["lines"]
+
+
+@pytest.fixture(scope="module")
+def items(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, name, email, hashed_password, role) VALUES (1, 'Export', 'export@example.com', 'x', 'user')"))
+        conn.execute(
+            text(
+                "INSERT INTO items (title, description, owner_id) "
+                "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :n) "
+                "SELECT 'Item ' || n, 'Descripción de exportación ' || n, 1 FROM seq"
+            ),
+            {"n": ITEMS},
+        )
+    return ITEMS
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_memory_is_bounded(items, fmt):
+    async def run():
+        try:
+            # Calentamiento: imports perezosos, pool y sentencias compiladas no cuentan como crecimiento
+            await export(f"format={fmt}&owner_id=0")
+            baseline = peak_rss_mb()
+            status, lines = await export(f"format={fmt}")
+            return status, lines, peak_rss_mb() - baseline
+        finally:
+            await async_engine.dispose()
+
+    event.listen(async_engine.sync_engine, "connect", no_mmap)
+    try:
+        status, lines, growth = asyncio.run(run())
+    finally:
+        event.remove(async_engine.sync_engine, "connect", no_mmap)
+
+    assert status == 200
+    assert lines == items + (1 if fmt == "csv" else 0)
+    assert growth <= MAX_RSS_GROWTH_MB, f"el RSS pico creció {growth:.1f} MB (máximo {MAX_RSS_GROWTH_MB} MB)"
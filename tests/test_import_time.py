@@ -0,0 +1,57 @@
+"""Import time of ``app.main`` with ``FAST_STARTUP`` (``python -X importtime``).
+
+Cada medida lanza intérpretes nuevos, por eso está marcada ``slow``.
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BUDGET_MS = 1500.0
+RUNS = 3
+# Módulos que con FAST_STARTUP no deben importarse al arrancar
+DEFERRED = ["scalar_fastapi", "app.api.v1.endpoints.admin"]
+# Línea de -X importtime: "import time: <propio µs> | <acumulado µs> | <módulo>"
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def import_times(env: dict) -> dict[str, int]:
+    """Cumulative microseconds per imported module in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, f"Error importando app.main:\n{result.stderr[-2000:]}"
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+@pytest.fixture(scope="module")
+def best_run() -> dict[str, int]:
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'import.db'}"
+    env["FAST_STARTUP"] = "true"
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    # La primera ejecución puede incluir la compilación a .pyc: se toma la más rápida
+    runs = [import_times(env) for _ in range(RUNS)]
+    return min(runs, key=lambda times: times.get("app.main", 0))
+
+
+@pytest.mark.slow
+def test_import_within_budget(best_run):
+    total_ms = best_run.get("app.main", 0) / 1000
+    slowest = sorted(best_run.items(), key=lambda kv: kv[1], reverse=True)[:10]
+    listing = "\n".join(f"    {module:<50}{micros / 1000:>10.1f} ms" for module, micros in slowest)
+    assert total_ms <= BUDGET_MS, f"import app.main: {total_ms:.0f} ms (máximo {BUDGET_MS:.0f} ms)\n{listing}"
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("module", DEFERRED)
+def test_deferred_module_not_imported(best_run, module):
+    assert module not in best_run, f"{module} se importa al arrancar"
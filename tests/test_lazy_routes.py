@@ -0,0 +1,48 @@
+"""Routers imported on first use (``FAST_STARTUP``)."""
+import asyncio
+import sys
+import types
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from app.core import lazy_routes
+
+MODULE = "tests_lazy_router_module"
+
+
+def get(app: FastAPI, path: str) -> httpx.Response:
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(run())
+
+
+def test_router_is_imported_on_first_request(monkeypatch):
+    router = APIRouter(prefix="/lazy")
+    router.add_api_route("/ping", lambda: {"ok": True})
+    monkeypatch.setitem(sys.modules, MODULE, types.SimpleNamespace(router=router))
+    app = FastAPI()
+    [placeholder] = lazy_routes.register(app, "/api", {"/lazy": MODULE})
+
+    response = get(app, "/api/lazy/ping")
+    assert response.status_code == 200 and response.json() == {"ok": True}
+    assert placeholder.loaded and placeholder not in app.router.routes
+
+
+def test_failed_import_leaves_the_placeholder_to_retry(monkeypatch):
+    app = FastAPI()
+    [placeholder] = lazy_routes.register(app, "/api", {"/lazy": MODULE})
+    monkeypatch.delitem(sys.modules, MODULE, raising=False)
+
+    with pytest.raises(ModuleNotFoundError):
+        get(app, "/api/lazy/ping")
+    assert not placeholder.loaded and placeholder in app.router.routes
+
+    router = APIRouter(prefix="/lazy")
+    router.add_api_route("/ping", lambda: {"ok": True})
+    monkeypatch.setitem(sys.modules, MODULE, types.SimpleNamespace(router=router))
+    assert get(app, "/api/lazy/ping").json() == {"ok": True}
+    assert placeholder not in app.router.routes
@@ -0,0 +1,52 @@
+"""List rows of users and categories: summary fields, relations only with ``expand``."""
+import pytest
+from sqlalchemy import insert
+
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.models.profile import Profile
+from app.models.user import User
+
+USER_KEYS = {"id", "name", "email", "role", "item_count"}
+CATEGORY_KEYS = {"id", "name", "description", "item_count"}
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"U{i}", "email": f"u{i}@example.com", "hashed_password": "x", "role": "admin", "item_count": 2 if i == 1 else 0} for i in (1, 2)])
+        conn.execute(insert(Profile), [{"id": 1, "user_id": 1, "bio": "b"}])
+        conn.execute(insert(Category), [{"id": 1, "name": "C1", "item_count": 1}])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": 1} for i in (1, 2)])
+        conn.execute(insert(item_category), [{"item_id": 1, "category_id": 1}])
+
+
+def get_json(api, path):
+    async def run(client):
+        response = await client.get(path)
+        assert response.status_code == 200
+        return response.json()
+
+    return api(run)
+
+
+def test_user_rows_are_summaries(seeded, api):
+    rows = get_json(api, "/api/v1/users/")
+    assert [set(row) for row in rows] == [USER_KEYS, USER_KEYS]
+    assert rows[0] == {"id": 1, "name": "U1", "email": "u1@example.com", "role": "admin", "item_count": 2}
+
+
+def test_user_rows_expand_items_and_profile(seeded, api):
+    rows = get_json(api, "/api/v1/users/?expand=items,profile&items_limit=1")
+    assert set(rows[0]) == USER_KEYS | {"items", "items_total", "profile"}
+    assert rows[0]["items"] == [{"id": 1, "title": "I1", "description": None, "owner_id": 1}]
+    assert rows[0]["items_total"] == 2
+    assert rows[0]["profile"]["bio"] == "b"
+    assert rows[1]["profile"] is None
+
+
+def test_category_rows_expand_items(seeded, api):
+    assert get_json(api, "/api/v1/categories/") == [{"id": 1, "name": "C1", "description": None, "item_count": 1}]
+    row = get_json(api, "/api/v1/categories/?expand=items")[0]
+    assert set(row) == CATEGORY_KEYS | {"items", "items_total"}
+    assert [item["id"] for item in row["items"]] == [1]
@@ -0,0 +1,68 @@
+"""Keyset pagination: ``cursor`` query param and ``X-Next-Cursor`` header."""
+import pytest
+from sqlalchemy import insert
+
+from app.core.pagination import encode_cursor
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.models.user import User
+
+N = 25
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"U{i}", "email": f"u{i}@example.com", "hashed_password": "x", "role": "admin"} for i in range(1, N + 1)])
+        conn.execute(insert(Category), [{"id": i, "name": f"C{i}"} for i in range(1, N + 1)])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": 1} for i in range(1, N + 1)])
+        conn.execute(insert(item_category), [{"item_id": i, "category_id": 1} for i in range(1, N + 1, 2)])
+
+
+def walk(api, path: str) -> list[list[int]]:
+    """Ids of every page, following ``X-Next-Cursor`` from ``path``."""
+
+    async def run(client):
+        pages, url = [], path
+        while url:
+            response = await client.get(url)
+            assert response.status_code == 200
+            pages.append([row["id"] for row in response.json()])
+            cursor = response.headers.get("x-next-cursor")
+            url = f"{path}&cursor={cursor}" if cursor else None
+        return pages
+
+    return api(run)
+
+
+@pytest.mark.parametrize("resource", ["items", "users", "categories"])
+def test_cursor_walks_every_row_once_in_id_order(seeded, api, resource):
+    pages = walk(api, f"/api/v1/{resource}/?limit=10")
+    assert pages == [list(range(1, 11)), list(range(11, 21)), list(range(21, 26))]
+
+
+def test_full_last_page_is_followed_by_an_empty_page_without_cursor(seeded, api):
+    pages = walk(api, "/api/v1/items/?limit=5")
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 5, 0]
+
+
+def test_cursor_keeps_the_filters(seeded, api):
+    pages = walk(api, "/api/v1/items/?limit=5&category_id=1")
+    assert sum(pages, []) == list(range(1, N + 1, 2))
+
+
+def test_cursor_replaces_skip(seeded, api):
+    async def run(client):
+        return await client.get(f"/api/v1/items/?limit=5&skip=100&cursor={encode_cursor(10)}")
+
+    assert [row["id"] for row in api(run).json()] == [11, 12, 13, 14, 15]
+
+
+@pytest.mark.parametrize("cursor", ["no-es-un-cursor", encode_cursor(5)[:-3] + "!!!"])
+def test_malformed_cursor_is_400(seeded, api, cursor):
+    async def run(client):
+        return await client.get(f"/api/v1/items/?cursor={cursor}")
+
+    response = api(run)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
@@ -0,0 +1,70 @@
+"""bcrypt pool: logins work, and a saturated or broken pool answers 503 with ``Retry-After``."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from app.core.passwords import PasswordHasher, hash_password, password_hasher
+from app.models.user import User
+
+LOGIN = "/api/v1/login"
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "name": "U1", "email": "u1@example.com", "hashed_password": hash_password("secret12", rounds=4), "role": "user"}])
+
+
+def login(api, password: str):
+    async def run(client):
+        return await client.post(LOGIN, json={"email": "u1@example.com", "password": password})
+
+    return api(run)
+
+
+def test_login_verifies_in_the_pool(seeded, api):
+    assert login(api, "secret12").status_code == 200
+    assert login(api, "otra-clave").status_code == 401
+
+
+def test_saturated_pool_answers_503_with_retry_after(seeded, api, monkeypatch):
+    monkeypatch.setattr(password_hasher, "_in_flight", password_hasher.max_in_flight)
+    response = login(api, "secret12")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(password_hasher.retry_after)
+
+
+class BrokenExecutor(ThreadPoolExecutor):
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("worker muerto")
+
+
+def test_broken_pool_answers_503_and_is_replaced():
+    hasher = PasswordHasher(workers=0, queue_limit=1, rounds=4, retry_after=7)
+    hasher._executor = broken = BrokenExecutor()
+
+    with pytest.raises(HTTPException) as busy:
+        asyncio.run(hasher.hash("secret12"))
+    assert busy.value.status_code == 503 and busy.value.headers == {"Retry-After": "7"}
+    assert hasher._executor is None
+    assert asyncio.run(hasher.verify("secret12", hash_password("secret12", rounds=4)))
+    assert hasher._executor is not broken
+    hasher.shutdown()
+
+
+def test_pool_shut_down_concurrently_never_falls_back_to_the_default_executor():
+    class ShutDownAfterStart(PasswordHasher):
+        def start(self):
+            # Otra llamada cierra el pool (p. ej. tras BrokenProcessPool) justo después de start()
+            executor = super().start()
+            self.shutdown()
+            return executor
+
+    hasher = ShutDownAfterStart(workers=0, queue_limit=1, rounds=4, retry_after=1)
+    with pytest.raises(HTTPException) as busy:
+        asyncio.run(hasher.hash("secret12"))
+    assert busy.value.status_code == 503
@@ -0,0 +1,60 @@
+"""Per-request profiles only contain the profiled request's stacks."""
+import asyncio
+import sys
+import time
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.item import Item
+from app.models.user import User
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "name": "U1", "email": "u1@example.com", "hashed_password": "x", "role": "admin"}])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": 1} for i in range(1, 201)])
+
+
+def concurrent_busy_work(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def fast_gil_switch():
+    # El muestreador necesita el GIL mientras el loop ejecuta trabajo de CPU
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(0.0001)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_profile_excludes_concurrent_requests_on_the_event_loop(seeded, api, fast_gil_switch):
+    async def run(client):
+        stop = asyncio.Event()
+
+        async def other_request():
+            # Otra "petición" en el mismo loop: trabajo de CPU a trozos mientras la perfilada espera al SQL
+            while not stop.is_set():
+                concurrent_busy_work(0.005)
+                await asyncio.sleep(0)
+
+        other = asyncio.create_task(other_request())
+        try:
+            profiled = await client.get("/api/v1/items/?limit=200", headers={"X-Profile": "1"})
+        finally:
+            stop.set()
+            await other
+        profile_id = profiled.headers["x-profile-id"]
+        detail = (await client.get(f"/api/v1/admin/profiles/{profile_id}")).json()
+        collapsed = (await client.get(f"/api/v1/admin/profiles/{profile_id}?format=collapsed")).text
+        return profiled, detail, collapsed
+
+    profiled, detail, collapsed = api(run)
+    assert profiled.status_code == 200
+    assert detail["samples"] > 0 and detail["queries"] > 0
+    assert "concurrent_busy_work" not in collapsed
+    assert "ProfilingMiddleware.__call__" in collapsed
@@ -0,0 +1,115 @@
+"""EXPLAIN QUERY PLAN of every SQL statement issued by the list endpoints (SQLite).
+
+Cada listado falla si alguna de sus consultas ordena sin índice o recorre
+entera una tabla que filtra.
+"""
+import random
+import re
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.core.database import async_engine
+from app.core.pagination import encode_cursor
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.models.profile import Profile
+from app.models.user import User
+
+USERS, ITEMS, CATEGORIES = 500, 5000, 50
+
+# Listados (con y sin filtros/cursor/expand; {cursor} apunta a la mitad de los ítems) cuyas consultas se analizan; la búsqueda por texto la resuelve el índice FTS
+PATHS = [
+    "/api/v1/items/?limit=100",
+    "/api/v1/items/?limit=100&skip=200",
+    "/api/v1/items/?limit=100&owner_id=7",
+    "/api/v1/items/?limit=100&category_id=3",
+    "/api/v1/items/?limit=100&owner_id=7&category_id=3",
+    "/api/v1/items/?limit=100&owner_id=7&cursor={cursor}",
+    "/api/v1/items/?limit=100&category_id=3&cursor={cursor}",
+    "/api/v1/items/export?owner_id=7",
+    "/api/v1/items/export?category_id=3",
+    "/api/v1/users/?limit=100",
+    "/api/v1/users/?limit=100&expand=items,profile",
+    "/api/v1/categories/?limit=100",
+    "/api/v1/categories/?limit=100&expand=items",
+    "/api/v1/categories/3",
+    "/api/v1/profiles/?limit=100",
+    "/api/v1/profiles/?limit=100&user_id=7",
+]
+# Problemas en la salida de EXPLAIN QUERY PLAN
+TEMP_SORT = re.compile(r"USE TEMP B-TREE FOR (ORDER BY|RIGHT PART OF ORDER BY)")
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+SUBQUERY_SCAN = re.compile(r"^SCAN (anon_\d+|\(subquery-\d+\))")
+
+
+def problems(statement: str, plan: list[str]) -> list[str]:
+    """Plan lines that mean a sort or a filtered full scan without an index.
+
+    ``SCAN <tabla>`` sin ``USING ... INDEX`` solo se admite si la sentencia no
+    filtra (``WHERE``): es el recorrido por la clave primaria de un listado.
+    Se admite ordenar el resultado de una subconsulta (las vistas previas de
+    ``expand``, ya acotadas a ``items_limit`` filas por padre).
+    """
+    found = []
+    source = ""
+    for line in plan:
+        if line.startswith(("SCAN ", "SEARCH ")):
+            source = line
+        elif TEMP_SORT.search(line) and not SUBQUERY_SCAN.match(source):
+            found.append(line)
+    if " WHERE " in statement:
+        found += [line for line in plan if FULL_SCAN.match(line)]
+    return found
+
+
+@pytest.fixture(scope="module")
+def plans(fresh_db, api):
+    """``{path: [(statement, plan lines), ...]}`` of every SELECT issued per listing."""
+    rng = random.Random(42)
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"U{i}", "email": f"u{i}@example.com", "hashed_password": "x", "role": "admin"} for i in range(1, USERS + 1)])
+        conn.execute(insert(Profile), [{"id": i, "user_id": i, "bio": "b"} for i in range(1, USERS + 1, 2)])
+        conn.execute(insert(Category), [{"id": i, "name": f"C{i}"} for i in range(1, CATEGORIES + 1)])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": rng.randint(1, USERS)} for i in range(1, ITEMS + 1)])
+        links = {(i, rng.randint(1, CATEGORIES)) for i in range(1, ITEMS + 1) for _ in range(2)}
+        conn.execute(insert(item_category), [{"item_id": i, "category_id": c} for i, c in sorted(links)])
+
+    captured: dict[str, list[tuple[str, object]]] = {}
+    current: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            current.append((statement, parameters))
+
+    async def run(client):
+        for path in PATHS:
+            current.clear()
+            response = await client.get(path.format(cursor=encode_cursor(ITEMS // 2)))
+            response.raise_for_status()
+            captured[path] = list(current)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        api(run)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    with fresh_db.connect() as conn:
+        raw = conn.connection.dbapi_connection
+        return {
+            path: [(statement, [row[3] for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()]) for statement, parameters in statements]
+            for path, statements in captured.items()
+        }
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_listing_uses_indexes(plans, path):
+    assert plans[path], f"{path}: no emitió ninguna consulta"
+    failures = []
+    for statement, plan in plans[path]:
+        bad = problems(statement, plan)
+        if bad:
+            lines = "\n".join(f"      {'>> ' if line in bad else ''}{line}" for line in plan)
+            failures.append(f"    {' '.join(statement.split())[:200]}\n{lines}")
+    assert not failures, f"{path}: consultas sin índice adecuado\n" + "\n".join(failures)
@@ -0,0 +1,97 @@
+"""Read-through response cache: HIT/MISS and no stale body after any write."""
+import pytest
+from sqlalchemy import insert
+
+from app.core.cache import MemoryCacheBackend, response_cache
+from app.core.database import SessionLocal
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.item import ItemUpdate
+from app.services import item_service as sync_item_service
+
+
+@pytest.fixture(scope="module")
+def seeded(fresh_db):
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "name": "U1", "email": "u1@example.com", "hashed_password": "x", "role": "admin"}])
+        conn.execute(insert(Category), [{"id": 1, "name": "C1"}])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": 1} for i in (1, 2, 3)])
+        conn.execute(insert(item_category), [{"item_id": 1, "category_id": 1}])
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Memory backend for one test (the suite runs with RESPONSE_CACHE_BACKEND=none)."""
+    monkeypatch.setattr(response_cache, "backend", MemoryCacheBackend(100))
+    monkeypatch.setattr(response_cache, "hits", 0)
+    monkeypatch.setattr(response_cache, "misses", 0)
+    monkeypatch.setattr(response_cache, "invalidations", 0)
+    return response_cache
+
+
+def get_twice(api, path: str):
+    async def run(client):
+        return await client.get(path), await client.get(path)
+
+    return api(run)
+
+
+def get(api, path: str):
+    async def run(client):
+        return await client.get(path)
+
+    return api(run)
+
+
+def write(api, method: str, path: str, body=None):
+    async def run(client):
+        response = await client.request(method, path, json=body)
+        assert response.status_code in (200, 204), response.text
+        return response
+
+    return api(run)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/items/2", "/api/v1/items/?limit=10", "/api/v1/categories/1", "/api/v1/categories/?limit=10"])
+def test_second_read_is_a_hit_with_the_same_body_and_etag(seeded, api, cache, path):
+    first, second = get_twice(api, path)
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert second.content == first.content and second.headers["etag"] == first.headers["etag"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_patch_invalidates_the_item_and_the_category_that_embeds_it(seeded, api, cache):
+    get_twice(api, "/api/v1/items/1")
+    get_twice(api, "/api/v1/categories/1")
+    write(api, "PATCH", "/api/v1/items/1", {"title": "Nuevo"})
+    assert cache.invalidations >= 2
+
+    item, category = get(api, "/api/v1/items/1"), get(api, "/api/v1/categories/1")
+    assert item.headers["x-cache"] == "MISS" and item.json()["title"] == "Nuevo"
+    assert category.headers["x-cache"] == "MISS" and category.json()["items"][0]["title"] == "Nuevo"
+
+
+def test_list_misses_after_a_create(seeded, api, cache):
+    get_twice(api, "/api/v1/items/?limit=10")
+    created = write(api, "POST", "/api/v1/items/", {"title": "Otro", "owner_id": 1}).json()
+    response = get(api, "/api/v1/items/?limit=10")
+    assert response.headers["x-cache"] == "MISS"
+    assert created["id"] in [row["id"] for row in response.json()]
+
+
+def test_write_that_skips_invalidation_is_never_served_stale(seeded, api, cache):
+    first, _ = get_twice(api, "/api/v1/items/3")
+    # Servicio síncrono (como un script u otro worker): no invalida esta caché, pero sube la versión
+    with SessionLocal() as db:
+        sync_item_service.update_item(db, 3, ItemUpdate(title="Desde fuera"))
+    response = get(api, "/api/v1/items/3")
+    assert response.headers["x-cache"] == "MISS"
+    assert response.headers["etag"] != first.headers["etag"]
+    assert response.json()["title"] == "Desde fuera"
+
+
+def test_errors_are_not_cached(seeded, api, cache):
+    first, second = get_twice(api, "/api/v1/items/999")
+    assert first.status_code == second.status_code == 404
+    assert "x-cache" not in second.headers and cache.backend.size() == 0
@@ -0,0 +1,105 @@
+"""Route authorization: the compiled route trie decides like the old linear ``startswith`` scan."""
+import pytest
+
+from app.core.auth_middleware import RouteTable
+from app.core.routes_config import ROUTES_ACCESS, ROUTES_ACCESS_PREFIXES
+from app.core.security import create_access_token
+
+METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+
+def linear_lookup(method: str, path: str):
+    """Regla anterior al trie: ruta exacta y, si no, el primer prefijo que encaje."""
+    if path in ROUTES_ACCESS:
+        return ROUTES_ACCESS[path]
+    for cfg in ROUTES_ACCESS_PREFIXES:
+        methods = cfg.get("methods")
+        if path.startswith(cfg["prefix"]) and (methods is None or method in methods):
+            return cfg
+    return None
+
+
+def sample_paths() -> list[str]:
+    paths = {"/", "/health", "/metrics", "/api/v1", "/api/v1/", "/api/v1/otra"}
+    for path in ROUTES_ACCESS:
+        paths.update({path, path + "/", path + "/5"})
+    for cfg in ROUTES_ACCESS_PREFIXES:
+        prefix = cfg["prefix"]
+        paths.update({prefix, prefix + "/", prefix + "/5", prefix + "/5/extra", prefix + "/export"})
+    return sorted(paths)
+
+
+@pytest.mark.parametrize("path", sample_paths())
+def test_trie_matches_the_linear_scan(path):
+    table = RouteTable.compile(ROUTES_ACCESS, ROUTES_ACCESS_PREFIXES)
+    for method in METHODS:
+        assert table.lookup(method, path) == linear_lookup(method, path), (method, path)
+
+
+def test_prefixes_match_whole_segments_only():
+    table = RouteTable.compile({}, [{"prefix": "/api/v1/items", "roles": ["admin"]}])
+    assert table.lookup("GET", "/api/v1/items") is not None
+    assert table.lookup("GET", "/api/v1/items/") is not None
+    assert table.lookup("GET", "/api/v1/items/5") is not None
+    # A diferencia de startswith, un segmento que solo empieza igual no hereda la regla
+    assert table.lookup("GET", "/api/v1/itemsx") is None
+
+
+def test_first_prefix_in_list_order_wins():
+    rules = [
+        {"prefix": "/api/v1", "methods": ["GET"], "roles": ["guest"]},
+        {"prefix": "/api/v1/items", "roles": ["admin"]},
+    ]
+    table = RouteTable.compile({}, rules)
+    assert table.lookup("GET", "/api/v1/items/5") is rules[0]
+    assert table.lookup("POST", "/api/v1/items/5") is rules[1]
+
+
+def call(api, method: str, path: str, role: str | None = None, **kwargs):
+    async def run(client):
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': '1', 'role': role})}"} if role else {}
+        if role is None:
+            # Sin token: se descarta la cabecera de admin que pone el cliente común
+            client.headers.pop("Authorization", None)
+        return await client.request(method, path, headers=headers, **kwargs)
+
+    return api(run)
+
+
+def denied(response, status: int, detail: str) -> bool:
+    return response.status_code == status and response.json() == {"detail": detail}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema(fresh_db):
+    return fresh_db
+
+
+def test_protected_route_without_token_is_401(api):
+    assert denied(call(api, "GET", "/api/v1/items"), 401, "Autorización requerida")
+    assert denied(call(api, "GET", "/api/v1/items/5"), 401, "Autorización requerida")
+
+
+def test_public_and_unconfigured_routes_need_no_token(api):
+    assert call(api, "POST", "/api/v1/logout").status_code == 200
+    assert call(api, "GET", "/health").status_code == 200
+    login = call(api, "POST", "/api/v1/login", json={"email": "nadie@example.com", "password": "x"})
+    assert not denied(login, 401, "Autorización requerida")
+
+
+def test_method_specific_prefix_rules(api):
+    assert call(api, "GET", "/api/v1/items/", role="guest").status_code == 200
+    assert denied(call(api, "POST", "/api/v1/items/", role="guest", json={}), 403, "Permisos insuficientes")
+    assert call(api, "GET", "/api/v1/users/", role="user").status_code == 200
+    assert denied(call(api, "POST", "/api/v1/users/", role="user", json={}), 403, "Permisos insuficientes")
+    assert denied(call(api, "DELETE", "/api/v1/users/5", role="user"), 403, "Permisos insuficientes")
+    # Rol permitido: la autorización deja pasar y decide el endpoint (validación del cuerpo)
+    assert call(api, "POST", "/api/v1/items/", role="user", json={}).status_code == 422
+
+
+def test_exact_routes_and_their_prefixes(api):
+    assert denied(call(api, "GET", "/api/v1/admin", role="user"), 403, "Permisos insuficientes")
+    assert call(api, "GET", "/api/v1/admin", role="admin").status_code == 200
+    assert denied(call(api, "GET", "/api/v1/admin/profiles/1", role="user"), 403, "Permisos insuficientes")
+    assert denied(call(api, "GET", "/api/v1/profile", role="guest"), 403, "Permisos insuficientes")
+    assert call(api, "GET", "/api/v1/profile", role="user").status_code == 200
@@ -0,0 +1,17 @@
+"""Worker count chosen by ``python -m app.serve``."""
+from app import serve
+
+
+def test_default_is_one_worker_per_cpu(monkeypatch):
+    monkeypatch.setattr(serve, "default_workers", lambda: 8)
+    assert serve.resolve_workers(0, write_queue=False) == 8
+
+
+def test_sqlite_write_queue_keeps_a_single_worker(monkeypatch):
+    monkeypatch.setattr(serve, "default_workers", lambda: 8)
+    assert serve.resolve_workers(0, write_queue=True) == 1
+
+
+def test_explicit_workers_are_honoured():
+    assert serve.resolve_workers(3, write_queue=True) == 3
+    assert serve.resolve_workers(3, write_queue=False) == 3
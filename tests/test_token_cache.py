@@ -0,0 +1,67 @@
+"""Verified-JWT cache: repeated tokens skip the decode, expiry and logout still apply."""
+import time
+
+import jwt
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token, token_cache
+
+PATH = "/api/v1/profile"
+
+
+@pytest.fixture
+def cache():
+    token_cache.clear()
+    yield token_cache
+    token_cache.clear()
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def get(api, token: str, path: str = PATH):
+    async def run(client):
+        return await client.get(path, headers=bearer(token))
+
+    return api(run)
+
+
+def test_repeated_token_is_served_from_the_cache(api, cache):
+    token = create_access_token({"sub": "7", "email": "u7@example.com", "role": "user"})
+    first, second = get(api, token), get(api, token)
+    assert first.status_code == second.status_code == 200
+    assert second.json() == {"user_id": "7", "email": "u7@example.com", "role": "user"}
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 1)
+
+
+def test_cached_token_is_rejected_once_expired(api, cache):
+    token = jwt.encode({"sub": "7", "role": "user", "exp": int(time.time()) + 1}, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    assert get(api, token).status_code == 200
+    time.sleep(2.1)
+    response = get(api, token)
+    assert response.status_code == 401 and response.json()["detail"] == "Token expirado"
+    assert cache.stats()["size"] == 0
+
+
+def test_tampered_token_is_not_served_from_the_valid_one(api, cache):
+    token = create_access_token({"sub": "7", "role": "user"})
+    assert get(api, token).status_code == 200
+    header, payload, signature = token.split(".")
+    forged = jwt.encode({"sub": "7", "role": "admin", "exp": int(time.time()) + 60}, "otra-clave", algorithm="HS256").split(".")[1]
+    response = get(api, f"{header}.{forged}.{signature}")
+    assert response.status_code == 401 and response.json()["detail"] == "Token inválido"
+    assert cache.stats()["size"] == 1
+
+
+def test_logout_drops_the_token_from_the_cache(api, cache):
+    token = create_access_token({"sub": "7", "role": "user"})
+    get(api, token)
+    assert cache.stats()["size"] == 1
+
+    async def run(client):
+        return await client.post("/api/v1/logout", headers=bearer(token))
+
+    assert api(run).status_code == 200
+    assert cache.stats()["size"] == 0
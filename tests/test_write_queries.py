@@ -0,0 +1,78 @@
+"""SQL statements per write endpoint against a fixed budget.
+
+Cada caso se ejecuta en orden sobre los datos de ``seeded`` (algunos dependen
+de los anteriores, p. ej. los duplicados); la prueba de cada caso comprueba su
+estado y que no supera su número de consultas.
+"""
+import pytest
+from sqlalchemy import event, insert
+
+from app.core.database import async_engine
+from app.models.category import Category, item_category
+from app.models.item import Item
+from app.models.profile import Profile
+from app.models.user import User
+
+# (método, ruta, cuerpo, estado esperado, consultas máximas)
+CASES = [
+    ("POST", "/api/v1/items/", {"title": "Nuevo", "description": "d", "owner_id": 2, "category_ids": [1, 2]}, 200, 9),
+    ("PUT", "/api/v1/items/1", {"title": "Editado", "category_ids": [2, 3]}, 200, 12),
+    ("PATCH", "/api/v1/items/2", {"title": "Parcheado"}, 200, 7),
+    ("DELETE", "/api/v1/items/3", None, 204, 6),
+    ("POST", "/api/v1/categories/", {"name": "Nueva", "description": "x"}, 200, 4),
+    # Duplicados: los rechaza la restricción UNIQUE, sin SELECT previo
+    ("POST", "/api/v1/categories/", {"name": "Nueva", "description": "x"}, 400, 0),
+    ("PUT", "/api/v1/categories/1", {"name": "Renombrada"}, 200, 5),
+    ("PUT", "/api/v1/categories/1", {"name": "C2"}, 400, 1),
+    ("DELETE", "/api/v1/categories/3", None, 204, 6),
+    ("POST", "/api/v1/profiles/", {"user_id": 2, "bio": "x"}, 200, 4),
+    ("POST", "/api/v1/profiles/", {"user_id": 2, "bio": "x"}, 400, 1),
+    ("PUT", "/api/v1/profiles/1", {"bio": "y"}, 200, 4),
+    ("PUT", "/api/v1/profiles/1", {"user_id": 2}, 400, 3),
+    ("DELETE", "/api/v1/profiles/1", None, 204, 4),
+    ("POST", "/api/v1/users/", {"name": "N", "email": "nuevo@example.com", "password": "secret12"}, 200, 4),
+    ("POST", "/api/v1/users/", {"name": "N", "email": "nuevo@example.com", "password": "secret12"}, 400, 0),
+    ("PATCH", "/api/v1/users/2", {"name": "Z"}, 200, 7),
+    ("PATCH", "/api/v1/users/2", {"email": "u3@example.com"}, 400, 3),
+    ("PUT", "/api/v1/users/3", {"email": "u3b@example.com"}, 200, 7),
+    ("DELETE", "/api/v1/users/4", None, 204, 7),
+]
+
+
+@pytest.fixture(scope="module")
+def results(fresh_db, api):
+    """``(status, statements)`` of every case, run once in order."""
+    with fresh_db.begin() as conn:
+        conn.execute(insert(User), [{"id": i, "name": f"U{i}", "email": f"u{i}@example.com", "hashed_password": "x", "role": "admin"} for i in range(1, 6)])
+        conn.execute(insert(Profile), [{"id": 1, "user_id": 1, "bio": "b"}])
+        conn.execute(insert(Category), [{"id": i, "name": f"C{i}"} for i in range(1, 4)])
+        conn.execute(insert(Item), [{"id": i, "title": f"I{i}", "owner_id": 1} for i in range(1, 4)])
+        conn.execute(insert(item_category), [{"item_id": 1, "category_id": 1}])
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *rest):
+        statements.append(statement)
+
+    async def run(client):
+        out = []
+        for method, path, body, _, _ in CASES:
+            statements.clear()
+            response = await client.request(method, path, json=body)
+            out.append((response.status_code, list(statements)))
+        return out
+
+    event.listen(async_engine.sync_engine, "after_cursor_execute", record)
+    try:
+        return api(run)
+    finally:
+        event.remove(async_engine.sync_engine, "after_cursor_execute", record)
+
+
+@pytest.mark.parametrize("case", range(len(CASES)), ids=[f"{i:02d}-{m} {p}" for i, (m, p, *_) in enumerate(CASES)])
+def test_write_within_query_budget(results, case):
+    method, path, _, status, budget = CASES[case]
+    got_status, statements = results[case]
+    listing = "\n".join(" ".join(s.split())[:150] for s in statements)
+    assert got_status == status, f"{method} {path}: estado {got_status}\n{listing}"
+    assert len(statements) <= budget, f"{method} {path}: {len(statements)} consultas (máximo {budget})\n{listing}"